@@ -1,13 +1,26 @@
 import os
+import re
 import sys
 import json
 import time
+import random
+import asyncio
 import logging
-from datetime import datetime, date
+import threading
+import uuid
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, date, timezone
+from email.utils import parsedate_to_datetime
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
+try:
+    import fcntl
+except ImportError:  # Windows: süreçler arası kilit yok, tek süreç varsayılır
+    fcntl = None
+
 class APIType(Enum):
     TEXT = "text"
     TTS = "tts" 
@@ -29,18 +42,328 @@ class APIUsage:
     status: APIStatus = APIStatus.ACTIVE
     last_used: Optional[datetime] = None
 
+@dataclass
+class RetryState:
+    """Tek bir isteğin anahtar başına deneme sayıları ve geri çekilme bitiş zamanları"""
+    attempts: Dict[Tuple[str, str], int] = field(default_factory=dict)
+    not_before: Dict[Tuple[str, str], float] = field(default_factory=dict)
+    last_error: Optional[str] = None
+
+class ErrorKind(Enum):
+    RATE_LIMIT = "rate_limit"            # 429 / RESOURCE_EXHAUSTED: anahtar sağlam ama meşgul
+    QUOTA = "quota"                      # Günlük kota bitti: anahtar bugün kullanılmaz
+    TRANSIENT = "transient"              # 5xx, zaman aşımı, bağlantı, boş yanıt: geri çekilip tekrar
+    AUTH = "auth"                        # 401/403: anahtar geçersiz, devre uzun süre açılır
+    INVALID_REQUEST = "invalid_request"  # 400/404: istek hatalı, hiçbir anahtarda tekrar denenmez
+
+def _error_code(exc: Exception) -> Optional[int]:
+    """İstisnadan HTTP durum kodu - SDK alanları, yanıt nesnesi veya '429 ...' biçimli mesaj"""
+    for attr in ('code', 'status_code'):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    value = getattr(getattr(exc, 'response', None), 'status_code', None)
+    if isinstance(value, int):
+        return value
+    match = re.match(r'\s*([45]\d\d)\b', str(exc))
+    return int(match.group(1)) if match else None
+
+def retry_after_hint(exc: Exception) -> Optional[float]:
+    """Sunucunun önerdiği bekleme (saniye): Retry-After başlığı veya Google RetryInfo.retryDelay"""
+    headers = getattr(getattr(exc, 'response', None), 'headers', None)
+    value = headers.get('Retry-After') if headers else None
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                pass
+    text = f"{exc} {getattr(exc, 'details', '')}"
+    match = (re.search(r'retryDelay[\'"]?\s*[:=]\s*[\'"]?([\d.]+)s', text)
+             or re.search(r'retry (?:in|after) ([\d.]+)\s*s', text, re.IGNORECASE))
+    return float(match.group(1)) if match else None
+
+def classify_error(exc: Exception) -> Tuple[ErrorKind, Optional[float]]:
+    """Hatayı yeniden deneme sınıfına ayırır: (sınıf, sunucu bekleme önerisi)"""
+    code = _error_code(exc)
+    text = f"{getattr(exc, 'status', '') or ''} {exc}".lower()
+    hint = retry_after_hint(exc)
+    daily = re.search(r'per ?day|daily', text)
+    
+    if code == 429 or 'resource_exhausted' in text or 'rate limit' in text:
+        return (ErrorKind.QUOTA if daily else ErrorKind.RATE_LIMIT), hint
+    if 'quota' in text and daily:
+        return ErrorKind.QUOTA, hint
+    if code in (401, 403) or 'permission_denied' in text or 'unauthenticated' in text or 'api key not valid' in text:
+        return ErrorKind.AUTH, hint
+    if code in (400, 404, 413, 422) or 'invalid_argument' in text:
+        return ErrorKind.INVALID_REQUEST, hint
+    return ErrorKind.TRANSIENT, hint
+
+class RetryPolicy:
+    """Tam jitter'lı üstel geri çekilme: bekleme ~ U(0, min(tavan, taban * 2^deneme))
+
+    Sunucu bir bekleme önerdiyse (Retry-After / retryDelay) o süreye küçük bir
+    jitter eklenerek uyulur.
+    """
+    
+    def __init__(self, base_seconds: float = 1.0, max_seconds: float = 60.0):
+        self.base_seconds = base_seconds
+        self.max_seconds = max_seconds
+    
+    def delay(self, attempt: int, hint: Optional[float] = None) -> float:
+        if hint is not None:
+            return hint + random.uniform(0, self.base_seconds)
+        return random.uniform(0, min(self.max_seconds, self.base_seconds * 2 ** attempt))
+
+class CircuitBreaker:
+    """Anahtar başına devre kesici - thread-safe
+
+    Kapalı: istekler geçer; ardışık failure_threshold geçici hata devreyi açar.
+    Açık: anahtar atlanır; bekleme dolunca yarı açığa geçer.
+    Yarı açık: tek bir deneme (probe) geçer; başarıda kapanır, hatada bekleme
+    ikiye katlanarak (max_recovery_seconds'a kadar) yeniden açılır.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_seconds: float = 30.0,
+                 max_recovery_seconds: float = 600.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.max_recovery_seconds = max_recovery_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.cooldown = recovery_seconds
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+    
+    def _tick(self):
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+    
+    def available(self) -> bool:
+        """Şu an bir deneme kabul eder mi (yer ayırmadan)"""
+        with self._lock:
+            self._tick()
+            return self.state == self.CLOSED or (self.state == self.HALF_OPEN and not self._probe_in_flight)
+    
+    def allow(self) -> bool:
+        """Denemeye izin verir; yarı açık durumda tek probe yerini ayırır"""
+        with self._lock:
+            self._tick()
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+    
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                print(f"🔁 {self.name} devresi kapandı, anahtar yeniden kullanımda")
+            self.state = self.CLOSED
+            self.failures = 0
+            self.cooldown = self.recovery_seconds
+            self._probe_in_flight = False
+    
+    def release_probe(self):
+        """Devre durumunu değiştirmeden yarı açık probe yerini bırakır
+
+        Sonucu anahtarın sağlığı hakkında bilgi vermeyen denemeler (günlük kota,
+        iptal) için; aksi halde probe yeri süreç boyunca dolu kalır.
+        """
+        with self._lock:
+            self._probe_in_flight = False
+    
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN:
+                self._open(min(self.cooldown * 2, self.max_recovery_seconds))
+            elif self.state == self.CLOSED and self.failures >= self.failure_threshold:
+                self._open(self.recovery_seconds)
+    
+    def trip(self):
+        """Anahtar geçersiz (yetki hatası): devre en uzun bekleme ile açılır"""
+        with self._lock:
+            self._open(self.max_recovery_seconds)
+    
+    def _open(self, cooldown: float):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.cooldown = cooldown
+        self._probe_in_flight = False
+        print(f"⛔ {self.name} devresi açıldı, {cooldown:.0f}s sonra yeniden denenecek")
+
+class TokenBucket:
+    """Dakikalık limitten sürekli dolan jeton kovası - thread-safe"""
+    
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+    
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def wait_time(self, amount: float, now: float) -> float:
+        """amount jetonun birikmesi için gereken süre (saniye) - kapasiteden büyük istek kapasiteye kırpılır"""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.tokens) / self.rate)
+    
+    def take(self, amount: float):
+        self.tokens -= min(amount, self.capacity)
+    
+    def give_back(self, amount: float):
+        self.tokens = min(self.capacity, self.tokens + min(amount, self.capacity))
+
+class KeyRateLimiter:
+    """Bir (anahtar, API tipi) için RPM ve TPM kovaları
+
+    Limit verilmeyen kova yoktur (sınırsız). Rezervasyon ya iki kovadan birden
+    düşer ya da hiçbirine dokunmadan beklenecek süreyi döndürür.
+    """
+    
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None):
+        self.rpm = TokenBucket(rpm) if rpm else None
+        self.tpm = TokenBucket(tpm) if tpm else None
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+    
+    def pause(self, seconds: float):
+        """429 sonrası anahtarı bu süre boyunca yeni isteklere kapatır"""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+    
+    def _wait(self, tokens: int, now: float) -> float:
+        wait = max(0.0, self.paused_until - now)
+        if self.rpm:
+            wait = max(wait, self.rpm.wait_time(1, now))
+        if self.tpm and tokens:
+            wait = max(wait, self.tpm.wait_time(tokens, now))
+        return wait
+    
+    def wait_time(self, tokens: int = 0) -> float:
+        """Yer ayırmadan, isteğin kaç saniye sonra geçebileceği"""
+        with self._lock:
+            return self._wait(tokens, time.monotonic())
+    
+    def try_acquire(self, tokens: int = 0) -> float:
+        """Yer varsa ayırır ve 0 döner; yoksa gereken bekleme süresini döner"""
+        with self._lock:
+            wait = self._wait(tokens, time.monotonic())
+            if wait > 0:
+                return wait
+            if self.rpm:
+                self.rpm.take(1)
+            if self.tpm and tokens:
+                self.tpm.take(tokens)
+            return 0.0
+    
+    def release(self, tokens: int = 0):
+        """try_acquire ile ayrılan ama kullanılmayan yeri kovalara geri verir"""
+        with self._lock:
+            if self.rpm:
+                self.rpm.give_back(1)
+            if self.tpm and tokens:
+                self.tpm.give_back(tokens)
+    
+    def acquire(self, tokens: int = 0):
+        """Yer açılana kadar bekler (senkron istekler için)"""
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+class ProviderStats:
+    """Bir (anahtar, API tipi) için EWMA gecikme ve hata oranı - thread-safe
+
+    Güncellenmeyen istatistikler yarı ömürle önsel değere döner; yavaşladığı
+    için trafiği kesilen anahtar zamanla yeniden denenir.
+    """
+    
+    def __init__(self, alpha: float = 0.2, half_life_seconds: float = 120.0):
+        self.alpha = alpha
+        self.half_life_seconds = half_life_seconds
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.samples = 0
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _decay(self, now: float) -> float:
+        if self.half_life_seconds <= 0:
+            return 1.0
+        return 0.5 ** ((now - self.updated) / self.half_life_seconds)
+    
+    def record(self, success: bool, latency: Optional[float] = None):
+        """latency: yalnızca başarılı isteklerde ölçülen süre (saniye)"""
+        with self._lock:
+            now = time.monotonic()
+            error = self.error_rate * self._decay(now)
+            self.error_rate = (1 - self.alpha) * error + self.alpha * (0.0 if success else 1.0)
+            if latency is not None:
+                self.latency = latency if self.latency is None else (1 - self.alpha) * self.latency + self.alpha * latency
+            self.samples += 1
+            self.updated = now
+    
+    def estimate(self, prior_latency: float) -> Tuple[float, float]:
+        """(gecikme, hata oranı) tahmini - hiç ölçülmemişse önsel gecikme"""
+        with self._lock:
+            decay = self._decay(time.monotonic())
+            if self.latency is None:
+                return prior_latency, self.error_rate * decay
+            return prior_latency + (self.latency - prior_latency) * decay, self.error_rate * decay
+
 class MultiAPIManager:
     """Çoklu API sağlayıcı yöneticisi - Otomatik failover"""
     
     def __init__(self, config_manager):
         self.config = config_manager
         self.usage_file = "api_usage.json"
+        self.journal_file = "api_usage.journal"
+        self.lock_file = "api_usage.lock"
+        self.compact_every = config_manager.get('failover_ayarlari', 'usage_journal_compact_entries', default=500)
+        self._journal_fd = None
+        self._lock_fd = None
+        self._journal_id = None       # Uygulanmış günlüğün kimliği - sıkıştırmada değişir
+        self._journal_offset = 0      # Uygulanmış günlüğün okunan bayt sayısı
+        self._journal_entries = 0
+        self._journal_has_older_days = False
+        self._journal_folded = False  # Günlük özete katlanmış ama silinememiş (sıkıştırma yarıda kaldı)
+        self._usage_day = None
         self.usage_data: Dict[str, APIUsage] = {}
         self.active_providers: Dict[APIType, List[Tuple[str, str]]] = {
             APIType.TEXT: [],
             APIType.TTS: [],
             APIType.IMAGE: []
         }
+        self.rate_limiters: Dict[Tuple[str, str, APIType], KeyRateLimiter] = {}
+        self.breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+        self.provider_stats: Dict[Tuple[str, str, APIType], ProviderStats] = {}
+        self.routing_strategy = config_manager.get('failover_ayarlari', 'fallback_strategy', default='priority_order')
+        if self.routing_strategy not in ('priority_order', 'latency_aware'):
+            print(f"⚠️ Bilinmeyen fallback_strategy: {self.routing_strategy}, priority_order kullanılıyor")
+            self.routing_strategy = 'priority_order'
+        self.retry_policy = RetryPolicy(
+            config_manager.get('failover_ayarlari', 'backoff_base_seconds', default=1.0),
+            config_manager.get('failover_ayarlari', 'backoff_max_seconds', default=60.0)
+        )
+        self._lock = threading.RLock()
+        self._executor = None
         
         self.load_usage_data()
         self.initialize_providers()
@@ -49,59 +372,249 @@ class MultiAPIManager:
         self._clients = {}
     
     def load_usage_data(self):
-        """Günlük kullanım verilerini yükle"""
-        if os.path.exists(self.usage_file):
-            try:
-                with open(self.usage_file, 'r') as f:
-                    data = json.load(f)
-                
-                # Bugünün verilerini al
-                today_str = date.today().isoformat()
-                today_data = data.get(today_str, {})
-                
-                for key, usage_dict in today_data.items():
-                    self.usage_data[key] = APIUsage(**usage_dict)
-                    
-            except Exception as e:
-                logging.error(f"Usage data yükleme hatası: {e}")
+        """Günlük kullanım verilerini yükle
+
+        Bugünün sıkıştırılmış özeti okunur, ardından günlükteki (journal) yalnızca
+        bugüne ait kayıtlar üzerine uygulanır. Günlükte önceki günler varsa veya
+        günlük eşiği aştıysa sıkıştırılır.
+        """
+        try:
+            self.refresh_usage()
+            if (self._journal_entries >= self.compact_every or self._journal_has_older_days
+                    or self._journal_folded):
+                self.compact_usage_journal()
+        except Exception as e:
+            logging.error(f"Usage data yükleme hatası: {e}")
     
-    def save_usage_data(self):
-        """Kullanım verilerini kaydet"""
+    @contextmanager
+    def _file_lock(self, exclusive: bool = False):
+        """Kullanım dosyaları için süreçler arası flock - kayıt/okuma paylaşımlı, sıkıştırma özel"""
+        if fcntl is None:
+            yield
+            return
+        if self._lock_fd is None:
+            self._lock_fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
         try:
-            # Mevcut dosyayı oku
-            all_data = {}
-            if os.path.exists(self.usage_file):
-                with open(self.usage_file, 'r') as f:
-                    all_data = json.load(f)
-            
-            # Bugünün verisini güncelle
-            today_str = date.today().isoformat()
-            today_data = {}
-            
-            for key, usage in self.usage_data.items():
-                today_data[key] = {
-                    'provider': usage.provider,
-                    'config_name': usage.config_name,
-                    'requests_today': usage.requests_today,
-                    'total_cost_today': usage.total_cost_today,
-                    'last_error': usage.last_error,
-                    'status': usage.status.value,
-                    'last_used': usage.last_used.isoformat() if usage.last_used else None
-                }
-            
-            all_data[today_str] = today_data
-            
-            # Son 30 günü koru
-            all_dates = list(all_data.keys())
-            if len(all_dates) > 30:
-                for old_date in all_dates[:-30]:
-                    del all_data[old_date]
+            yield
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+    
+    def refresh_usage(self):
+        """Diğer süreçlerin günlüğe eklediği kayıtları uygular - kota kontrolünden önce çağrılır"""
+        with self._lock, self._file_lock():
+            self._sync_journal()
+    
+    def _sync_journal(self):
+        """Bellekteki bugünkü kullanımı dosyalarla eşitler (kilit tutulurken çağrılır)
+
+        Günlük kimliği aynıysa yalnızca son okunan konumdan sonraki tam satırlar
+        uygulanır. Günlük sıkıştırılmışsa (kimlik değişti) veya gün dönmüşse bugünkü
+        kullanım özet dosyası + yeni günlükten yeniden kurulur. Kimliği özette
+        katlanmış olarak kayıtlı günlüğün (özet yazılıp günlük silinemeden çökülmüş)
+        katlanan kısmı zaten özettedir; yalnızca ondan sonra eklenen kayıtlar uygulanır.
+        """
+        today_str = date.today().isoformat()
+        try:
+            f = open(self.journal_file, 'rb')
+        except FileNotFoundError:
+            f = None
+        
+        try:
+            header = self._journal_header(f.readline()) if f else None
+            if header != self._journal_id or today_str != self._usage_day:
+                for key, usage in list(self.usage_data.items()):
+                    self.usage_data[key] = APIUsage(usage.provider, usage.config_name)
+                all_data = self._read_aggregates()
+                for key, usage_dict in all_data.get(today_str, {}).items():
+                    self.usage_data[key] = self._usage_from_dict(usage_dict)
+                self._journal_folded = bool(f) and self._skip_folded(f, all_data, header)
+                self._journal_id = header
+                self._journal_offset = f.tell() if f else 0
+                self._journal_entries = 0
+                self._journal_has_older_days = False
+                self._usage_day = today_str
+            if not f:
+                return
             
-            with open(self.usage_file, 'w') as f:
-                json.dump(all_data, f, indent=2)
+            f.seek(self._journal_offset)
+            data = f.read()
+            # Henüz tamamlanmamış (yazılmakta olan) son satır bir sonraki eşitlemeye kalır
+            complete = data[:data.rfind(b"\n") + 1]
+            self._journal_offset += len(complete)
+            for line in complete.splitlines():
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Çökmeden kalan yarım satır
+                self._journal_entries += 1
+                if entry['d'] == today_str:
+                    self._apply_usage_entry(self._usage_for(entry['p'], entry['c']), entry)
+                else:
+                    self._journal_has_older_days = True
+        finally:
+            if f:
+                f.close()
+    
+    @staticmethod
+    def _skip_folded(f, all_data: dict, journal_id: Optional[str]) -> bool:
+        """Günlük özete katlanmışsa okuma konumunu katlanan kısmın sonuna taşır"""
+        if journal_id is None or journal_id not in all_data.get('_folded_journals', []):
+            return False
+        folded_bytes = all_data.get('_folded_bytes', {}).get(journal_id)
+        if folded_bytes is None:
+            f.seek(0, os.SEEK_END)  # Uzunluğu kaydedilmemiş eski özet: günlüğün tamamı katlanmış
+        else:
+            f.seek(max(f.tell(), folded_bytes))
+        return True
+    
+    @staticmethod
+    def _journal_header(line: bytes) -> Optional[str]:
+        try:
+            return json.loads(line).get('journal')
+        except (ValueError, AttributeError):
+            return None
+    
+    def _read_aggregates(self) -> Dict[str, Dict[str, dict]]:
+        """Günlük özet dosyası: {tarih: {usage_key: APIUsage alanları}}"""
+        if not os.path.exists(self.usage_file):
+            return {}
+        with open(self.usage_file, 'r') as f:
+            return json.load(f)
+    
+    @staticmethod
+    def _usage_from_dict(usage_dict: dict) -> APIUsage:
+        usage = APIUsage(**usage_dict)
+        usage.status = APIStatus(usage.status)
+        if usage.last_used:
+            usage.last_used = datetime.fromisoformat(usage.last_used)
+        return usage
+    
+    @staticmethod
+    def _usage_to_dict(usage: APIUsage) -> dict:
+        return {
+            'provider': usage.provider,
+            'config_name': usage.config_name,
+            'requests_today': usage.requests_today,
+            'total_cost_today': usage.total_cost_today,
+            'last_error': usage.last_error,
+            'status': usage.status.value,
+            'last_used': usage.last_used.isoformat() if usage.last_used else None
+        }
+    
+    @staticmethod
+    def _apply_usage_entry(usage: APIUsage, entry: dict):
+        """Tek bir günlük kaydını kullanım özetine uygular (record_usage ile aynı kurallar)"""
+        usage.requests_today += 1
+        usage.last_used = datetime.fromtimestamp(entry['ts'])
+        usage.total_cost_today += entry['cost']
+        
+        if entry['ok']:
+            usage.status = APIStatus.ACTIVE
+            usage.last_error = None
+        else:
+            usage.last_error = entry.get('err')
+            # Eski kayıtlarda 'quota' alanı yok: hata metnine bakılır
+            if entry.get('quota', "quota" in (usage.last_error or "").lower()):
+                usage.status = APIStatus.QUOTA_EXCEEDED
+            else:
+                usage.status = APIStatus.ERROR
+    
+    def _usage_for(self, provider: str, config_name: str) -> APIUsage:
+        usage_key = f"{provider}_{config_name}"
+        usage = self.usage_data.get(usage_key)
+        if not usage:
+            usage = APIUsage(provider, config_name)
+            self.usage_data[usage_key] = usage
+        return usage
+    
+    def _append_journal(self, entry: dict):
+        """Kaydı günlüğe tek bir O_APPEND yazımıyla ekler (paylaşımlı kilit tutulurken)
+
+        Başka bir süreç günlüğü sıkıştırıp sildiyse eski dosya tanıtıcısı bırakılır
+        ve yeni günlük açılır.
+        """
+        if self._journal_fd is not None:
+            try:
+                current = os.stat(self.journal_file).st_ino
+            except FileNotFoundError:
+                current = None
+            if current != os.fstat(self._journal_fd).st_ino:
+                os.close(self._journal_fd)
+                self._journal_fd = None
+        if self._journal_fd is None:
+            self._create_journal()
+            self._journal_fd = os.open(self.journal_file, os.O_WRONLY | os.O_APPEND)
+        os.write(self._journal_fd, (json.dumps(entry, separators=(',', ':')) + "\n").encode('utf-8'))
+    
+    def _create_journal(self):
+        """Kimlik başlığıyla yeni günlük oluşturur - başlık ve dosya link() ile atomik görünür"""
+        if os.path.exists(self.journal_file):
+            return
+        temp_file = f"{self.journal_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_file, 'w') as f:
+                f.write(json.dumps({'journal': uuid.uuid4().hex}) + "\n")
+            os.link(temp_file, self.journal_file)
+        except FileExistsError:
+            pass  # Başka bir süreç aynı anda oluşturdu
+        finally:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+    
+    def compact_usage_journal(self):
+        """Günlüğü günlük özetlere katlar ve siler (süreçler arası özel kilitle)
+
+        Özet dosyası geçici dosya + fsync + os.replace ile atomik yazılır ve katlanan
+        günlüğün kimliğini ve katlanan bayt uzunluğunu kaydeder. Özet yazıldıktan
+        sonra günlük silinemeden çökülürse, ne sonraki sıkıştırma ne de diğer
+        süreçler katlanan kayıtları ikinci kez sayar.
+        """
+        with self._lock, self._file_lock(exclusive=True):
+            try:
+                if not os.path.exists(self.journal_file):
+                    return
+                all_data = self._read_aggregates()
+                with open(self.journal_file, 'rb') as f:
+                    journal_id = self._journal_header(f.readline())
+                    self._skip_folded(f, all_data, journal_id)
+                    lines = f.read().splitlines()
+                    journal_size = f.tell()
                 
-        except Exception as e:
-            logging.error(f"Usage data kaydetme hatası: {e}")
+                folded = all_data.get('_folded_journals', [])
+                if lines:
+                    for line in lines:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            continue
+                        day_data = all_data.setdefault(entry['d'], {})
+                        key = f"{entry['p']}_{entry['c']}"
+                        usage = self._usage_from_dict(day_data[key]) if key in day_data else APIUsage(entry['p'], entry['c'])
+                        self._apply_usage_entry(usage, entry)
+                        day_data[key] = self._usage_to_dict(usage)
+                    folded = (folded if journal_id in folded else folded + [journal_id])[-20:]
+                    all_data['_folded_journals'] = folded
+                    folded_bytes = all_data.get('_folded_bytes', {})
+                    folded_bytes[journal_id] = journal_size
+                    all_data['_folded_bytes'] = {k: v for k, v in folded_bytes.items() if k in folded}
+                    
+                    # Son 30 günü koru
+                    for old_date in sorted(k for k in all_data if not k.startswith('_'))[:-30]:
+                        del all_data[old_date]
+                    
+                    temp_file = f"{self.usage_file}.{os.getpid()}.tmp"
+                    with open(temp_file, 'w') as f:
+                        json.dump(all_data, f, indent=2)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(temp_file, self.usage_file)
+                
+                os.remove(self.journal_file)
+                self._sync_journal()
+                
+            except Exception as e:
+                logging.error(f"Usage journal sıkıştırma hatası: {e}")
     
     def initialize_providers(self):
         """API sağlayıcılarını başlat ve sırala"""
@@ -141,32 +654,67 @@ class MultiAPIManager:
                 self.active_providers[APIType.TTS].append((provider, config_name))
             if config.get('model_image'):
                 self.active_providers[APIType.IMAGE].append((provider, config_name))
+            
+            breaker_settings = self.config.get('failover_ayarlari', 'circuit_breaker', default={})
+            self.breakers[(provider, config_name)] = CircuitBreaker(
+                usage_key,
+                breaker_settings.get('failure_threshold', 5),
+                breaker_settings.get('recovery_seconds', 30),
+                breaker_settings.get('max_recovery_seconds', 600)
+            )
+            
+            # Anahtar ve API tipi başına RPM/TPM kovaları ve gecikme istatistikleri
+            rate_limits = config.get('rate_limits', {})
+            for api_type in APIType:
+                limits = rate_limits.get(api_type.value, {})
+                self.rate_limiters[(provider, config_name, api_type)] = KeyRateLimiter(
+                    limits.get('rpm'), limits.get('tpm')
+                )
+                self.provider_stats[(provider, config_name, api_type)] = ProviderStats(
+                    self.config.get('failover_ayarlari', 'latency_ewma_alpha', default=0.2),
+                    self.config.get('failover_ayarlari', 'latency_stats_half_life_seconds', default=120)
+                )
         
         print(f"✅ API sağlayıcıları yüklendi:")
         for api_type, providers in self.active_providers.items():
             print(f"  {api_type.value}: {len(providers)} sağlayıcı")
     
     def get_available_provider(self, api_type: APIType) -> Optional[Tuple[str, str]]:
-        """Belirtilen API tipi için kullanılabilir sağlayıcı döndür"""
-        providers = self.active_providers.get(api_type, [])
-        
-        for provider, config_name in providers:
-            usage_key = f"{provider}_{config_name}"
-            usage = self.usage_data.get(usage_key)
-            
-            if not usage or usage.status == APIStatus.ACTIVE:
-                # Quota kontrolü
-                if self._check_quota(provider, config_name):
-                    return provider, config_name
-                else:
-                    # Quota aşıldı, status güncelle
-                    if usage:
-                        usage.status = APIStatus.QUOTA_EXCEEDED
-                        print(f"⚠️ {provider}_{config_name} quota aşıldı")
+        """Belirtilen API tipi için kullanılabilir sağlayıcı döndür
+
+        Hata durumu (ERROR) anahtarı gün boyu dışlamaz; devresi açık olan anahtarlar
+        bekleme süresi dolana kadar atlanır.
+        """
+        providers = [p for p in self._healthy_providers(api_type) if self.breakers[p].available()]
+        if providers:
+            if self.routing_strategy == 'latency_aware':
+                return self._rank_by_completion(api_type, providers)[0]
+            return providers[0]
         
         print(f"❌ {api_type.value} için kullanılabilir API yok!")
         return None
     
+    def _healthy_providers(self, api_type: APIType) -> List[Tuple[str, str]]:
+        """Kotası dolmamış ve devre dışı bırakılmamış sağlayıcılar (öncelik sırasında)
+
+        Hata durumundaki anahtarlar da denenir; yalnızca kota aşımı ve DISABLED
+        dışarıda kalır. Kota, diğer süreçlerin günlüğe yazdığı kullanımla birlikte
+        kontrol edilir.
+        """
+        healthy = []
+        self.refresh_usage()
+        with self._lock:
+            for provider, config_name in self.active_providers.get(api_type, []):
+                usage = self.usage_data.get(f"{provider}_{config_name}")
+                if usage and usage.status in (APIStatus.QUOTA_EXCEEDED, APIStatus.DISABLED):
+                    continue
+                if self._check_quota(provider, config_name):
+                    healthy.append((provider, config_name))
+                elif usage:
+                    usage.status = APIStatus.QUOTA_EXCEEDED
+                    print(f"⚠️ {provider}_{config_name} quota aşıldı")
+        return healthy
+    
     def _check_quota(self, provider: str, config_name: str) -> bool:
         """API quota kontrolü"""
         config = self.config.get('api_providers', provider, config_name, default={})
@@ -180,101 +728,304 @@ class MultiAPIManager:
         
         return usage.requests_today < daily_quota
     
-    def record_usage(self, provider: str, config_name: str, success: bool, error: str = None):
-        """API kullanımını kaydet"""
-        usage_key = f"{provider}_{config_name}"
-        usage = self.usage_data.get(usage_key)
-        
-        if not usage:
-            usage = APIUsage(provider, config_name)
-            self.usage_data[usage_key] = usage
-        
-        usage.requests_today += 1
-        usage.last_used = datetime.now()
-        
+    def record_usage(self, provider: str, config_name: str, success: bool, error: str = None,
+                     quota_exceeded: Optional[bool] = None):
+        """API kullanımını kaydet
+
+        quota_exceeded: hata sınıflandırmasının sonucu - None ise hata metnine bakılır.
+        Dakikalık 429 hataları anahtarı gün boyu kota aşımına düşürmez.
+        """
+        with self._lock:
+            self._record_usage(provider, config_name, success, error, quota_exceeded)
+    
+    def _record_usage(self, provider: str, config_name: str, success: bool, error: str = None,
+                      quota_exceeded: Optional[bool] = None):
         # Maliyet hesapla
         config = self.config.get('api_providers', provider, config_name, default={})
-        cost_per_request = config.get('cost_per_request', 0)
-        usage.total_cost_today += cost_per_request
         
-        if success:
-            usage.status = APIStatus.ACTIVE
-            usage.last_error = None
-        else:
-            usage.last_error = error
-            if "quota" in (error or "").lower():
-                usage.status = APIStatus.QUOTA_EXCEEDED
-            else:
-                usage.status = APIStatus.ERROR
+        entry = {
+            'd': date.today().isoformat(),
+            'ts': round(time.time(), 3),
+            'p': provider,
+            'c': config_name,
+            'ok': success,
+            'cost': config.get('cost_per_request', 0)
+        }
+        if not success:
+            entry['err'] = error
+            if quota_exceeded is not None:
+                entry['quota'] = quota_exceeded
+        
+        # Kayıt eklenir ve diğer süreçlerin kayıtlarıyla birlikte geri okunur
+        with self._file_lock():
+            try:
+                self._append_journal(entry)
+            except OSError as e:
+                logging.error(f"Usage journal yazma hatası: {e}")
+                self._apply_usage_entry(self._usage_for(provider, config_name), entry)
+            self._sync_journal()
         
-        self.save_usage_data()
+        if self._journal_entries >= self.compact_every or self._journal_folded:
+            self.compact_usage_journal()
     
     def get_client(self, provider: str, config_name: str):
         """API client'ı lazy loading ile al"""
         client_key = f"{provider}_{config_name}"
         
-        if client_key not in self._clients:
-            config = self.config.get('api_providers', provider, config_name, default={})
-            # Robust environment variable parsing for complex variable names like ${GEMINI_API_KEY_1}
-            api_key_template = config.get('api_key', '')
-            if api_key_template.startswith('${') and api_key_template.endswith('}'):
-                env_var_name = api_key_template[2:-1]  # Remove ${ and }
-                api_key = os.getenv(env_var_name)
-            else:
-                api_key = api_key_template
+        with self._lock:
+            if client_key not in self._clients:
+                config = self.config.get('api_providers', provider, config_name, default={})
+                # Robust environment variable parsing for complex variable names like ${GEMINI_API_KEY_1}
+                api_key_template = config.get('api_key', '')
+                if api_key_template.startswith('${') and api_key_template.endswith('}'):
+                    env_var_name = api_key_template[2:-1]  # Remove ${ and }
+                    api_key = os.getenv(env_var_name)
+                else:
+                    api_key = api_key_template
             
-            if not api_key:
-                print(f"❌ KRITIK HATA: {env_var_name} environment variable bulunamadı!")
-                sys.exit(1)
+                if not api_key:
+                    print(f"❌ KRITIK HATA: {env_var_name} environment variable bulunamadı!")
+                    sys.exit(1)
             
-            if provider == 'gemini':
-                from google import genai
-                self._clients[client_key] = genai.Client(api_key=api_key)
-            else:
-                print(f"❌ KRITIK HATA: Desteklenmeyen API provider: {provider}. Sadece 'gemini' desteklenmektedir.")
-                sys.exit(1)
+                if provider == 'gemini':
+                    from google import genai
+                    self._clients[client_key] = genai.Client(api_key=api_key)
+                else:
+                    print(f"❌ KRITIK HATA: Desteklenmeyen API provider: {provider}. Sadece 'gemini' desteklenmektedir.")
+                    sys.exit(1)
         
         return self._clients[client_key]
     
-    def make_request(self, api_type: APIType, request_func, max_retries: int = None):
-        """Failover ile API isteği yap"""
+    def make_request(self, api_type: APIType, request_func, max_retries: int = None, estimated_tokens: int = 0):
+        """Failover ile API isteği yap
+
+        estimated_tokens: isteğin tahmini token sayısı - anahtarın TPM kovasından düşülür.
+        Yeniden deneme kuralları make_request_async ile aynıdır (_next_attempt / _handle_failure).
+        """
         if max_retries is None:
             max_retries = self.config.get('failover_ayarlari', 'max_retry_per_api', default=3)
         
-        retry_delay = self.config.get('failover_ayarlari', 'retry_delay_seconds', default=5)
-        providers = self.active_providers.get(api_type, [])
-        
-        for provider, config_name in providers:
-            print(f"🔄 {api_type.value} isteği: {provider}_{config_name}")
+        state = RetryState()
+        while True:
+            selected, wait = self._next_attempt(api_type, max_retries, state, estimated_tokens)
+            if selected is None:
+                time.sleep(wait)
+                continue
             
-            for attempt in range(max_retries):
-                try:
-                    client = self.get_client(provider, config_name)
-                    config = self.config.get('api_providers', provider, config_name, default={})
-                    
-                    # Request'i yap
-                    result = request_func(client, config)
-                    
-                    # Başarılı
-                    self.record_usage(provider, config_name, True)
-                    print(f"✅ {provider}_{config_name} başarılı")
-                    return result
-                    
-                except Exception as e:
-                    error_msg = str(e)
-                    print(f"❌ {provider}_{config_name} hata (deneme {attempt+1}): {error_msg}")
-                    
-                    # Son deneme mi?
-                    if attempt == max_retries - 1:
-                        self.record_usage(provider, config_name, False, error_msg)
-                        break
-                    
-                    # Bekle ve tekrar dene
-                    time.sleep(retry_delay)
+            provider, config_name = selected
+            print(f"🔄 {api_type.value} isteği: {provider}_{config_name}")
+            try:
+                client = self.get_client(provider, config_name)
+                config = self.config.get('api_providers', provider, config_name, default={})
+                
+                # Request'i yap
+                started = time.monotonic()
+                result = request_func(client, config)
+                latency = time.monotonic() - started
+            except Exception as e:
+                self._handle_failure(api_type, selected, e, max_retries, state)
+                continue
+            except BaseException:
+                self.breakers[selected].release_probe()
+                raise
             
-            print(f"⏭️ {provider}_{config_name} başarısız, sonraki sağlayıcıya geçiliyor...")
+            # Başarılı
+            self._record_success(api_type, selected, latency)
+            print(f"✅ {provider}_{config_name} başarılı")
+            return result
+    
+    def _next_attempt(self, api_type: APIType, max_retries: int, state: RetryState,
+                      estimated_tokens: int) -> Tuple[Optional[Tuple[str, str]], float]:
+        """Sıradaki denemenin sağlayıcısı: (sağlayıcı, 0) veya (None, beklenecek süre)
+
+        Deneme hakkı biten ve devresi açık anahtarlar atlanır; geri çekilmesi
+        sürenler bekletilir. Denenebilecek anahtar kalmadıysa istisna yükselir.
+        """
+        candidates = [p for p in self._healthy_providers(api_type)
+                      if state.attempts.get(p, 0) < max_retries and self.breakers[p].available()]
+        if not candidates:
+            suffix = f" Son hata: {state.last_error}" if state.last_error else ""
+            raise Exception(f"Tüm {api_type.value} API sağlayıcıları başarısız!{suffix}")
+        
+        now = time.monotonic()
+        ready = [p for p in candidates if state.not_before.get(p, 0.0) <= now]
+        if not ready:
+            return None, min(state.not_before[p] for p in candidates) - now
+        
+        selected, wait = self._reserve_provider(api_type, ready, estimated_tokens)
+        if selected is not None and not self.breakers[selected].allow():
+            # Yarı açık devrenin tek denemesini başka bir istek aldı: ayrılan kova yeri geri verilir
+            self.rate_limiters[(*selected, api_type)].release(estimated_tokens)
+            return None, 0.05
+        return selected, wait
+    
+    def _record_success(self, api_type: APIType, selected: Tuple[str, str], latency: float):
+        self.breakers[selected].record_success()
+        self.provider_stats[(*selected, api_type)].record(True, latency)
+        self.record_usage(*selected, True)
+    
+    def _handle_failure(self, api_type: APIType, selected: Tuple[str, str], exc: Exception, max_retries: int,
+                        state: RetryState):
+        """Hatayı sınıflandırıp devre kesici, kova ve geri çekilme durumunu günceller
+
+        Hatalı istek (400/404) hiçbir anahtarda tekrar denenmez, istisna yükselir.
+        Kota ve yetki hataları anahtarı bu istek için hemen eler; 429 anahtarın
+        kovasını sunucunun önerdiği süre kadar duraklatır (istek diğer anahtarlara
+        gider); geçici hatalar devre kesiciye sayılır ve tam jitter'lı üstel
+        geri çekilme ile aynı anahtarda tekrar denenir.
+        """
+        provider, config_name = selected
+        kind, hint = classify_error(exc)
+        breaker = self.breakers[selected]
+        attempt = state.attempts.get(selected, 0) + 1
+        state.attempts[selected] = attempt
+        state.last_error = str(exc)
+        print(f"❌ {provider}_{config_name} hata ({kind.value}, deneme {attempt}): {exc}")
+        
+        if kind is ErrorKind.INVALID_REQUEST:
+            breaker.record_success()  # Anahtar yanıt veriyor; sorun istekte
+            self.record_usage(provider, config_name, False, str(exc), quota_exceeded=False)
+            raise exc
+        
+        self.provider_stats[(provider, config_name, api_type)].record(False)
         
-        raise Exception(f"Tüm {api_type.value} API sağlayıcıları başarısız!")
+        if kind is ErrorKind.QUOTA:
+            breaker.release_probe()
+            self.record_usage(provider, config_name, False, str(exc), quota_exceeded=True)
+            state.attempts[selected] = max_retries
+            print(f"⏭️ {provider}_{config_name} günlük kotası doldu, istek diğer sağlayıcılara yönlendiriliyor...")
+            return
+        
+        if kind is ErrorKind.AUTH:
+            breaker.trip()
+            self.record_usage(provider, config_name, False, str(exc), quota_exceeded=False)
+            state.attempts[selected] = max_retries
+            return
+        
+        if kind is ErrorKind.RATE_LIMIT:
+            breaker.record_success()
+            self.rate_limiters[(provider, config_name, api_type)].pause(self.retry_policy.delay(attempt - 1, hint))
+        else:
+            breaker.record_failure()
+            state.not_before[selected] = time.monotonic() + self.retry_policy.delay(attempt - 1, hint)
+        
+        if attempt >= max_retries:
+            self.record_usage(provider, config_name, False, str(exc), quota_exceeded=False)
+            print(f"⏭️ {provider}_{config_name} başarısız, istek diğer sağlayıcılara yönlendiriliyor...")
+    
+    def _expected_completion(self, api_type: APIType, provider_key: Tuple[str, str], prior_latency: float,
+                             estimated_tokens: int = 0) -> float:
+        """Anahtarda isteğin beklenen tamamlanma süresi (saniye)
+
+        (kova bekleme + EWMA gecikme / başarı olasılığı), günlük kotanın kullanılan
+        oranıyla en fazla iki katına çıkacak şekilde ağırlıklandırılır; kotası
+        azalan anahtarın yükü diğerlerine kayar.
+        """
+        provider, config_name = provider_key
+        latency, error_rate = self.provider_stats[(provider, config_name, api_type)].estimate(prior_latency)
+        wait = self.rate_limiters[(provider, config_name, api_type)].wait_time(estimated_tokens)
+        
+        daily_quota = self.config.get('api_providers', provider, config_name, default={}).get('daily_quota')
+        usage = self.usage_data.get(f"{provider}_{config_name}")
+        used = min(1.0, usage.requests_today / daily_quota) if daily_quota and usage else 0.0
+        return (wait + latency / max(1.0 - error_rate, 0.05)) * (1.0 + used)
+    
+    def _rank_by_completion(self, api_type: APIType, candidates: List[Tuple[str, str]],
+                            estimated_tokens: int = 0) -> List[Tuple[str, str]]:
+        """Adayları beklenen tamamlanma süresine göre sıralar (eşitlikte öncelik sırası)
+
+        Hiç ölçülmemiş anahtarlar en iyi ölçülen gecikmeyle başlar, böylece önce denenirler.
+        """
+        measured = [stats.latency for (provider, config_name, t), stats in self.provider_stats.items()
+                    if t == api_type and (provider, config_name) in candidates and stats.latency is not None]
+        prior = min(measured, default=0.0)
+        return sorted(candidates, key=lambda p: self._expected_completion(api_type, p, prior, estimated_tokens))
+    
+    def _reserve_provider(self, api_type: APIType, candidates: List[Tuple[str, str]],
+                          estimated_tokens: int) -> Tuple[Optional[Tuple[str, str]], float]:
+        """Kovasında yer olan ilk sağlayıcıyı ayırır; hiçbirinde yoksa en kısa bekleme süresini döner
+
+        latency_aware stratejisinde beklenen tamamlanma süresi en kısa anahtar seçilir;
+        kovası doluysa (bekleme dahil yine de en iyisiyse) onun açılması beklenir.
+        """
+        if self.routing_strategy == 'latency_aware':
+            best = self._rank_by_completion(api_type, candidates, estimated_tokens)[0]
+            wait = self.rate_limiters[(*best, api_type)].try_acquire(estimated_tokens)
+            return (best, 0.0) if wait <= 0 else (None, wait)
+        
+        shortest = float('inf')
+        for provider, config_name in candidates:
+            wait = self.rate_limiters[(provider, config_name, api_type)].try_acquire(estimated_tokens)
+            if wait <= 0:
+                return (provider, config_name), 0.0
+            shortest = min(shortest, wait)
+        return None, shortest
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                from resource_manager import get_resource_manager
+                self._executor = ThreadPoolExecutor(
+                    max_workers=get_resource_manager().maks_api_isci,
+                    thread_name_prefix="api"
+                )
+            return self._executor
+    
+    def _call_in_slot(self, provider: str, config_name: str, request_func):
+        """İsteği kaynak yöneticisinin API işçi limiti içinde çalıştırır (executor thread'inde)
+
+        Dönüş: (sonuç, slot beklemesi hariç istek süresi)
+        """
+        from resource_manager import get_resource_manager
+        with get_resource_manager().slot('api'):
+            client = self.get_client(provider, config_name)
+            config = self.config.get('api_providers', provider, config_name, default={})
+            started = time.monotonic()
+            result = request_func(client, config)
+            return result, time.monotonic() - started
+    
+    async def make_request_async(self, api_type: APIType, request_func, max_retries: int = None,
+                                 estimated_tokens: int = 0):
+        """make_request'in eşzamanlı sürümü - istekleri tüm sağlıklı anahtarlara yayar
+
+        Her deneme, RPM/TPM kovasında yer olan sağlayıcıya gider (öncelik sırası
+        veya latency_aware stratejisinde beklenen tamamlanma süresi belirler);
+        hiçbirinde yer yoksa en erken açılacak kova beklenir.
+        Böylece eşzamanlı istekler anahtar limitleri toplamına kadar paralel
+        çalışır ve 429 almadan önce yavaşlar. request_func senkron kalır ve API
+        işçi havuzunda çalıştırılır. Bir sağlayıcı max_retries kez başarısız
+        olursa bu istek için devre dışı kalır.
+        """
+        if max_retries is None:
+            max_retries = self.config.get('failover_ayarlari', 'max_retry_per_api', default=3)
+        
+        loop = asyncio.get_running_loop()
+        state = RetryState()
+        
+        # Kullanım defteri işlemleri (flock, günlük okuma/yazma, sıkıştırma) olay döngüsünü
+        # bloklamaması için thread'de çalışır
+        while True:
+            selected, wait = await asyncio.to_thread(self._next_attempt, api_type, max_retries, state,
+                                                     estimated_tokens)
+            if selected is None:
+                await asyncio.sleep(wait)
+                continue
+            
+            provider, config_name = selected
+            try:
+                result, latency = await loop.run_in_executor(
+                    self._get_executor(), self._call_in_slot, provider, config_name, request_func
+                )
+            except Exception as e:
+                await asyncio.to_thread(self._handle_failure, api_type, selected, e, max_retries, state)
+                continue
+            except BaseException:
+                # İptal (CancelledError) veya kesme: yarı açık devrenin probe yeri bırakılır
+                self.breakers[selected].release_probe()
+                raise
+            
+            await asyncio.to_thread(self._record_success, api_type, selected, latency)
+            return result
     
     def get_usage_report(self) -> str:
         """Günlük kullanım raporu"""
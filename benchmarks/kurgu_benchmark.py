@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+# kurgu_benchmark.py - Sentetik fikstürlerle kurgu render'ının aşama bazında ölçümü
+"""
+Sentetik PNG, sinüs WAV ve eşleşen proje.json üretir; Kurgu'yu uçtan uca çalıştırır ve
+her aşama için duvar saati, CPU süresi, tepe RSS ve yazılan bayt miktarını ölçer.
+Sonuçlar JSON olarak yazılır; --karsilastir ile önceki bir çalıştırmayla kıyaslanır.
+
+Kullanım:
+    python benchmarks/kurgu_benchmark.py
+    python benchmarks/kurgu_benchmark.py --boyutlar 5 25 --tekrar 3 --profil onizleme
+    python benchmarks/kurgu_benchmark.py --karsilastir benchmarks/sonuclar/kurgu_20250101_120000.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import resource
+import statistics
+import subprocess
+import tempfile
+import threading
+import wave
+from datetime import datetime
+
+import numpy as np
+import psutil
+from PIL import Image
+
+KOK = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if KOK not in sys.path:
+    sys.path.insert(0, KOK)
+
+FIKSTUR_SURUMU = 1
+SONUC_SURUMU = 1
+VARSAYILAN_BOYUTLAR = [5, 25, 99]
+
+# Fikstürlerde sırayla kullanılan görsel boyutları (16:9, kare, portre, küçük 16:9)
+GORSEL_BOYUTLARI = [(1920, 1080), (1024, 1024), (768, 1365), (1536, 864)]
+IC_EFEKTLER = [
+    {'tip': 'zoom', 'yon': 'in', 'hiz': 'normal'},
+    {'tip': 'pan', 'yon': 'sag', 'hiz': 'yavas'},
+    {'tip': 'zoom', 'yon': 'out', 'hiz': 'hizli'},
+    {'tip': 'yok', 'yon': '', 'hiz': ''}
+]
+GECIS_EFEKTLERI = ['crossfade', 'slide_left', 'glitch', 'fade_to_black', 'slide_right']
+BOLUMLER = [('giris', 'G'), ('gelisme', 'M'), ('sonuc', 'S')]
+PARAGRAF_SEGMENT_SAYISI = 5
+
+# Ölçülen Kurgu metotları: (aşama adı, metot, metottan dönüldüğünde başlayan aşama)
+OLCULEN_METOTLAR = [
+    ('baslatma', '__init__', 'diger'),
+    ('dogrulama', 'varliklari_dogrula', 'diger'),
+    ('artimli_render', 'artimli_render_et', 'diger'),
+    ('numpy_render', 'numpy_ile_render_et', 'diger'),
+    ('klip_render', 'klipleri_olustur', 'diger'),
+    ('gecis_birlestirme', 'klipleri_gercis_efektleri_ile_birlestir', 'diger'),
+    ('muzik', 'muzik_sec', 'diger'),
+    ('ses_miksaj', 'ses_zaman_cizelgesi_olustur', 'final_montaj')
+]
+METRIKLER = ['duvar_sn', 'cpu_sn', 'tepe_rss_mb', 'yazilan_mb']
+
+
+# --- Sentetik fikstürler ---
+
+def sentetik_gorsel(yol, genislik, yukseklik, tohum):
+    """Gradyan, dalga deseni ve gürültüden oluşan; içerik analizinden geçen PNG"""
+    rng = np.random.default_rng(tohum)
+    y, x = np.mgrid[0:yukseklik, 0:genislik].astype(np.float32)
+    faz = rng.uniform(0, 2 * np.pi, 3)
+    kanallar = []
+    for i in range(3):
+        dalga = np.sin(x / (40 + 15 * i) + faz[i]) * np.cos(y / (55 + 10 * i) - faz[i])
+        gradyan = (x / genislik + y / yukseklik) / 2
+        kanallar.append(128 + 70 * dalga + 50 * (gradyan - 0.5))
+    piksel = np.stack(kanallar, axis=-1) + rng.normal(0, 12, (yukseklik, genislik, 3))
+    Image.fromarray(np.clip(piksel, 0, 255).astype(np.uint8), 'RGB').save(yol)
+
+def sentetik_ses(yol, sure, frekans, ornek_hizi=48000):
+    """Hafif genlik zarflı mono 16 bit sinüs WAV"""
+    t = np.arange(int(sure * ornek_hizi)) / ornek_hizi
+    zarf = np.minimum(1.0, np.minimum(t, sure - t) / 0.05) * (0.6 + 0.2 * np.sin(2 * np.pi * 3 * t))
+    ornekler = (0.5 * zarf * np.sin(2 * np.pi * frekans * t) * 32767).astype('<i2')
+    with wave.open(yol, 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(ornek_hizi)
+        w.writeframes(ornekler.tobytes())
+
+def fikstur_olustur(klasor, segment_sayisi, tohum=0):
+    """segment_sayisi segmentlik proje.json, sesler/ ve gorseller/ üretir - varsa yeniden kullanır"""
+    bilgi_yolu = os.path.join(klasor, 'fikstur.json')
+    bilgi = {'surum': FIKSTUR_SURUMU, 'segment_sayisi': segment_sayisi, 'tohum': tohum}
+    try:
+        with open(bilgi_yolu, 'r', encoding='utf-8') as f:
+            if json.load(f) == bilgi:
+                return klasor
+    except (OSError, json.JSONDecodeError):
+        pass
+
+    shutil.rmtree(klasor, ignore_errors=True)
+    ses_klasoru = os.path.join(klasor, 'sesler')
+    gorsel_klasoru = os.path.join(klasor, 'gorseller')
+    os.makedirs(ses_klasoru)
+    os.makedirs(gorsel_klasoru)
+
+    rng = np.random.default_rng(tohum)
+    hikaye_yapisi = {}
+    sira = 0
+    for b, (bolum_adi, kisaltma) in enumerate(BOLUMLER):
+        # Segmentler bölümlere olabildiğince eşit dağıtılır
+        adet = segment_sayisi // len(BOLUMLER) + (1 if b < segment_sayisi % len(BOLUMLER) else 0)
+        paragraflar = []
+        for p in range(0, adet, PARAGRAF_SEGMENT_SAYISI):
+            segmentler = []
+            for s in range(p, min(adet, p + PARAGRAF_SEGMENT_SAYISI)):
+                genislik, yukseklik = GORSEL_BOYUTLARI[sira % len(GORSEL_BOYUTLARI)]
+                segment_numarasi = str(s - p + 1)
+                segment_id = f"{kisaltma}-{p // PARAGRAF_SEGMENT_SAYISI + 1}-{segment_numarasi}"
+                sentetik_gorsel(os.path.join(gorsel_klasoru, f"{segment_id}.png"), genislik, yukseklik, tohum + sira)
+                sentetik_ses(os.path.join(ses_klasoru, f"{segment_id}.wav"),
+                             round(float(rng.uniform(1.5, 4.0)), 2), float(rng.uniform(180, 440)))
+                segmentler.append({
+                    'segment_numarasi': segment_numarasi,
+                    'metin': f"Sentetik segment {sira + 1}",
+                    'gorsel_prompt': "sentetik",
+                    'en_boy_orani': {1920: '16:9', 1536: '16:9', 1024: '1:1', 768: '9:16'}[genislik],
+                    'ic_efekt': IC_EFEKTLER[sira % len(IC_EFEKTLER)],
+                    'gecis_efekti': GECIS_EFEKTLERI[sira % len(GECIS_EFEKTLERI)]
+                })
+                sira += 1
+            paragraflar.append({'paragraf_numarasi': str(p // PARAGRAF_SEGMENT_SAYISI + 1), 'segmentler': segmentler})
+        if paragraflar:
+            hikaye_yapisi[bolum_adi] = {'bolum_kisaltmasi': kisaltma, 'paragraflar': paragraflar}
+
+    with open(os.path.join(klasor, 'proje.json'), 'w', encoding='utf-8') as f:
+        json.dump({'hikaye_yapisi': hikaye_yapisi, 'youtube_bilgileri': {}, 'ffmpeg_ayarlari': {}},
+                  f, ensure_ascii=False, indent=2)
+    with open(bilgi_yolu, 'w', encoding='utf-8') as f:
+        json.dump(bilgi, f)
+    return klasor
+
+
+# --- Aşama ölçümü (ölçüm alt sürecinde çalışır) ---
+
+class AsamaOlcer:
+    """Aşama sınırlarında duvar saati, CPU (kendisi + beklenen alt süreçler), tepe RSS ve yazılan baytı toplar
+
+    RSS ve yazılan bayt, süreç ağacı (FFmpeg alt süreçleri dahil) arka planda örneklenerek
+    ölçülür; yazılan bayt write() çağrılarıyla yazılan karakter sayısıdır (write_chars).
+    """
+
+    def __init__(self, ornekleme_araligi=0.05):
+        self.asamalar = {}
+        self._kilit = threading.Lock()
+        self._aktif = None
+        self._baslangic = None
+        self._tepe_rss = 0
+        self._yazilan = 0
+        self._son_yazilan = {}
+        self._araligi = ornekleme_araligi
+        self._surec = psutil.Process()
+        self._dur = threading.Event()
+        self._ornekleyici = threading.Thread(target=self._ornekle_dongu, daemon=True)
+
+    def baslat(self, ad):
+        self._ornekle()
+        self._ornekleyici.start()
+        self.gecis(ad)
+
+    def bitir(self):
+        self._dur.set()
+        self._ornekleyici.join()
+        self.gecis(None)
+
+    @staticmethod
+    def _cpu():
+        kendi = resource.getrusage(resource.RUSAGE_SELF)
+        alt = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return kendi.ru_utime + kendi.ru_stime + alt.ru_utime + alt.ru_stime
+
+    def gecis(self, ad):
+        """Aktif aşamayı kapatıp ad ile yenisini açar (None: yalnızca kapatır)"""
+        self._ornekle()
+        simdi = (time.perf_counter(), self._cpu())
+        with self._kilit:
+            if self._aktif is not None:
+                kayit = self.asamalar.setdefault(self._aktif, {m: 0.0 for m in METRIKLER})
+                kayit['duvar_sn'] += simdi[0] - self._baslangic[0]
+                kayit['cpu_sn'] += simdi[1] - self._baslangic[1]
+                kayit['tepe_rss_mb'] = max(kayit['tepe_rss_mb'], self._tepe_rss / (1024 * 1024))
+                kayit['yazilan_mb'] += (self._yazilan - self._baslangic[2]) / (1024 * 1024)
+            self._aktif = ad
+            self._baslangic = (simdi[0], simdi[1], self._yazilan)
+            self._tepe_rss = 0
+
+    def _ornekle_dongu(self):
+        while not self._dur.wait(self._araligi):
+            self._ornekle()
+
+    def _ornekle(self):
+        try:
+            agac = [self._surec] + self._surec.children(recursive=True)
+        except psutil.Error:
+            return
+        rss = 0
+        for surec in agac:
+            try:
+                with surec.oneshot():
+                    rss += surec.memory_info().rss
+                    io = surec.io_counters()
+                    anahtar = (surec.pid, surec.create_time())
+            except (psutil.Error, AttributeError):
+                continue
+            yazilan = getattr(io, 'write_chars', io.write_bytes)
+            with self._kilit:
+                self._yazilan += yazilan - self._son_yazilan.get(anahtar, 0)
+                self._son_yazilan[anahtar] = yazilan
+        with self._kilit:
+            self._tepe_rss = max(self._tepe_rss, rss)
+
+def olcumlu_sarmala(sinif, olcer):
+    """Kurgu metotlarını aşama geçişleriyle sarar; iç içe çağrı bitince dış aşamaya dönülür"""
+    yigin = []
+
+    def sarmalayici(asama, metot, sonraki):
+        asil = getattr(sinif, metot)
+
+        def olcumlu(*args, **kwargs):
+            yigin.append(asama)
+            olcer.gecis(asama)
+            try:
+                return asil(*args, **kwargs)
+            finally:
+                yigin.pop()
+                olcer.gecis(yigin[-1] if yigin else sonraki)
+        return olcumlu
+
+    for asama, metot, sonraki in OLCULEN_METOTLAR:
+        setattr(sinif, metot, sarmalayici(asama, metot, sonraki))
+
+def tek_olcum(fikstur, calisma, sonuc_yolu, profil, formatlar):
+    """Kurgu'yu bu süreçte ölçerek çalıştırır ve sonucu sonuc_yolu'na yazar
+
+    Çalışma klasörüne geçildikten sonra içe aktarılır: config ve render önbellekleri oradan okunur.
+    """
+    os.chdir(calisma)
+    from moduller.kurgu import Kurgu
+    from moduller.medya_bilgisi import probe_servisi
+
+    olcer = AsamaOlcer()
+    olcumlu_sarmala(Kurgu, olcer)
+    cikti = os.path.join(calisma, 'cikti', 'final.mp4')
+    os.makedirs(os.path.dirname(cikti), exist_ok=True)
+
+    basari = True
+    baslangic = time.perf_counter()
+    olcer.baslat('baslatma')
+    try:
+        kurgu = Kurgu(os.path.join(fikstur, 'proje.json'), os.path.join(fikstur, 'sesler'),
+                      os.path.join(fikstur, 'gorseller'), cikti, profil, formatlar)
+        kurgu.calistir()
+    except SystemExit as e:
+        basari = not e.code
+    olcer.bitir()
+    toplam_duvar = time.perf_counter() - baslangic
+
+    asamalar = {ad: {m: round(v, 3) for m, v in kayit.items()} for ad, kayit in olcer.asamalar.items()}
+    sonuc = {
+        'basari': basari,
+        'asamalar': asamalar,
+        'toplam': {
+            'duvar_sn': round(toplam_duvar, 3),
+            'cpu_sn': round(sum(a['cpu_sn'] for a in asamalar.values()), 3),
+            'tepe_rss_mb': round(max((a['tepe_rss_mb'] for a in asamalar.values()), default=0.0), 3),
+            'yazilan_mb': round(sum(a['yazilan_mb'] for a in asamalar.values()), 3)
+        },
+        'video_suresi_sn': round(float(probe_servisi.probe(cikti)['format']['duration']), 3) if basari else None,
+        'cikti_mb': round(os.path.getsize(cikti) / (1024 * 1024), 3) if basari and os.path.exists(cikti) else None
+    }
+    with open(sonuc_yolu, 'w', encoding='utf-8') as f:
+        json.dump(sonuc, f, ensure_ascii=False, indent=2)
+
+
+# --- Orkestrasyon ---
+
+def calisma_hazirla(calisma, config_ayarlari):
+    """Depodaki config'in kopyasını (kurgu_ayarlari ezmeleriyle) çalışma klasörüne yazar"""
+    os.makedirs(calisma, exist_ok=True)
+    try:
+        with open(os.path.join(KOK, 'config_advanced.json'), 'r', encoding='utf-8') as f:
+            ayarlar = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        ayarlar = {}
+    ayarlar.setdefault('kurgu_ayarlari', {}).update(config_ayarlari)
+    with open(os.path.join(calisma, 'config_advanced.json'), 'w', encoding='utf-8') as f:
+        json.dump(ayarlar, f, ensure_ascii=False, indent=2)
+
+def olcum_sureci(fikstur, calisma, profil, formatlar, zaman_asimi):
+    """Her ölçüm temiz bir Python sürecinde çalışır (global önbellekler ve sys.exit izole kalır)"""
+    sonuc_yolu = os.path.join(calisma, 'olcum.json')
+    if os.path.exists(sonuc_yolu):
+        os.remove(sonuc_yolu)
+    komut = [sys.executable, os.path.abspath(__file__), '--tek-olcum', fikstur, calisma, sonuc_yolu,
+             '--profil', profil]
+    if formatlar is not None:
+        komut += ['--formatlar', ','.join(formatlar) or 'yok']
+    with open(os.path.join(calisma, 'kurgu.log'), 'w', encoding='utf-8') as log:
+        try:
+            subprocess.run(komut, stdout=log, stderr=subprocess.STDOUT, timeout=zaman_asimi)
+        except subprocess.TimeoutExpired:
+            return {'basari': False, 'hata': f"{zaman_asimi}s zaman aşımı"}
+    try:
+        with open(sonuc_yolu, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {'basari': False, 'hata': "ölçüm sonucu yazılmadı"}
+
+def ortam_bilgisi():
+    bilgi = {
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'cpu_sayisi': os.cpu_count(),
+        'bellek_mb': round(psutil.virtual_memory().total / (1024 * 1024)),
+        'ffmpeg': None,
+        'git': None
+    }
+    try:
+        bilgi['ffmpeg'] = subprocess.run(['ffmpeg', '-version'], capture_output=True, text=True,
+                                         timeout=30).stdout.splitlines()[0]
+    except (OSError, IndexError, subprocess.SubprocessError):
+        pass
+    try:
+        bilgi['git'] = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                      cwd=KOK, timeout=30).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        pass
+    return bilgi
+
+def ozetle(olcumler):
+    """Segment sayısı ve aşama bazında metriklerin medyan/min/maks değerleri"""
+    ozet = {}
+    for boyut in sorted({o['segment_sayisi'] for o in olcumler}):
+        basarili = [o for o in olcumler if o['segment_sayisi'] == boyut and o['basari']]
+        if not basarili:
+            continue
+        asama_adlari = ['toplam'] + [ad for ad in dict.fromkeys(a for o in basarili for a in o['asamalar'])]
+        ozet[str(boyut)] = {}
+        for ad in asama_adlari:
+            # Bir ölçümde hiç çalışmayan aşama (ör. sıcak önbellekte klip render) sıfır sayılır
+            bos = {m: 0.0 for m in METRIKLER}
+            kayitlar = [o['toplam'] if ad == 'toplam' else o['asamalar'].get(ad, bos) for o in basarili]
+            ozet[str(boyut)][ad] = {
+                m: {
+                    'medyan': round(statistics.median(k[m] for k in kayitlar), 3),
+                    'min': round(min(k[m] for k in kayitlar), 3),
+                    'maks': round(max(k[m] for k in kayitlar), 3)
+                } for m in METRIKLER
+            }
+    return ozet
+
+def ozet_yazdir(ozet, onceki=None):
+    for boyut, asamalar in ozet.items():
+        print(f"\n📊 {boyut} segment")
+        print(f"  {'aşama':<20}{'duvar (s)':>11}{'CPU (s)':>10}{'RSS (MB)':>10}{'yazılan (MB)':>14}")
+        for ad, m in asamalar.items():
+            satir = (f"  {ad:<20}{m['duvar_sn']['medyan']:>11.2f}{m['cpu_sn']['medyan']:>10.2f}"
+                     f"{m['tepe_rss_mb']['medyan']:>10.0f}{m['yazilan_mb']['medyan']:>14.1f}")
+            eski = (onceki or {}).get(boyut, {}).get(ad)
+            if eski and eski['duvar_sn']['medyan'] > 0:
+                fark = (m['duvar_sn']['medyan'] / eski['duvar_sn']['medyan'] - 1) * 100
+                satir += f"   {'🔺' if fark > 5 else '🔻' if fark < -5 else '▫️'} {fark:+.1f}% duvar"
+            print(satir)
+
+def main():
+    parser = argparse.ArgumentParser(description="Kurgu render benchmark'ı - sentetik fikstürlerle aşama bazında ölçüm.")
+    parser.add_argument("--boyutlar", type=int, nargs='+', default=VARSAYILAN_BOYUTLAR,
+                        help="Ölçülecek segment sayıları (varsayılan: 5 25 99)")
+    parser.add_argument("--tekrar", type=int, default=1, help="Her boyut için ölçüm tekrarı")
+    parser.add_argument("--profil", default="tam", help="Render profili (tam / onizleme)")
+    parser.add_argument("--formatlar", default=None, help="Ek formatlar, virgülle (kurgu --formatlar ile aynı)")
+    parser.add_argument("--sicak", action="store_true",
+                        help="Render önbelleklerini tekrarlar arasında koru (artımlı yeniden render ölçümü)")
+    parser.add_argument("--tohum", type=int, default=0, help="Fikstür üretim tohumu")
+    parser.add_argument("--fikstur-klasoru", default=os.path.join(tempfile.gettempdir(), "kurgu_benchmark_fikstur"),
+                        help="Üretilen fikstürlerin (yeniden kullanılır) klasörü")
+    parser.add_argument("--calisma-klasoru", default=None, help="Ölçüm çalışma klasörü (varsayılan: geçici klasör)")
+    parser.add_argument("--cikti", default=None, help="Sonuç JSON yolu (varsayılan: benchmarks/sonuclar/kurgu_<zaman>.json)")
+    parser.add_argument("--karsilastir", default=None, help="Kıyaslanacak önceki sonuç JSON'u")
+    parser.add_argument("--zaman-asimi", type=int, default=7200, help="Tek ölçüm için zaman aşımı (saniye)")
+    parser.add_argument("--tek-olcum", nargs=3, metavar=('FIKSTUR', 'CALISMA', 'SONUC'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    formatlar = None
+    if args.formatlar is not None:
+        formatlar = [ad.strip() for ad in args.formatlar.split(',') if ad.strip() and ad.strip() != 'yok']
+
+    if args.tek_olcum:
+        tek_olcum(*args.tek_olcum, args.profil, formatlar)
+        return
+
+    onceki = None
+    if args.karsilastir:
+        try:
+            with open(args.karsilastir, 'r', encoding='utf-8') as f:
+                onceki = json.load(f).get('ozet')
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"❌ KRITIK HATA: Kıyaslama dosyası okunamadı: {args.karsilastir} - {e}")
+            sys.exit(1)
+
+    calisma_koku = args.calisma_klasoru or tempfile.mkdtemp(prefix="kurgu_benchmark_")
+    cikti = args.cikti or os.path.join(KOK, 'benchmarks', 'sonuclar',
+                                       f"kurgu_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+
+    print("⏱️ KURGU BENCHMARK")
+    print("=" * 60)
+    print(f"📐 Boyutlar: {', '.join(map(str, args.boyutlar))} segment, {args.tekrar} tekrar, "
+          f"profil {args.profil}, önbellek {'sıcak' if args.sicak else 'soğuk'}")
+    print(f"📁 Çalışma klasörü: {calisma_koku}")
+
+    olcumler = []
+    for boyut in args.boyutlar:
+        print(f"\n🧪 {boyut} segmentlik fikstür hazırlanıyor...")
+        fikstur = fikstur_olustur(os.path.join(args.fikstur_klasoru, f"s{boyut}_t{args.tohum}"), boyut, args.tohum)
+        for tekrar in range(args.tekrar):
+            calisma = os.path.join(calisma_koku, f"s{boyut}" if args.sicak else f"s{boyut}_{tekrar}")
+            if not args.sicak:
+                shutil.rmtree(calisma, ignore_errors=True)
+            calisma_hazirla(calisma, {'onbellek_klasoru': '.render_cache'})
+            print(f"  ▶️ Ölçüm {tekrar + 1}/{args.tekrar}...", flush=True)
+            sonuc = olcum_sureci(fikstur, calisma, args.profil, formatlar, args.zaman_asimi)
+            olcumler.append({'segment_sayisi': boyut, 'tekrar': tekrar, **sonuc})
+            if sonuc['basari']:
+                print(f"  ✅ {sonuc['toplam']['duvar_sn']:.1f}s duvar, {sonuc['toplam']['cpu_sn']:.1f}s CPU, "
+                      f"video {sonuc['video_suresi_sn']:.2f}s")
+            else:
+                print(f"  ❌ Ölçüm başarısız: {sonuc.get('hata', 'kurgu hata ile çıktı')} "
+                      f"(log: {os.path.join(calisma, 'kurgu.log')})")
+
+    sonuclar = {
+        'surum': SONUC_SURUMU,
+        'tarih': datetime.now().isoformat(timespec='seconds'),
+        'ortam': ortam_bilgisi(),
+        'parametreler': {
+            'boyutlar': args.boyutlar,
+            'tekrar': args.tekrar,
+            'profil': args.profil,
+            'formatlar': formatlar,
+            'sicak': args.sicak,
+            'tohum': args.tohum
+        },
+        'olcumler': olcumler,
+        'ozet': ozetle(olcumler)
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(cikti)), exist_ok=True)
+    with open(cikti, 'w', encoding='utf-8') as f:
+        json.dump(sonuclar, f, ensure_ascii=False, indent=2)
+
+    ozet_yazdir(sonuclar['ozet'], onceki)
+    print(f"\n💾 Sonuçlar: {cikti}")
+    if any(not o['basari'] for o in olcumler):
+        sys.exit(1)
+    if not args.calisma_klasoru:
+        shutil.rmtree(calisma_koku, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
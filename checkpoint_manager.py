@@ -147,8 +147,9 @@ class CheckpointManager:
         self.save_state()
         return False  # Not completed yet
     
-    def update_progress(self, operation_name: str, current_item: int = None, progress: float = None, output_files: List[str] = None):
-        """Update operation progress"""
+    def update_progress(self, operation_name: str, current_item: int = None, progress: float = None,
+                        output_files: List[str] = None, metadata: Dict[str, Any] = None):
+        """Update operation progress (metadata is merged into the operation's metadata)"""
         if operation_name not in self.project_state.operations:
             print(f"❌ KRITIK HATA: Bilinmeyen operasyon: {operation_name}")
             sys.exit(1)
@@ -166,6 +167,9 @@ class CheckpointManager:
         if output_files:
             op_state.output_files.extend(output_files)
         
+        if metadata:
+            op_state.metadata.update(metadata)
+        
         self.project_state.last_updated = datetime.now().isoformat()
         self.save_state()
     
@@ -0,0 +1,302 @@
+# ffmpeg_ilerleme.py - FFmpeg -progress çıktısından canlı ilerleme, aşama verimi ve ETA
+
+import json
+import time
+import threading
+import subprocess
+from collections import deque
+
+# Kurgu stdout'una yazılan makine okunur ilerleme satırlarının öneki; orkestratör bu
+# satırları ayıklayıp CheckpointManager.update_progress'e aktarır
+ILERLEME_ONEKI = "@@KURGU_ILERLEME "
+
+def asama_adi(aciklama):
+    """'Video klip oluşturma: x.mp4' -> 'Video klip oluşturma' (aynı işin süreçleri tek aşamada toplanır)"""
+    return aciklama.split(':', 1)[0].strip()
+
+def _sayi(deger):
+    try:
+        return float(str(deger).rstrip('x'))
+    except (TypeError, ValueError):
+        return None
+
+def ilerleme_satiri_ayristir(satir):
+    """ILERLEME_ONEKI ile başlayan satırın JSON yükünü döndürür - değilse None"""
+    if not satir.startswith(ILERLEME_ONEKI):
+        return None
+    try:
+        return json.loads(satir[len(ILERLEME_ONEKI):])
+    except json.JSONDecodeError:
+        return None
+
+class FFmpegIlerlemeIzleyici:
+    """FFmpeg süreçlerini -progress pipe:1 ile çalıştırıp ilerlemelerini toplar
+
+    Her süreç için frame, fps, speed ve out_time okunur; aynı aşamadaki süreçler
+    (ör. tüm klip kodlamaları) toplam kare, medya süresi ve duvar saati olarak
+    birleştirilir. Paralel aşamalar işlerinin toplam süresini asama_planla ile
+    bildirir; aşama ETA'sı kuyruktaki işler dahil kalan süre / aşama verimidir. Stderr yalnızca son satırları tutan sınırlı bir kuyrukta saklanır.
+    Belirli süre boyunca ilerleme göstermeyen süreç takılmış sayılıp sonlandırılır.
+    """
+
+    def __init__(self):
+        self._kilit = threading.Lock()
+        self._asamalar = {}
+        self._aktif = {}
+        self._sayac = 0
+        self._son_yayin = 0.0
+        self.ayarla({})
+
+    def ayarla(self, ayarlar):
+        """kurgu_ayarlari.ilerleme değerlerini uygular"""
+        self.rapor_araligi_sn = ayarlar.get('rapor_araligi_sn', 5.0)
+        self.takilma_uyari_sn = ayarlar.get('takilma_uyari_sn', 30.0)
+        self.takilma_suresi_sn = ayarlar.get('takilma_suresi_sn', 120.0)
+        self.stderr_satir_sayisi = ayarlar.get('stderr_satir_sayisi', 200)
+        self.yayinla = ayarlar.get('checkpoint_yayini', True)
+
+    def calistir(self, komut_listesi, aciklama, beklenen_sure=None):
+        """Komutu çalıştırır; (return code, stderr kuyruğu, takıldı mı) döndürür
+
+        beklenen_sure: çıktının saniye cinsinden süresi - biliniyorsa ETA hesaplanır.
+        """
+        komut = list(komut_listesi)
+        if komut and komut[0] == 'ffmpeg':
+            komut[1:1] = ['-progress', 'pipe:1', '-nostats']
+
+        surec = subprocess.Popen(
+            komut,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors='replace'
+        )
+        stderr_kuyrugu = deque(maxlen=self.stderr_satir_sayisi)
+        kimlik = self._surec_kaydet(aciklama, beklenen_sure)
+
+        okuyucular = [
+            threading.Thread(target=self._stderr_oku, args=(surec.stderr, stderr_kuyrugu), daemon=True),
+            threading.Thread(target=self._ilerleme_oku, args=(surec.stdout, kimlik), daemon=True)
+        ]
+        for okuyucu in okuyucular:
+            okuyucu.start()
+
+        takildi = False
+        uyarildi = False
+        while True:
+            try:
+                surec.wait(timeout=1.0)
+                break
+            except subprocess.TimeoutExpired:
+                pass
+
+            with self._kilit:
+                durgun = time.time() - self._aktif[kimlik]['son_degisim']
+            if durgun > self.takilma_suresi_sn:
+                print(f"❌ FFmpeg {durgun:.0f}s boyunca ilerleme göstermedi, sonlandırılıyor ({aciklama})")
+                surec.kill()
+                surec.wait()
+                takildi = True
+                break
+            if durgun > self.takilma_uyari_sn and not uyarildi:
+                print(f"⚠️ FFmpeg {durgun:.0f}s'dir ilerleme göstermiyor ({aciklama})")
+                uyarildi = True
+            elif durgun <= self.takilma_uyari_sn:
+                uyarildi = False
+            self._rapor_gerekirse()
+
+        for okuyucu in okuyucular:
+            okuyucu.join(timeout=5)
+        self._surec_bitir(kimlik)
+        self._rapor_gerekirse(zorla=True)
+        return surec.returncode, list(stderr_kuyrugu), takildi
+
+    def _surec_kaydet(self, aciklama, beklenen_sure):
+        simdi = time.time()
+        with self._kilit:
+            self._sayac += 1
+            self._aktif[self._sayac] = {
+                'asama': asama_adi(aciklama),
+                'aciklama': aciklama,
+                'beklenen_sure': beklenen_sure,
+                'baslangic': simdi,
+                'son_degisim': simdi,
+                'kare': 0,
+                'fps': 0.0,
+                'hiz': None,
+                'out_time': 0.0
+            }
+            self._asama(asama_adi(aciklama))['surec'] += 1
+            return self._sayac
+
+    def _asama(self, ad):
+        return self._asamalar.setdefault(ad, {
+            'surec': 0, 'kare': 0, 'medya_suresi': 0.0, 'islem_suresi': 0.0, 'plan': None
+        })
+
+    def asama_planla(self, asama, toplam_sure):
+        """Aşamada çalışacak işlerin toplam çıktı süresini (saniye) bildirir
+
+        Aşama ETA'sı henüz başlamamış işleri de kapsar. asama_kapat çağrılana kadar geçerlidir.
+        """
+        with self._kilit:
+            a = self._asama(asama)
+            a['plan'] = {
+                'baslangic': time.time(),
+                'toplam': toplam_sure,
+                'atlanan': 0.0,
+                'medya0': a['medya_suresi'] + sum(b['out_time'] for b in self._aktif.values() if b['asama'] == asama)
+            }
+
+    def asama_atla(self, asama, sure):
+        """Planlanan bir iş kodlanmadan tamamlandı (ör. önbellekten geldi)"""
+        with self._kilit:
+            plan = self._asamalar.get(asama, {}).get('plan')
+            if plan:
+                plan['atlanan'] += sure
+
+    def asama_kapat(self, asama):
+        with self._kilit:
+            if asama in self._asamalar:
+                self._asamalar[asama]['plan'] = None
+
+    def _surec_bitir(self, kimlik):
+        with self._kilit:
+            bilgi = self._aktif.pop(kimlik)
+            asama = self._asamalar[bilgi['asama']]
+            asama['kare'] += bilgi['kare']
+            asama['medya_suresi'] += bilgi['out_time']
+            asama['islem_suresi'] += time.time() - bilgi['baslangic']
+
+    @staticmethod
+    def _stderr_oku(akis, kuyruk):
+        for satir in akis:
+            kuyruk.append(satir.rstrip('\n'))
+
+    def _ilerleme_oku(self, akis, kimlik):
+        """key=value bloklarını okur; her 'progress=' satırı bir bloğu kapatır"""
+        blok = {}
+        for satir in akis:
+            anahtar, _, deger = satir.strip().partition('=')
+            if anahtar != 'progress':
+                blok[anahtar] = deger
+                continue
+
+            kare = int(_sayi(blok.get('frame')) or 0)
+            out_us = _sayi(blok.get('out_time_us'))
+            out_time = max(0.0, out_us / 1e6) if out_us is not None else None
+            with self._kilit:
+                bilgi = self._aktif.get(kimlik)
+                if bilgi is None:
+                    return
+                if kare > bilgi['kare'] or (out_time is not None and out_time > bilgi['out_time']):
+                    bilgi['son_degisim'] = time.time()
+                bilgi['kare'] = max(bilgi['kare'], kare)
+                if out_time is not None:
+                    bilgi['out_time'] = max(bilgi['out_time'], out_time)
+                bilgi['fps'] = _sayi(blok.get('fps')) or 0.0
+                bilgi['hiz'] = _sayi(blok.get('speed'))
+            blok = {}
+
+    @staticmethod
+    def _surec_ozeti(bilgi, simdi):
+        gecen = simdi - bilgi['baslangic']
+        hiz = bilgi['hiz'] or (bilgi['out_time'] / gecen if gecen > 0 else None)
+        eta = None
+        if bilgi['beklenen_sure'] and hiz:
+            eta = max(0.0, (bilgi['beklenen_sure'] - bilgi['out_time']) / hiz)
+        return {
+            'aciklama': bilgi['aciklama'],
+            'kare': bilgi['kare'],
+            'fps': round(bilgi['fps'], 1),
+            'hiz': round(hiz, 3) if hiz else None,
+            'out_time_sn': round(bilgi['out_time'], 2),
+            'beklenen_sure_sn': bilgi['beklenen_sure'],
+            'oran': min(1.0, bilgi['out_time'] / bilgi['beklenen_sure']) if bilgi['beklenen_sure'] else None,
+            'eta_sn': round(eta, 1) if eta is not None else None,
+            'durgun_sn': round(simdi - bilgi['son_degisim'], 1)
+        }
+
+    def ozet(self):
+        """Aşama bazında toplam verim ve aktif süreçlerin ilerlemesi"""
+        simdi = time.time()
+        with self._kilit:
+            aktifler = [self._surec_ozeti(b, simdi) for b in self._aktif.values()]
+            aktif_asamalar = {b['asama'] for b in self._aktif.values()}
+            asamalar = {}
+            for ad, a in self._asamalar.items():
+                kare = a['kare'] + sum(b['kare'] for b in self._aktif.values() if b['asama'] == ad)
+                medya = a['medya_suresi'] + sum(b['out_time'] for b in self._aktif.values() if b['asama'] == ad)
+                islem = a['islem_suresi'] + sum(simdi - b['baslangic'] for b in self._aktif.values() if b['asama'] == ad)
+                asamalar[ad] = {
+                    'surec': a['surec'],
+                    'kare': kare,
+                    'islem_suresi_sn': round(islem, 1),
+                    'kare_hizi': round(kare / islem, 1) if islem > 0 else None,
+                    'hiz': round(medya / islem, 3) if islem > 0 else None,
+                    'aktif': ad in aktif_asamalar or a['plan'] is not None,
+                    **self._asama_eta(a['plan'], medya, simdi,
+                                      [s['eta_sn'] for s, b in zip(aktifler, self._aktif.values()) if b['asama'] == ad])
+                }
+        etalar = [a['eta_sn'] for a in asamalar.values() if a['aktif'] and a['eta_sn'] is not None]
+        return {
+            'zaman': simdi,
+            'asamalar': asamalar,
+            'aktif_surecler': aktifler,
+            'eta_sn': max(etalar) if etalar else None
+        }
+
+    @staticmethod
+    def _asama_eta(plan, medya, simdi, surec_etalari):
+        """Planlı aşamada: (toplam - atlanan - tamamlanan) / aşama verimi (medya saniyesi / duvar saniyesi)
+
+        Verim aşamadaki tüm paralel süreçlerin toplamıdır. Plansız aşamada en geç
+        bitecek aktif sürecin ETA'sı kullanılır.
+        """
+        if plan is None:
+            etalar = [eta for eta in surec_etalari if eta is not None]
+            return {'verim': None, 'oran': None, 'eta_sn': max(etalar) if etalar else None}
+        tamamlanan = medya - plan['medya0']
+        gecen = simdi - plan['baslangic']
+        verim = tamamlanan / gecen if gecen > 0 and tamamlanan > 0 else None
+        kalan = max(0.0, plan['toplam'] - plan['atlanan'] - tamamlanan)
+        return {
+            'verim': round(verim, 3) if verim else None,
+            'oran': min(1.0, (tamamlanan + plan['atlanan']) / plan['toplam']) if plan['toplam'] > 0 else None,
+            'eta_sn': round(kalan / verim, 1) if verim else None
+        }
+
+    def _rapor_gerekirse(self, zorla=False):
+        """Rapor aralığı dolduysa konsola özet basar ve ilerleme satırını yayınlar"""
+        simdi = time.time()
+        with self._kilit:
+            if not zorla and simdi - self._son_yayin < self.rapor_araligi_sn:
+                return
+            self._son_yayin = simdi
+
+        ozet = self.ozet()
+        for s in ozet['aktif_surecler']:
+            oran = f" %{s['oran'] * 100:.0f}" if s['oran'] is not None else ""
+            hiz = f"{s['hiz']:.2f}x" if s['hiz'] else "?x"
+            eta = f", ETA {s['eta_sn']:.0f}s" if s['eta_sn'] is not None else ""
+            print(f"  ⏳ {s['aciklama']}:{oran} kare {s['kare']}, {s['fps']:.1f} fps, {hiz}{eta}")
+        for ad, a in ozet['asamalar'].items():
+            if a['aktif'] and a['oran'] is not None:
+                verim = f", {a['verim']:.2f}x toplam verim" if a['verim'] else ""
+                eta = f", ETA {a['eta_sn']:.0f}s" if a['eta_sn'] is not None else ""
+                print(f"  📊 {ad} aşaması: %{a['oran'] * 100:.0f}{verim}{eta}")
+        if self.yayinla:
+            print(f"{ILERLEME_ONEKI}{json.dumps(ozet, ensure_ascii=False)}", flush=True)
+
+    def rapor(self):
+        """Final raporu için aşama bazında verim satırları"""
+        satirlar = []
+        for ad, a in self.ozet()['asamalar'].items():
+            hiz = f", {a['hiz']:.2f}x" if a['hiz'] else ""
+            kare_hizi = f"{a['kare_hizi']:.1f} kare/s" if a['kare_hizi'] else "-"
+            satirlar.append(f"{ad}: {a['surec']} süreç, {a['kare']} kare, "
+                            f"{a['islem_suresi_sn']:.1f}s, {kare_hizi}{hiz}")
+        return satirlar
+
+# Global instance
+ffmpeg_izleyici = FFmpegIlerlemeIzleyici()
@@ -0,0 +1,87 @@
+# fifo_akisi.py - Render aşamalarını ara dosya yerine adlandırılmış borularla (FIFO) bağlama
+
+import os
+import threading
+
+class FifoAkisi:
+    """Bir üretici ile eşzamanlı tüketicilerini FIFO'lar üzerinden çalıştıran yönetici
+
+    Tüketiciler (ör. ses miksajı, final montaj) kayıt edilir ama üretici çıktısını
+    açmadan hemen önce başlatılır. Taraflardan biri başarısız olursa boruların
+    karşı uçları bloklanmadan açılıp kapatılır; böylece diğer taraflar açılışta
+    veya okuma/yazmada sonsuza dek beklemez, hata (EOF / EPIPE) ile sonlanır.
+    """
+
+    def __init__(self, klasor):
+        self.klasor = klasor
+        self.borular = []
+        self.sonuclar = {}
+        self._tuketiciler = []
+        self._iplikler = []
+        self._baslatildi = False
+
+    @staticmethod
+    def destekleniyor():
+        return hasattr(os, 'mkfifo')
+
+    def boru(self, ad):
+        """Geçici klasörde yeni bir FIFO oluşturur"""
+        yol = os.path.join(self.klasor, ad)
+        if os.path.exists(yol):
+            os.remove(yol)
+        os.mkfifo(yol)
+        self.borular.append(yol)
+        return yol
+
+    def tuketici_ekle(self, ad, hedef):
+        """hedef: başarıda doğru değer döndüren çağrılabilir - baslat() ile ayrı iş parçacığında çalışır"""
+        self._tuketiciler.append((ad, hedef))
+
+    def baslat(self):
+        """Kayıtlı tüketicileri başlatır (yalnızca ilk çağrıda)"""
+        if self._baslatildi:
+            return
+        self._baslatildi = True
+        for ad, hedef in self._tuketiciler:
+            iplik = threading.Thread(target=self._calistir, args=(ad, hedef), daemon=True)
+            self._iplikler.append(iplik)
+            iplik.start()
+
+    def _calistir(self, ad, hedef):
+        try:
+            basarili = bool(hedef())
+        except BaseException as e:  # sys.exit dahil - iş parçacığı sessizce ölmemeli
+            print(f"❌ Akış aşaması başarısız ({ad}): {e!r}")
+            basarili = False
+        self.sonuclar[ad] = basarili
+        if not basarili:
+            self.serbest_birak()
+
+    def serbest_birak(self):
+        """Her borunun iki ucunu bloklamadan açıp kapatır; bekleyen açılışlar ve akışlar sonlanır"""
+        for yol in self.borular:
+            for bayrak in (os.O_RDONLY | os.O_NONBLOCK, os.O_WRONLY | os.O_NONBLOCK):
+                try:
+                    os.close(os.open(yol, bayrak))
+                except OSError:
+                    pass  # Karşı uçta bekleyen yoksa yazma ucu ENXIO verir
+
+    def bekle(self, uretici_basarili):
+        """Tüketicilerin bitmesini bekler; akışın tamamı başarılıysa True"""
+        if not self._baslatildi:
+            return False
+        while any(iplik.is_alive() for iplik in self._iplikler):
+            if not uretici_basarili or not all(list(self.sonuclar.values())):
+                self.serbest_birak()
+            for iplik in self._iplikler:
+                iplik.join(timeout=1.0)
+        return uretici_basarili and all(self.sonuclar.get(ad, False) for ad, _ in self._tuketiciler)
+
+    def kapat(self):
+        """FIFO'ları siler - aynı adla dosya yazacak geri dönüş modunu bloklamasın"""
+        for yol in self.borular:
+            try:
+                os.remove(yol)
+            except OSError:
+                pass
+        self.borular = []
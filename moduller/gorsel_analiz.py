@@ -0,0 +1,55 @@
+# gorsel_analiz.py - Üretilen görsellerin küçültülmüş kopya üzerinden NumPy içerik analizi
+
+import numpy as np
+from PIL import Image
+
+# Analizin yapıldığı küçültülmüş kopyanın kısa kenarı (piksel)
+ANALIZ_KENARI = 256
+
+# Varsayılan eşikler - config'deki kurgu_ayarlari.gorsel_analizi ile ezilebilir
+VARSAYILAN_ESIKLER = {
+    'min_ortalama': 12.0,          # Altı: siyah / çok karanlık
+    'max_ortalama': 245.0,         # Üstü: boş / beyaz
+    'min_sapma': 8.0,              # Altı: neredeyse tek renk
+    'max_kirpik_orani': 0.6,       # Üstü: piksellerin çoğu 0 veya 255'e kırpılmış
+    'min_kenar_enerjisi': 1.0      # Altı: detay yok (boş veya aşırı bulanık)
+}
+
+def icerik_analizi(yol, analiz_kenari=ANALIZ_KENARI):
+    """Parlaklık ortalaması/sapması, kırpılmış piksel oranı ve kenar enerjisini ölçer
+
+    Görsel tam çözünürlükte işlenmez: JPEG'de çözücü doğrudan küçük boyutta çözer
+    (draft), diğerlerinde C tarafında kutu filtresiyle (reduce) küçültülür.
+    """
+    with Image.open(yol) as img:
+        img.draft('L', (analiz_kenari, analiz_kenari))
+        gri = img.convert('L')
+        faktor = max(1, min(gri.size) // analiz_kenari)
+        if faktor > 1:
+            gri = gri.reduce(faktor)
+        piksel = np.asarray(gri, dtype=np.float32)
+
+    kirpik = np.count_nonzero((piksel <= 4) | (piksel >= 251)) / piksel.size
+    kenar = (np.abs(np.diff(piksel, axis=1)).mean() + np.abs(np.diff(piksel, axis=0)).mean()) / 2
+    return {
+        'ortalama': round(float(piksel.mean()), 2),
+        'sapma': round(float(piksel.std()), 2),
+        'kirpik_orani': round(float(kirpik), 4),
+        'kenar_enerjisi': round(float(kenar), 3)
+    }
+
+def icerik_sorunlari(metrikler, esikler=None):
+    """Eşikleri aşan metrikler için okunabilir sorun listesi"""
+    e = {**VARSAYILAN_ESIKLER, **(esikler or {})}
+    sorunlar = []
+    if metrikler['ortalama'] < e['min_ortalama']:
+        sorunlar.append(f"Görsel siyah veya çok karanlık (ortalama {metrikler['ortalama']:.1f})")
+    if metrikler['ortalama'] > e['max_ortalama']:
+        sorunlar.append(f"Görsel boş veya beyaz (ortalama {metrikler['ortalama']:.1f})")
+    if metrikler['sapma'] < e['min_sapma']:
+        sorunlar.append(f"Görsel neredeyse tek renk (sapma {metrikler['sapma']:.1f})")
+    if metrikler['kirpik_orani'] > e['max_kirpik_orani']:
+        sorunlar.append(f"Piksellerin %{metrikler['kirpik_orani'] * 100:.0f}'i kırpılmış")
+    if metrikler['kenar_enerjisi'] < e['min_kenar_enerjisi']:
+        sorunlar.append(f"Görselde detay yok (kenar enerjisi {metrikler['kenar_enerjisi']:.2f})")
+    return sorunlar
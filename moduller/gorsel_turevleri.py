@@ -0,0 +1,131 @@
+# gorsel_turevleri.py - Efekt render'ı için önceden ölçeklenmiş, tuvale hazır görsel türevleri
+
+import os
+import hashlib
+import threading
+import numpy as np
+from PIL import Image
+
+# build_video_filter ile aynı: oranı tuvalden bu kadar az farklı görsel esnetilir, diğerleri sığdırılıp doldurulur
+ORAN_TOLERANSI = 0.01
+TUREV_SURUMU = 1
+
+def tuval_boyutu(genislik, yukseklik, olcek):
+    """Aşırı örneklenmiş tuvalin (çift sayılı) boyutları"""
+    return int(round(genislik * olcek / 2)) * 2, int(round(yukseklik * olcek / 2)) * 2
+
+def kaynak_olcegi(gorsel_genislik, gorsel_yukseklik, genislik, yukseklik):
+    """Görselin tuvale sığdırıldığında kayıpsız taşıyabileceği en büyük aşırı örnekleme"""
+    return max(gorsel_genislik / genislik, gorsel_yukseklik / yukseklik)
+
+def tuval_olustur(gorsel_yolu, genislik, yukseklik):
+    """Görseli oran koruyarak tuvale sığdırır ve siyahla doldurur; oranı tuvalle aynıysa esnetir"""
+    with Image.open(gorsel_yolu) as img:
+        img = img.convert('RGB')
+        if abs(img.width / img.height - genislik / yukseklik) < ORAN_TOLERANSI:
+            return img.resize((genislik, yukseklik), Image.LANCZOS)
+        oran = min(genislik / img.width, yukseklik / img.height)
+        yeni_boyut = (max(1, round(img.width * oran)), max(1, round(img.height * oran)))
+        img = img.resize(yeni_boyut, Image.LANCZOS)
+        tuval = Image.new('RGB', (genislik, yukseklik), (0, 0, 0))
+        tuval.paste(img, ((genislik - yeni_boyut[0]) // 2, (yukseklik - yeni_boyut[1]) // 2))
+    return tuval
+
+class GorselTurevOnbellegi:
+    """Görsel özeti ve tuval boyutuyla anahtarlanan, boyut sınırlı (LRU) türev önbelleği
+
+    Her görsel, efektin ihtiyaç duyduğu çözünürlükte bir kez ölçeklenip tuvale
+    yerleştirilir ve PNG (hızlı sıkıştırma) olarak saklanır; FFmpeg klipleri ve NumPy
+    motoru orijinal görsel yerine bu türevi okur.
+    """
+
+    def __init__(self, klasor, max_mb=2000):
+        self.klasor = klasor
+        self.max_bayt = int(max_mb * 1024 * 1024)
+        self._kilit = threading.Lock()
+        self._anahtar_kilitleri = {}
+        self._ozetler = {}
+        self.istatistik = {'onbellek': 0, 'uretilen': 0}
+        os.makedirs(self.klasor, exist_ok=True)
+
+    def gorsel_ozeti(self, gorsel_yolu):
+        """Görsel baytlarının özeti - (boyut, mtime) değişmedikçe yeniden hesaplanmaz"""
+        durum = os.stat(gorsel_yolu)
+        imza = (os.path.abspath(gorsel_yolu), durum.st_size, durum.st_mtime_ns)
+        with self._kilit:
+            ozet = self._ozetler.get(imza)
+        if ozet is None:
+            h = hashlib.sha256()
+            with open(gorsel_yolu, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    h.update(chunk)
+            ozet = h.hexdigest()
+            with self._kilit:
+                self._ozetler[imza] = ozet
+        return ozet
+
+    def yol(self, anahtar):
+        return os.path.join(self.klasor, f"{anahtar}.png")
+
+    def turev(self, gorsel_yolu, genislik, yukseklik):
+        """Görselin genislik x yukseklik tuval türevinin yolu - yoksa üretilir"""
+        anahtar = f"{self.gorsel_ozeti(gorsel_yolu)[:32]}_{genislik}x{yukseklik}_v{TUREV_SURUMU}"
+        hedef = self.yol(anahtar)
+        with self._kilit:
+            anahtar_kilidi = self._anahtar_kilitleri.setdefault(anahtar, threading.Lock())
+
+        # Aynı türevi isteyen diğer işçiler üretim bitene kadar bekler
+        with anahtar_kilidi:
+            if os.path.exists(hedef):
+                try:
+                    os.utime(hedef, None)  # LRU için son kullanım zamanı
+                except OSError:
+                    pass
+                with self._kilit:
+                    self.istatistik['onbellek'] += 1
+                return hedef
+
+            gecici = f"{hedef}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                tuval_olustur(gorsel_yolu, genislik, yukseklik).save(gecici, format='PNG', compress_level=1)
+                os.replace(gecici, hedef)
+            finally:
+                if os.path.exists(gecici):
+                    os.remove(gecici)
+            with self._kilit:
+                self.istatistik['uretilen'] += 1
+                self._boyut_sinirla(korunan=hedef)
+            return hedef
+
+    def dizi(self, gorsel_yolu, genislik, yukseklik):
+        """Türevi RGB NumPy dizisi olarak döndürür (NumPy render motoru için)"""
+        with Image.open(self.turev(gorsel_yolu, genislik, yukseklik)) as img:
+            return np.asarray(img.convert('RGB'), dtype=np.uint8)
+
+    def _boyut_sinirla(self, korunan=None):
+        """Toplam boyut sınırı aşılırsa en eski kullanılan türevleri siler"""
+        kayitlar = []
+        for dosya in os.listdir(self.klasor):
+            if not dosya.endswith('.png'):
+                continue
+            yol = os.path.join(self.klasor, dosya)
+            try:
+                stat = os.stat(yol)
+            except OSError:
+                continue
+            kayitlar.append((stat.st_mtime, stat.st_size, yol))
+
+        toplam = sum(boyut for _, boyut, _ in kayitlar)
+        for _, boyut, yol in sorted(kayitlar):
+            if toplam <= self.max_bayt:
+                break
+            if yol == korunan:
+                continue
+            try:
+                os.remove(yol)
+                toplam -= boyut
+            except OSError:
+                pass
+
+    def rapor(self):
+        return f"{self.istatistik['uretilen']} üretildi, {self.istatistik['onbellek']} önbellekten"
@@ -3,6 +3,7 @@ import json
 import argparse
 import sys
 import base64
+import asyncio
 import requests
 
 # Path handling for imports
@@ -15,14 +16,76 @@ from google import genai
 from google.genai import types
 import openai
 from api_manager import get_api_manager, APIType
+from config_manager import config
+from moduller.varlik_dogrulama import varlik_dogrulayici
 
 class MultiAPIGorselYonetmen:
     """Multi-API ile görsel üretimi"""
     def __init__(self):
         print("🎨 Multi-API Görsel Yönetmen başlatılıyor...")
         self.api_manager = get_api_manager()
+        # Kurgu ile aynı varlık önbelleği: burada analiz edilen görseller kurguda yeniden çözülmez
+        kurgu_ayarlari = config.get('kurgu_ayarlari', default={})
+        varlik_dogrulayici.kalici_onbellek_ac(
+            os.path.join(kurgu_ayarlari.get('onbellek_klasoru', '.render_cache'), 'varliklar.json')
+        )
+        self.gorsel_analizi = kurgu_ayarlari.get('gorsel_analizi', {})
+        if self.gorsel_analizi.get('aktif', True):
+            varlik_dogrulayici.icerik_analizini_ac(self.gorsel_analizi)
         print("🤖 Multi-API görsel üretim sistemi hazır!")
 
+    def gorsel_uret_ve_dogrula(self, gorsel_prompt, en_boy_orani, dosya_yolu):
+        """Görseli üretip kaydeder; içerik kontrolünden geçemezse yalnızca bu segmenti yeniden üretir"""
+        deneme_sayisi = 1 + self.gorsel_analizi.get('yeniden_uretim_denemesi', 2)
+        for deneme in range(1, deneme_sayisi + 1):
+            generated_image = self.image_request_wrapper(gorsel_prompt, en_boy_orani)
+            sorunlar = self.kaydet_ve_dogrula(generated_image, dosya_yolu, deneme, deneme_sayisi)
+            if not sorunlar:
+                return
+        
+        raise Exception(f"Görsel {deneme_sayisi} denemede kontrolden geçemedi: {'; '.join(sorunlar)}")
+
+    async def gorsel_uret_ve_dogrula_async(self, gorsel_prompt, en_boy_orani, dosya_yolu):
+        """gorsel_uret_ve_dogrula'nın eşzamanlı sürümü - kayıt ve analiz thread'de yapılır"""
+        deneme_sayisi = 1 + self.gorsel_analizi.get('yeniden_uretim_denemesi', 2)
+        for deneme in range(1, deneme_sayisi + 1):
+            generated_image = await self.api_manager.make_request_async(
+                APIType.IMAGE, self.image_request_func(gorsel_prompt, en_boy_orani)
+            )
+            sorunlar = await asyncio.to_thread(self.kaydet_ve_dogrula, generated_image, dosya_yolu,
+                                               deneme, deneme_sayisi)
+            if not sorunlar:
+                return
+        
+        raise Exception(f"Görsel {deneme_sayisi} denemede kontrolden geçemedi: {'; '.join(sorunlar)}")
+
+    def kaydet_ve_dogrula(self, generated_image, dosya_yolu, deneme, deneme_sayisi):
+        """Görseli kaydeder ve içerik sorunlarını döndürür"""
+        generated_image.save(dosya_yolu)
+        _, sorunlar = varlik_dogrulayici.sorunlar(dosya_yolu, 'gorsel')
+        if sorunlar:
+            print(f"    ⚠️ {os.path.basename(dosya_yolu)} kontrolden geçemedi (deneme {deneme}/{deneme_sayisi}): "
+                  f"{'; '.join(sorunlar)}")
+        return sorunlar
+
+    async def gorselleri_eszamanli_uret(self, isler):
+        """Segment görsellerini anahtarların RPM limitleri içinde eşzamanlı üretir
+
+        isler: [(temel dosya adı, prompt, en-boy oranı, dosya yolu)]. Dönüş: başarılı sayısı;
+        herhangi bir görsel üretilemezse süreç durur.
+        """
+        async def isle(temel_dosya_adi, gorsel_prompt, en_boy_orani, dosya_yolu):
+            print(f"  🖼️  İşleniyor: {temel_dosya_adi} [{en_boy_orani}] -> \"{gorsel_prompt[:60]}...\"")
+            await self.gorsel_uret_ve_dogrula_async(gorsel_prompt, en_boy_orani, dosya_yolu)
+            print(f"    ✅ Kaydedildi: {dosya_yolu}")
+
+        sonuclar = await asyncio.gather(*(isle(*is_) for is_ in isler), return_exceptions=True)
+        for (temel_dosya_adi, _, _, _), sonuc in zip(isler, sonuclar):
+            if isinstance(sonuc, Exception):
+                print(f"    ❌ KRITIK HATA: Görsel oluşturulamadı ({temel_dosya_adi}): {sonuc}")
+                sys.exit(1)  # Görsel üretilemezse dur
+        return len(isler)
+
     def json_oku(self, json_dosya_yolu):
         """Proje JSON dosyasını okur ve içeriğini döndürür."""
         print(f"📖 Proje dosyası okunuyor: {json_dosya_yolu}")
@@ -43,6 +106,10 @@ class MultiAPIGorselYonetmen:
 
     def image_request_wrapper(self, gorsel_prompt, en_boy_orani):
         """Multi-API image generation wrapper"""
+        return self.api_manager.make_request(APIType.IMAGE, self.image_request_func(gorsel_prompt, en_boy_orani))
+
+    def image_request_func(self, gorsel_prompt, en_boy_orani):
+        """Sağlayıcıdan bağımsız görsel istek fonksiyonu (client, config) -> PIL Image"""
         
         def gemini_image_request(client, config):
             response = client.models.generate_images(
@@ -106,10 +173,14 @@ class MultiAPIGorselYonetmen:
             else:
                 raise Exception(f"Image generation desteklenmeyen API client: {type(client)}")
         
-        return self.api_manager.make_request(APIType.IMAGE, unified_image_request)
+        return unified_image_request
+
+    def tum_gorselleri_olustur(self, json_dosya_yolu, cikti_klasoru, sadece_hatalilar=False):
+        """JSON dosyasındaki tüm segmentler için Multi-API ile görselleri oluşturur.
 
-    def tum_gorselleri_olustur(self, json_dosya_yolu, cikti_klasoru):
-        """JSON dosyasındaki tüm segmentler için Multi-API ile görselleri oluşturur."""
+        sadece_hatalilar: mevcut ve kontrolden geçen görseller atlanır, yalnızca eksik
+        veya hatalı (boş/siyah/tek renk) görseller yeniden üretilir.
+        """
         
         print("🎬 Multi-API Görsel üretim süreci başlatılıyor...")
         
@@ -126,6 +197,9 @@ class MultiAPIGorselYonetmen:
             
         toplam_segment = 0
         basarili_istek = 0
+        atlanan = 0
+        eszamanli = config.get('failover_ayarlari', 'concurrent_requests', default=True)
+        isler = []
         
         print("\n🎨 Sahneler için Multi-API ile görseller üretilmeye başlanıyor...")
         
@@ -150,15 +224,23 @@ class MultiAPIGorselYonetmen:
                             en_boy_orani = "16:9"
 
                         temel_dosya_adi = f"{bolum_kisaltmasi}-{paragraf_no}-{segment_no}"
+                        image_filename = f"{temel_dosya_adi}.png"
+                        dosya_yolu = os.path.join(cikti_klasoru, image_filename)
+                        
+                        if sadece_hatalilar and not varlik_dogrulayici.sorunlar(dosya_yolu, 'gorsel')[1]:
+                            atlanan += 1
+                            basarili_istek += 1
+                            continue
+                        
+                        if eszamanli:
+                            isler.append((temel_dosya_adi, gorsel_prompt, en_boy_orani, dosya_yolu))
+                            continue
+                        
                         print(f"  🖼️  İşleniyor: {temel_dosya_adi} [{en_boy_orani}] -> \"{gorsel_prompt[:60]}...\"")
 
                         try:
-                            # Multi-API ile görsel üret
-                            generated_image = self.image_request_wrapper(gorsel_prompt, en_boy_orani)
-                            
-                            image_filename = f"{temel_dosya_adi}.png"
-                            dosya_yolu = os.path.join(cikti_klasoru, image_filename)
-                            generated_image.save(dosya_yolu)
+                            # Multi-API ile görsel üret, içerik kontrolünden geçene kadar yeniden dene
+                            self.gorsel_uret_ve_dogrula(gorsel_prompt, en_boy_orani, dosya_yolu)
                             print(f"    ✅ Kaydedildi: {dosya_yolu}")
                             basarili_istek += 1
 
@@ -173,12 +255,20 @@ class MultiAPIGorselYonetmen:
                 print(f"❌ HATA: Bölüm işleme sırasında hata: {e}")
                 sys.exit(1)
 
+        if isler:
+            print(f"\n⚡ {len(isler)} görsel eşzamanlı üretiliyor...")
+            basarili_istek += asyncio.run(self.gorselleri_eszamanli_uret(isler))
+
+        varlik_dogrulayici.kaydet()
+
         # Özet bilgi
         print("\n" + "=" * 50)
         print("🎉 MULTI-API GÖRSEL ÜRETİMİ TAMAMLANDI!")
         print("=" * 50)
         print(f"📊 Toplam segment: {toplam_segment}")
         print(f"✅ Başarılı istek: {basarili_istek}")
+        if sadece_hatalilar:
+            print(f"⏭️ Kontrolden geçtiği için atlanan: {atlanan}")
         print(f"❌ Başarısız istek: {toplam_segment - basarili_istek}")
         print(f"📁 Görsellerin kaydedildiği klasör: {cikti_klasoru}")
         
@@ -195,6 +285,8 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Multi-API Görsel Yönetmen - JSON dosyasındaki görsel prompt'ları kullanarak görseller üretir.")
     parser.add_argument("json_dosyasi", help="Proje JSON dosyasının yolu")
     parser.add_argument("cikti_klasoru", help="Oluşturulan görsellerin kaydedileceği klasör")
+    parser.add_argument("--sadece-hatalilar", action="store_true",
+                        help="Yalnızca eksik veya içerik kontrolünden geçemeyen görselleri yeniden üret")
     args = parser.parse_args()
     
     try:
@@ -202,7 +294,7 @@ if __name__ == "__main__":
         print("=" * 50)
         
         gorsel_yonetmen = MultiAPIGorselYonetmen()
-        gorsel_yonetmen.tum_gorselleri_olustur(args.json_dosyasi, args.cikti_klasoru)
+        gorsel_yonetmen.tum_gorselleri_olustur(args.json_dosyasi, args.cikti_klasoru, args.sadece_hatalilar)
 
         print("\n🎬 Sonraki adım için komut:")
         proje_klasoru = os.path.dirname(args.cikti_klasoru)
@@ -3,15 +3,29 @@
 import os
 import sys
 import json
-import random
-import ffmpeg
+import argparse
 import shutil
-import psutil
 import hashlib
 import time
-from mutagen.wave import WAVE
-from PIL import Image
-import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Path handling for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from config_manager import config
+from resource_manager import get_resource_manager
+from moduller.medya_bilgisi import probe_servisi
+from moduller.ses_zaman_cizelgesi import SesZamanCizelgesi
+from moduller.muzik_kutuphanesi import MuzikKutuphanesi
+from moduller.ffmpeg_ilerleme import ffmpeg_izleyici
+from moduller.varlik_dogrulama import varlik_dogrulayici
+from moduller.gorsel_turevleri import GorselTurevOnbellegi, tuval_boyutu, kaynak_olcegi
+from moduller.numpy_render import ZOOM_IN_HIZLARI, HIZ_ESLEMESI, MAX_ZOOM, PAN_ZOOM
+from moduller.fifo_akisi import FifoAkisi
 
 class KaliteKontrol:
     """Video üretim kalite kontrol sistemi"""
@@ -45,102 +59,35 @@ class KaliteKontrol:
     
     @staticmethod
     def memory_kontrol():
-        """Bellek kullanım kontrolü"""
+        """Bellek kullanım kontrolü - baskı altında iptal yerine bellek boşalana kadar bekler"""
         try:
-            memory = psutil.virtual_memory()
-            if memory.percent > 85:
-                print(f"❌ KRITIK HATA: Bellek kullanımı çok yüksek: %{memory.percent}")
-                sys.exit(1)
-            print(f"✅ Bellek kullanımı normal: %{memory.percent}")
+            kaynaklar = get_resource_manager()
+            if kaynaklar.bellek_bekle():
+                print(f"✅ Bellek kullanımı normal: %{kaynaklar.son_olcum.bellek_yuzdesi}")
+            print(f"📟 Kaynaklar: {kaynaklar.rapor()}")
         except Exception as e:
             print(f"❌ KRITIK HATA: Bellek kontrolü başarısız: {e}")
             sys.exit(1)
     
     @staticmethod
     def ses_dosyasi_kalite_kontrol(dosya_yolu):
-        """Ses dosyası detaylı kalite kontrolü"""
-        if not os.path.exists(dosya_yolu):
-            print(f"❌ KRITIK HATA: Ses dosyası bulunamadı: {dosya_yolu}")
-            sys.exit(1)
-        
-        try:
-            # WAVE dosyası header kontrolü
-            audio = WAVE(dosya_yolu)
-            info = audio.info
-            
-            # Süre kontrolü
-            if info.length < 0.1:
-                print(f"❌ KRITIK HATA: Ses dosyası çok kısa ({info.length}s): {dosya_yolu}")
-                sys.exit(1)
-            
-            if info.length > 300:  # 5 dakikadan uzun
-                print(f"❌ KRITIK HATA: Ses dosyası çok uzun ({info.length}s): {dosya_yolu}")
-                sys.exit(1)
-            
-            # Bit rate kontrolü
-            if info.bitrate < 64000:  # 64kbps minimum
-                print(f"❌ KRITIK HATA: Ses kalitesi çok düşük ({info.bitrate}bps): {dosya_yolu}")
-                sys.exit(1)
-            
-            # Sample rate kontrolü
-            if info.sample_rate < 16000:
-                print(f"❌ KRITIK HATA: Sample rate çok düşük ({info.sample_rate}Hz): {dosya_yolu}")
-                sys.exit(1)
-            
-            # Dosya boyutu kontrolü (çok küçükse bozuk olabilir)
-            dosya_boyutu = os.path.getsize(dosya_yolu)
-            if dosya_boyutu < 1024:  # 1KB'den küçük
-                print(f"❌ KRITIK HATA: Ses dosyası çok küçük ({dosya_boyutu} bytes): {dosya_yolu}")
-                sys.exit(1)
-            
-            print(f"✅ Ses kalite kontrolü başarılı: {os.path.basename(dosya_yolu)} ({info.length:.2f}s, {info.bitrate}bps)")
-            return info.length
-            
-        except Exception as e:
-            print(f"❌ KRITIK HATA: Ses dosyası bozuk veya okunamıyor: {dosya_yolu} - {e}")
+        """Ses dosyası detaylı kalite kontrolü - başlıktan, (boyut, mtime) önbellekli"""
+        bilgi, sorunlar = varlik_dogrulayici.sorunlar(dosya_yolu, 'ses')
+        if sorunlar:
+            print(f"❌ KRITIK HATA: {sorunlar[0]}: {dosya_yolu}")
             sys.exit(1)
+        print(f"✅ Ses kalite kontrolü başarılı: {os.path.basename(dosya_yolu)} ({bilgi['sure']:.2f}s, {bilgi['bitrate']}bps)")
+        return bilgi['sure']
     
     @staticmethod
     def gorsel_dosyasi_kalite_kontrol(dosya_yolu):
-        """Görsel dosyası detaylı kalite kontrolü"""
-        if not os.path.exists(dosya_yolu):
-            print(f"❌ KRITIK HATA: Görsel dosyası bulunamadı: {dosya_yolu}")
-            sys.exit(1)
-        
-        try:
-            # PIL ile görsel kontrolü
-            with Image.open(dosya_yolu) as img:
-                width, height = img.size
-                
-                # Boyut kontrolü
-                if width < 100 or height < 100:
-                    print(f"❌ KRITIK HATA: Görsel çok küçük ({width}x{height}): {dosya_yolu}")
-                    sys.exit(1)
-                
-                if width > 4096 or height > 4096:
-                    print(f"❌ KRITIK HATA: Görsel çok büyük ({width}x{height}): {dosya_yolu}")
-                    sys.exit(1)
-                
-                # Format kontrolü
-                if img.format not in ['PNG', 'JPEG', 'JPG']:
-                    print(f"❌ KRITIK HATA: Desteklenmeyen görsel format ({img.format}): {dosya_yolu}")
-                    sys.exit(1)
-                
-                # Dosya boyutu kontrolü
-                dosya_boyutu = os.path.getsize(dosya_yolu)
-                if dosya_boyutu < 1024:  # 1KB'den küçük
-                    print(f"❌ KRITIK HATA: Görsel dosyası çok küçük ({dosya_boyutu} bytes): {dosya_yolu}")
-                    sys.exit(1)
-                
-                if dosya_boyutu > 50 * 1024 * 1024:  # 50MB'den büyük
-                    print(f"❌ KRITIK HATA: Görsel dosyası çok büyük ({dosya_boyutu / (1024*1024):.1f}MB): {dosya_yolu}")
-                    sys.exit(1)
-                
-                print(f"✅ Görsel kalite kontrolü başarılı: {os.path.basename(dosya_yolu)} ({width}x{height}, {img.format})")
-                
-        except Exception as e:
-            print(f"❌ KRITIK HATA: Görsel dosyası bozuk veya okunamıyor: {dosya_yolu} - {e}")
+        """Görsel dosyası detaylı kalite kontrolü - başlıktan, (boyut, mtime) önbellekli"""
+        bilgi, sorunlar = varlik_dogrulayici.sorunlar(dosya_yolu, 'gorsel')
+        if sorunlar:
+            print(f"❌ KRITIK HATA: {sorunlar[0]}: {dosya_yolu}")
             sys.exit(1)
+        print(f"✅ Görsel kalite kontrolü başarılı: {os.path.basename(dosya_yolu)} ({bilgi['genislik']}x{bilgi['yukseklik']}, {bilgi['format']})")
+        return bilgi
     
     @staticmethod
     def video_kalite_kontrol(video_yolu):
@@ -150,8 +97,8 @@ class KaliteKontrol:
             sys.exit(1)
         
         try:
-            # FFprobe ile video analizi
-            probe = ffmpeg.probe(video_yolu)
+            # Video analizi (önbellekli, başlık okuyucu ile)
+            probe = probe_servisi.probe(video_yolu)
             
             # Stream kontrolü
             video_streams = [stream for stream in probe['streams'] if stream['codec_type'] == 'video']
@@ -195,28 +142,29 @@ class FFmpegGuvenceli:
     """Güvenli FFmpeg işlem yöneticisi"""
     
     @staticmethod
-    def guvenceli_calistir_subprocess(komut_listesi, aciklama, kritik=True):
-        """FFmpeg komutunu subprocess ile güvenli şekilde çalıştırır"""
+    def guvenceli_calistir_subprocess(komut_listesi, aciklama, kritik=True, beklenen_sure=None):
+        """FFmpeg komutunu canlı ilerleme takibiyle güvenli şekilde çalıştırır
+
+        beklenen_sure: çıktının saniye cinsinden süresi - verilirse ETA raporlanır.
+        """
         print(f"🔧 {aciklama}...")
         
         try:
-            # FFmpeg komutunu çalıştır
-            result = subprocess.run(
-                komut_listesi,
-                capture_output=True,
-                text=True,
-                check=False
+            # FFmpeg komutunu -progress çıktısı izlenerek çalıştır
+            returncode, stderr_satirlari, takildi = ffmpeg_izleyici.calistir(
+                komut_listesi, aciklama, beklenen_sure=beklenen_sure
             )
             
             # Return code kontrolü
-            if result.returncode != 0:
+            if returncode != 0 or takildi:
                 print(f"❌ KRITIK HATA: FFmpeg işlemi başarısız ({aciklama})")
                 print(f"   Komut: {' '.join(komut_listesi)}")
-                print(f"   Return code: {result.returncode}")
-                if result.stderr:
-                    print(f"   Stderr: {result.stderr}")
-                if result.stdout:
-                    print(f"   Stdout: {result.stdout}")
+                print(f"   Return code: {returncode}")
+                if takildi:
+                    print("   Süreç ilerleme göstermediği için sonlandırıldı")
+                if stderr_satirlari:
+                    print(f"   Stderr (son {len(stderr_satirlari)} satır):")
+                    print("\n".join(stderr_satirlari))
                 if kritik:
                     sys.exit(1)
                 return False
@@ -230,14 +178,230 @@ class FFmpegGuvenceli:
                 sys.exit(1)
             return False
 
+# Proje geçiş isimlerinin FFmpeg xfade karşılıkları
+GECIS_TIPLERI = {
+    'crossfade': 'fade',
+    'slide_left': 'slideleft',
+    'slide_right': 'slideright',
+    'glitch': 'pixelize',
+    'fade_to_black': 'fadeblack'
+}
+
+# Render profilleri - config'deki kurgu_ayarlari.render_profilleri ile alan bazında ezilebilir
+RENDER_PROFILLERI = {
+    'tam': {
+        'genislik': 1920,
+        'yukseklik': 1080,
+        'fps': 30,
+        'preset': 'medium',
+        'crf': 23,
+        'efektler': True
+    },
+    'onizleme': {
+        'genislik': 640,
+        'yukseklik': 360,
+        'fps': 15,
+        'preset': 'ultrafast',
+        'crf': 30,
+        'efektler': False  # Zoom/pan yerine sabit görsel; geçişler korunur
+    }
+}
+
+# Ek teslim formatları - ana 16:9 videonun tek çözümünden split ile türetilir;
+# config'deki kurgu_ayarlari.ek_formatlar ile alan bazında ezilebilir
+EK_FORMATLAR = {
+    'dikey': {
+        'aktif': False,
+        'genislik': 1080,
+        'yukseklik': 1920,
+        'dolgu': 'otomatik'  # otomatik | bulanik | kirp
+    },
+    '720p': {
+        'aktif': False,
+        'genislik': 1280,
+        'yukseklik': 720
+    }
+}
+
+class ZamanCizelgesi:
+    """Segment sürelerinden tek geçişli xfade zaman çizelgesi derleyicisi
+
+    Tüm süreler kare cinsinden tutulur; böylece offset'ler kare sınırına
+    oturur ve kodlanan kliplerin gerçek süreleriyle birebir örtüşür.
+    """
+
+    def __init__(self, klip_kareleri, gecis_efektleri, fps=30, gecis_suresi=0.5):
+        if len(gecis_efektleri) != max(0, len(klip_kareleri) - 1):
+            raise ValueError("Geçiş efekti sayısı klip sayısının bir eksiği olmalı")
+
+        self.fps = fps
+        self.klip_kareleri = list(klip_kareleri)
+        self.gecis_efektleri = list(gecis_efektleri)
+        self.gecis_karesi = int(round(gecis_suresi * fps))
+
+        # Geçiş, en kısa klipten uzun olamaz
+        if self.klip_kareleri:
+            self.gecis_karesi = min(self.gecis_karesi, min(self.klip_kareleri) - 1)
+
+    @property
+    def gecis_suresi(self):
+        return self.gecis_karesi / self.fps
+
+    def baslangic_kareleri(self):
+        """Her klibin zaman çizelgesindeki başlangıç karesi"""
+        baslangiclar = []
+        konum = 0
+        for kare in self.klip_kareleri:
+            baslangiclar.append(konum)
+            konum += kare - self.gecis_karesi
+        return baslangiclar
+
+    def baslangic_zamanlari(self):
+        """Her klibin zaman çizelgesindeki başlangıç zamanı (saniye)"""
+        return [kare / self.fps for kare in self.baslangic_kareleri()]
+
+    def toplam_kare(self):
+        if not self.klip_kareleri:
+            return 0
+        return sum(self.klip_kareleri) - self.gecis_karesi * (len(self.klip_kareleri) - 1)
+
+    def toplam_sure(self):
+        return self.toplam_kare() / self.fps
+
+    def xfade_tipi(self, gecis_efekti):
+        """Proje geçiş ismini xfade geçiş tipine çevirir"""
+        if gecis_efekti not in GECIS_TIPLERI:
+            print(f"  ⚠️ Bilinmeyen geçiş efekti '{gecis_efekti}', crossfade kullanılıyor")
+        return GECIS_TIPLERI.get(gecis_efekti, 'fade')
+
+    def filtre_grafigi(self):
+        """Tüm geçişleri kümülatif offset'lerle içeren tek filter_complex üretir
+
+        Dönüş: (filtre metni, çıkış etiketi)
+        """
+        if len(self.klip_kareleri) < 2:
+            return "[0:v]null[vout]", "[vout]"
+
+        baslangiclar = self.baslangic_zamanlari()
+        parcalar = []
+        onceki = "[0:v]"
+        for i in range(1, len(self.klip_kareleri)):
+            etiket = "[vout]" if i == len(self.klip_kareleri) - 1 else f"[x{i}]"
+            tip = self.xfade_tipi(self.gecis_efektleri[i - 1])
+            parcalar.append(
+                f"{onceki}[{i}:v]xfade=transition={tip}"
+                f":duration={self.gecis_suresi:.6f}:offset={baslangiclar[i]:.6f}{etiket}"
+            )
+            onceki = etiket
+
+        return ";".join(parcalar), "[vout]"
+
+class KlipOnbellegi:
+    """Segment klipleri için içerik adresli, boyut sınırlı (LRU) render önbelleği
+
+    Proje geçici klasörünün dışında tutulur; montaj öncesi temizlik ve
+    çöken çalıştırmalar önbelleği etkilemez.
+    """
+
+    def __init__(self, klasor, max_mb=5000):
+        self.klasor = klasor
+        self.max_bayt = int(max_mb * 1024 * 1024)
+        self._kilit = threading.Lock()
+        os.makedirs(self.klasor, exist_ok=True)
+
+    @staticmethod
+    def anahtar_olustur(gorsel_yolu, ic_efekt, kare_sayisi, kodlayici_profili):
+        """(görsel baytları, iç efekt, klip süresi, kodlayıcı profili) özetinden anahtar üretir"""
+        ozet = hashlib.sha256()
+        with open(gorsel_yolu, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                ozet.update(chunk)
+        ozet.update(json.dumps({
+            'ic_efekt': ic_efekt,
+            'kare_sayisi': kare_sayisi,
+            'kodlayici_profili': kodlayici_profili
+        }, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+        return ozet.hexdigest()
+
+    def yol(self, anahtar):
+        return os.path.join(self.klasor, f"{anahtar}.mp4")
+
+    def al(self, anahtar, hedef_yol):
+        """Önbellekteki klibi hedef yola bağlar/kopyalar - bulunamazsa False"""
+        kaynak = self.yol(anahtar)
+        if not os.path.exists(kaynak):
+            return False
+        
+        try:
+            # LRU için son kullanım zamanını güncelle
+            os.utime(kaynak, None)
+            if os.path.exists(hedef_yol):
+                os.remove(hedef_yol)
+            try:
+                os.link(kaynak, hedef_yol)
+            except OSError:
+                shutil.copy2(kaynak, hedef_yol)
+            return True
+        except OSError as e:
+            print(f"  ⚠️ Klip önbelleği okunamadı ({anahtar[:12]}): {e}")
+            return False
+
+    def ekle(self, anahtar, kaynak_yol):
+        """Render edilen klibi önbelleğe atomik olarak kopyalar ve boyut sınırını uygular"""
+        hedef = self.yol(anahtar)
+        gecici = f"{hedef}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            shutil.copy2(kaynak_yol, gecici)
+            os.replace(gecici, hedef)
+        except OSError as e:
+            print(f"  ⚠️ Klip önbelleğe yazılamadı ({anahtar[:12]}): {e}")
+            if os.path.exists(gecici):
+                os.remove(gecici)
+            return
+        
+        with self._kilit:
+            self._boyut_sinirla()
+
+    def _boyut_sinirla(self):
+        """Toplam boyut sınırı aşılırsa en eski kullanılan klipleri siler"""
+        kayitlar = []
+        for dosya in os.listdir(self.klasor):
+            if not dosya.endswith('.mp4'):
+                continue
+            yol = os.path.join(self.klasor, dosya)
+            try:
+                stat = os.stat(yol)
+            except OSError:
+                continue
+            kayitlar.append((stat.st_mtime, stat.st_size, yol))
+        
+        toplam = sum(boyut for _, boyut, _ in kayitlar)
+        for _, boyut, yol in sorted(kayitlar):
+            if toplam <= self.max_bayt:
+                break
+            try:
+                os.remove(yol)
+                toplam -= boyut
+            except OSError:
+                pass
+
 class Kurgu:
-    def __init__(self, proje_json_yolu, ses_klasoru, gorsel_klasoru, cikti_yolu):
+    FPS = 30  # Profil seçildiğinde örnek üzerinde ezilir
+    KLIP_EK_SURE = 1.0  # Anlatımdan sonra görselin ekranda kalma süresi
+    GECIS_SURESI = 0.5
+    KLIP_ASAMASI = "Video klip oluşturma"  # FFmpeg ilerleme aşama adları
+    PARCA_ASAMASI = "Parça render"
+
+
+    def __init__(self, proje_json_yolu, ses_klasoru, gorsel_klasoru, cikti_yolu, profil='tam', ek_formatlar=None,
+                 akis=None):
         print("🎞️ Kurgu modülü başlatılıyor...")
         print("🔍 Kapsamlı kalite kontrol sistemi aktif...")
         
         # Sistem kontrolleri
         KaliteKontrol.disk_alan_kontrol(2000)  # 2GB minimum
         KaliteKontrol.memory_kontrol()
+        self.kaynaklar = get_resource_manager()
         
         try:
             self.proje = self.json_oku(proje_json_yolu)
@@ -246,6 +410,52 @@ class Kurgu:
             self.cikti_yolu = cikti_yolu
             self.gecici_klasor = os.path.join(os.path.dirname(cikti_yolu), "gecici_klipler")
             self.temizlik_listesi = []  # Temizlenecek dosyalar
+            self.ayarlar = config.get('kurgu_ayarlari', default={})
+            self.profil_adi = profil
+            self.ek_format_secimi = ek_formatlar
+            self.akis_modu = self.ayarlar.get('akis_modu', False) if akis is None else akis
+            if self.akis_modu and not FifoAkisi.destekleniyor():
+                print("⚠️ Bu platformda adlandırılmış boru (FIFO) yok, akış modu kapatıldı")
+                self.akis_modu = False
+            self.fifo_akisi = None  # Akışlı montaj sürerken tüketicileri başlatan FIFO yöneticisi
+            self.video_borusu = None  # ve sessiz videonun yazıldığı FIFO
+            self.akis_teslim_kalitesinde = False  # Akıtılan video teslim profilinde (H.264) mi - montajda kopyalanır
+            self.profil = self.render_profili_al(profil)
+            self.genislik = self.profil['genislik']
+            self.yukseklik = self.profil['yukseklik']
+            self.FPS = self.profil['fps']
+            print(f"🎚️ Render profili: {profil} ({self.genislik}x{self.yukseklik}, {self.FPS}fps, "
+                  f"{self.profil['preset']}, efektler {'açık' if self.profil['efektler'] else 'sade'})")
+            self.mezzanine = self.ayarlar.get('ara_format', 'h264') == 'mezzanine'
+            ffmpeg_izleyici.ayarla(self.ayarlar.get('ilerleme', {}))
+            self.ara_uzanti = '.mov' if self.mezzanine else '.mp4'
+            self.video_gecis_suresi = self.GECIS_SURESI  # Sessiz videoda gerçekleşen geçiş örtüşmesi
+            self.onbellek_klasoru = self.ayarlar.get('onbellek_klasoru', '.render_cache')
+            self.klip_onbellegi = None
+            if self.ayarlar.get('klip_onbellegi', True):
+                self.klip_onbellegi = KlipOnbellegi(
+                    os.path.join(self.onbellek_klasoru, 'klipler'),
+                    self.ayarlar.get('klip_onbellegi_mb', 5000)
+                )
+            self.parca_onbellegi = None
+            if self.ayarlar.get('artimli_render', True):
+                self.parca_onbellegi = KlipOnbellegi(
+                    os.path.join(self.onbellek_klasoru, 'parcalar'),
+                    self.ayarlar.get('parca_onbellegi_mb', 5000)
+                )
+            self.turev_onbellegi = None
+            if self.ayarlar.get('gorsel_turevleri', True):
+                self.turev_onbellegi = GorselTurevOnbellegi(
+                    os.path.join(self.onbellek_klasoru, 'turevler'),
+                    self.ayarlar.get('turev_onbellegi_mb', 2000)
+                )
+            self.manifest_yolu = os.path.splitext(cikti_yolu)[0] + ".render_manifest.json"
+            self.varlik_tablosu = {}
+            self._klip_planlari = {}
+            varlik_dogrulayici.kalici_onbellek_ac(os.path.join(self.onbellek_klasoru, 'varliklar.json'))
+            gorsel_analizi = self.ayarlar.get('gorsel_analizi', {})
+            if gorsel_analizi.get('aktif', True):
+                varlik_dogrulayici.icerik_analizini_ac(gorsel_analizi)
             
             # Çıktı klasörü oluştur
             os.makedirs(self.gecici_klasor, exist_ok=True)
@@ -265,6 +475,14 @@ class Kurgu:
             print(f"❌ HATA: Kurgu modülü başlatılamadı: {e}")
             sys.exit(1)
     
+    def render_profili_al(self, profil):
+        """Adı verilen render profilini config ezmeleriyle birlikte döndürür"""
+        ezmeler = self.ayarlar.get('render_profilleri', {})
+        if profil not in RENDER_PROFILLERI and profil not in ezmeler:
+            print(f"❌ KRITIK HATA: Bilinmeyen render profili: {profil}")
+            sys.exit(1)
+        return {**RENDER_PROFILLERI.get(profil, RENDER_PROFILLERI['tam']), **ezmeler.get(profil, {})}
+
     def __del__(self):
         """Yıkıcı - temizlik işlemleri"""
         self.temizlik_yap()
@@ -355,87 +573,333 @@ class Kurgu:
         
         print(f"✅ JSON yapısı geçerli: {toplam_segment} segment bulundu")
 
-    def sessiz_klip_olustur(self, segment_bilgisi, ses_suresi):
-        """Her segment için mükemmel kalitede animasyonlu klip oluşturur - TÜM FORMATLAR 16:9'a DÖNÜŞTÜRÜLECEKTİR"""
-        gorsel_yolu = os.path.join(self.gorsel_klasoru, f"{segment_bilgisi['id']}.png")
-        klip_suresi = ses_suresi + 1.0
-        cikti_klip_yolu = os.path.join(self.gecici_klasor, f"{segment_bilgisi['id']}.mp4")
+    def varliklari_dogrula(self, segmentler):
+        """Segment WAV ve PNG'lerini paralel doğrulayıp meta veri tablosunu kurar
+
+        Ses ve görsel başlıkları okunur; görsellerde küçültülmüş kopya üzerinden
+        boş/siyah/tek renk içerik analizi yapılır. Tüm sorunlar birlikte raporlanır;
+        tek bir sorun bile varsa kurgu hiçbir kodlama yapmadan durur.
+        """
+        ses_yollari = [os.path.join(self.ses_klasoru, f"{s['id']}.wav") for s in segmentler]
+        gorsel_yollari = [os.path.join(self.gorsel_klasoru, f"{s['id']}.png") for s in segmentler]
+        tablo, hatalar, sure = varlik_dogrulayici.dogrula(
+            ses_yollari, gorsel_yollari, self.ayarlar.get('dogrulama_isci_sayisi', 16)
+        )
+        
+        if hatalar:
+            for yol, sorun in hatalar:
+                print(f"❌ KRITIK HATA: {sorun}: {yol}")
+            print(f"❌ KRITIK HATA: {len({yol for yol, _ in hatalar})} varlık doğrulamadan geçemedi!")
+            if any(yol in gorsel_yollari for yol, _ in hatalar):
+                print("   💡 Yalnızca hatalı görselleri yeniden üretmek için: "
+                      "python moduller/gorsel_yonetmen_multiapi.py <proje.json> <gorsel_klasoru> --sadece-hatalilar")
+            sys.exit(1)
         
-        # Görsel kalite kontrolü
-        KaliteKontrol.gorsel_dosyasi_kalite_kontrol(gorsel_yolu)
+        self.varlik_tablosu = tablo
+        print(f"✅ {len(ses_yollari)} ses + {len(gorsel_yollari)} görsel doğrulandı "
+              f"({sure * 1000:.0f}ms, {varlik_dogrulayici.rapor()})")
+        return tablo
+
+    def klip_isci_sayisi(self, segment_sayisi):
+        """Klip render havuzunun üst sınırı - 0 veya ayarsız ise kaynak yöneticisinin tavanı
+
+        Havuzdaki işlerin kaçının aynı anda çalışacağını kaynak yöneticisi canlı belirler.
+        """
+        istenen = int(self.ayarlar.get('klip_isci_sayisi', 0) or 0)
+        if istenen <= 0:
+            istenen = self.kaynaklar.maks_render_isci
+        return max(1, min(istenen, segment_sayisi))
+
+    def kaynakli_klip_olustur(self, segment_bilgisi):
+        """Kaynak yöneticisinden render yeri alıp klibi oluşturur"""
+        with self.kaynaklar.slot('render'):
+            # x264 thread'leri o anki işçi limitine göre paylaştırılır, çekirdekler aşırı yüklenmez
+            x264_thread = max(1, int(self.kaynaklar.limitler.cpu_limiti // self.kaynaklar.isci_limiti('render')))
+            return self.sessiz_klip_olustur(segment_bilgisi, segment_bilgisi['sure'], x264_thread, False)
+
+    def klipleri_olustur(self, segmentler):
+        """Segment kliplerini sınırlı bir işçi havuzunda render eder
+
+        Kontroller ve sonuç sırası her zaman segment sırasındadır; paralellik
+        yalnızca FFmpeg kodlamalarını etkiler.
+        """
+        isci_sayisi = self.klip_isci_sayisi(len(segmentler))
+        print(f"  ⚙️ Klip render havuzu: en fazla {isci_sayisi} işçi, "
+              f"şu an {min(isci_sayisi, self.kaynaklar.isci_limiti('render'))} eşzamanlı")
         
-        # Görsel boyutlarını kontrol et
+        klip_bilgileri = []
+        gelecekler = []
+        # Aşama ETA'sı kuyruktaki klipleri de kapsar
+        ffmpeg_izleyici.asama_planla(self.KLIP_ASAMASI,
+                                     sum(self.klip_kare_sayisi(s['sure']) for s in segmentler) / self.FPS)
+        havuz = ThreadPoolExecutor(max_workers=isci_sayisi)
         try:
-            with Image.open(gorsel_yolu) as img:
-                original_width, original_height = img.size
-                original_ratio = original_width / original_height
-                target_ratio = 16 / 9  # 1.777...
-                
-                print(f"  📐 Orijinal boyut: {original_width}x{original_height} (oran: {original_ratio:.3f})")
-                print(f"  🎯 Hedef oran: 16:9 ({target_ratio:.3f})")
+            gelecekler = [
+                havuz.submit(self.kaynakli_klip_olustur, s_bilgi)
+                for s_bilgi in segmentler
+            ]
+            
+            for i, (s_bilgi, gelecek) in enumerate(zip(segmentler, gelecekler)):
+                klip_yolu = gelecek.result()
+                if klip_yolu:
+                    self.klip_kontrol_et(klip_yolu)
+                    self.temizlik_listesi.append(klip_yolu)
+                    klip_bilgileri.append({
+                        'klip_yolu': klip_yolu,
+                        'segment_id': s_bilgi['id'],
+                        'gecis_efekti': s_bilgi['gecis_efekti'],
+                        'kare_sayisi': self.klip_kare_sayisi(s_bilgi['sure'])
+                    })
                 
-        except Exception as e:
-            print(f"❌ KRITIK HATA: Görsel boyut analizi başarısız: {e}")
-            sys.exit(1)
+                # İlerleme gösterimi
+                progress = ((i + 1) / len(segmentler)) * 100
+                print(f"  📈 İlerleme: {progress:.1f}% ({i+1}/{len(segmentler)})")
+        except BaseException:
+            # Bir klip başarısızsa bekleyen render'ları başlatma
+            for gelecek in gelecekler:
+                gelecek.cancel()
+            havuz.shutdown(wait=True)
+            ffmpeg_izleyici.asama_kapat(self.KLIP_ASAMASI)
+            raise
+        havuz.shutdown(wait=True)
+        ffmpeg_izleyici.asama_kapat(self.KLIP_ASAMASI)
+        
+        return klip_bilgileri
+
+    def klip_kontrol_et(self, klip_yolu):
+        """Oluşturulan klibin 16:9 formatını ve genel kalitesini doğrular"""
+        self.validate_video_format(klip_yolu, 16 / 9)
+        KaliteKontrol.video_kalite_kontrol(klip_yolu)
+
+    def klip_plani(self, segment_bilgisi, kare_sayisi):
+        """Klibin render girdileri: görsel, tuval boyutu, filtre ve kodlayıcı
+
+        Klip render'ı ile klip ve parça önbellek anahtarları aynı plandan üretilir;
+        plan segment ve kare sayısı başına bir kez hesaplanır.
+        """
+        plan_anahtari = (segment_bilgisi['id'], kare_sayisi)
+        plan = self._klip_planlari.get(plan_anahtari)
+        if plan:
+            return plan
+        
+        gorsel_yolu = os.path.join(self.gorsel_klasoru, f"{segment_bilgisi['id']}.png")
+        # Görsel boyutları doğrulama tablosundan (yoksa başlıktan) alınır
+        gorsel_bilgisi = self.varlik_tablosu.get(gorsel_yolu) or KaliteKontrol.gorsel_dosyasi_kalite_kontrol(gorsel_yolu)
+        efekt = segment_bilgisi.get('ic_efekt', {})
+        tuval = self.tuval_boyutu_al(gorsel_bilgisi, efekt, kare_sayisi)
+        
+        video_filter = self.build_video_filter(gorsel_bilgisi['genislik'] / gorsel_bilgisi['yukseklik'], 16 / 9,
+                                               efekt, kare_sayisi / self.FPS, hazir_tuval=tuval is not None)
+        statik = self.statik_klip_mi(efekt)
+        if statik:
+            # Hareketsiz klip: görsel bir kez çözülüp ölçeklenir, kalan kareler tpad ile kopyalanır
+            video_filter = f"{video_filter},tpad=stop_mode=clone:stop={kare_sayisi - 1}"
+        
+        plan = {
+            'gorsel_yolu': gorsel_yolu,
+            'gorsel_bilgisi': gorsel_bilgisi,
+            'efekt': efekt,
+            'kare_sayisi': kare_sayisi,
+            'tuval': tuval,
+            'filtre': video_filter,
+            'statik': statik,
+            'kodlayici': self.klip_kodlayici_argumanlari(statik)
+        }
+        self._klip_planlari[plan_anahtari] = plan
+        return plan
+
+    def klip_anahtari(self, plan):
+        """Klibin önbellek anahtarı - görsel baytları, efekt, süre, filtre, tuval, kodlayıcı ve çözünürlük"""
+        if 'anahtar' not in plan:
+            plan['anahtar'] = KlipOnbellegi.anahtar_olustur(
+                plan['gorsel_yolu'], plan['efekt'], plan['kare_sayisi'],
+                {'filtre': plan['filtre'], 'kodlayici': plan['kodlayici'], 'tuval': plan['tuval'],
+                 'boyut': [self.genislik, self.yukseklik]}
+            )
+        return plan['anahtar']
+
+    def sessiz_klip_olustur(self, segment_bilgisi, ses_suresi, x264_thread=None, kontrol=True):
+        """Her segment için mükemmel kalitede animasyonlu klip oluşturur - TÜM FORMATLAR 16:9'a DÖNÜŞTÜRÜLECEKTİR"""
+        kare_sayisi = self.klip_kare_sayisi(ses_suresi)
+        klip_suresi = kare_sayisi / self.FPS
+        cikti_klip_yolu = os.path.join(self.gecici_klasor, f"{segment_bilgisi['id']}{self.ara_uzanti}")
+        
+        plan = self.klip_plani(segment_bilgisi, kare_sayisi)
+        gorsel_yolu = plan['gorsel_yolu']
+        original_width, original_height = plan['gorsel_bilgisi']['genislik'], plan['gorsel_bilgisi']['yukseklik']
+        original_ratio = original_width / original_height
+        target_ratio = 16 / 9  # 1.777...
+        
+        print(f"  📐 Orijinal boyut: {original_width}x{original_height} (oran: {original_ratio:.3f})")
+        print(f"  🎯 Hedef oran: 16:9 ({target_ratio:.3f})")
         
         print(f"  🎬 Klip oluşturuluyor: {os.path.basename(cikti_klip_yolu)} ({klip_suresi:.2f}s)")
         
         try:
             # Efekt kontrolü
-            efekt = segment_bilgisi.get('ic_efekt', {})
+            efekt = plan['efekt']
             print(f"  🎭 Efekt kontrolü: {efekt}")
             
-            # Video filtresi oluştur
-            video_filter = self.build_video_filter(original_ratio, target_ratio, efekt, klip_suresi)
+            # Önbellek kontrolü - aynı girdilerle üretilmiş klip varsa FFmpeg çalıştırılmaz
+            # (anahtar tuval boyutunu içerir; türev yalnızca ıskalamada çözülür)
+            onbellek_anahtari = None
+            if self.klip_onbellegi:
+                onbellek_anahtari = self.klip_anahtari(plan)
+                if self.klip_onbellegi.al(onbellek_anahtari, cikti_klip_yolu):
+                    print(f"  ♻️ Klip önbellekten alındı: {os.path.basename(cikti_klip_yolu)}")
+                    ffmpeg_izleyici.asama_atla(self.KLIP_ASAMASI, klip_suresi)
+                    probe_servisi.sure_kaydet(cikti_klip_yolu, klip_suresi)
+                    if kontrol:
+                        self.klip_kontrol_et(cikti_klip_yolu)
+                        self.temizlik_listesi.append(cikti_klip_yolu)
+                    return cikti_klip_yolu
+            
+            # Önceki çalıştırmadan kalan (önbelleğe bağlı olabilecek) dosyanın üzerine yazılmaz
+            if os.path.exists(cikti_klip_yolu):
+                os.remove(cikti_klip_yolu)
+            
+            # Görsel, efektin ihtiyaç duyduğu çözünürlükte önceden ölçeklenmiş tuval türevinden okunur
+            girdi_gorseli = self.turev_onbellegi.turev(gorsel_yolu, *plan['tuval']) if plan['tuval'] else gorsel_yolu
+            
+            video_filter = plan['filtre']
+            kodlayici = plan['kodlayici']
+            if plan['statik']:
+                girdi = ['-framerate', str(self.FPS), '-i', girdi_gorseli]
+                print("  ⚡ Hareketsiz klip hızlı yolu: tek kare çözümü + kare kopyalama")
+            else:
+                girdi = ['-loop', '1', '-i', girdi_gorseli]
             
             # FFmpeg komutu
-            komut = [
-                'ffmpeg',
-                '-loop', '1',
-                '-i', gorsel_yolu,
-                '-t', str(klip_suresi),
-                '-vf', video_filter,
-                '-c:v', 'libx264',
-                '-preset', 'medium',
-                '-crf', '23',
-                '-pix_fmt', 'yuv420p',
-                '-r', '30',
-                '-y',
-                cikti_klip_yolu
-            ]
+            komut = ['ffmpeg'] + girdi + [
+                '-frames:v', str(kare_sayisi),
+                '-vf', video_filter
+            ] + kodlayici
+            if x264_thread:
+                komut += ['-threads', str(x264_thread)]
+            komut += ['-y', cikti_klip_yolu]
             
             # FFmpeg komutunu çalıştır
             FFmpegGuvenceli.guvenceli_calistir_subprocess(
                 komut, 
-                f"Video klip oluşturma: {os.path.basename(cikti_klip_yolu)}"
+                f"{self.KLIP_ASAMASI}: {os.path.basename(cikti_klip_yolu)}",
+                beklenen_sure=klip_suresi
             )
             
-            # Oluşturulan klibi kontrol et - 16:9 formatını doğrula
-            self.validate_video_format(cikti_klip_yolu, target_ratio)
+            probe_servisi.sure_kaydet(cikti_klip_yolu, klip_suresi)
+            if onbellek_anahtari:
+                self.klip_onbellegi.ekle(onbellek_anahtari, cikti_klip_yolu)
             
-            # Genel kalite kontrolü
-            KaliteKontrol.video_kalite_kontrol(cikti_klip_yolu)
-            
-            self.temizlik_listesi.append(cikti_klip_yolu)
+            if kontrol:
+                # Oluşturulan klibi kontrol et - 16:9 formatı ve genel kalite
+                self.klip_kontrol_et(cikti_klip_yolu)
+                self.temizlik_listesi.append(cikti_klip_yolu)
             return cikti_klip_yolu
             
         except Exception as e:
             print(f"❌ KRITIK HATA: Video klip oluşturulamadı: {e}")
             sys.exit(1)
 
-    def build_video_filter(self, original_ratio, target_ratio, efekt, klip_suresi):
-        """Video filtresi oluşturur"""
+    def efekt_olcegi(self, efekt, kare_sayisi):
+        """Efektin tuvalden okuduğu en küçük pencereye karşılık gelen aşırı örnekleme (zoompan ile aynı)"""
+        tip = (efekt or {}).get('tip')
+        if tip == 'pan':
+            return PAN_ZOOM
+        if tip == 'zoom' and efekt.get('yon', 'in') == 'in':
+            # zoompan zoom'u 1.0'dan başlar; zoom out yolunda 1.0'ın altına inmez
+            hiz = HIZ_ESLEMESI.get(efekt.get('hiz', 'normal'), efekt.get('hiz', 'normal'))
+            adim = ZOOM_IN_HIZLARI.get(hiz, ZOOM_IN_HIZLARI['normal']) * 30 / self.FPS
+            return min(MAX_ZOOM, 1.0 + adim * kare_sayisi)
+        return 1.0
+
+    def tuval_boyutu_al(self, gorsel_bilgisi, efekt, kare_sayisi):
+        """Görselin okunacağı tuval türevinin (genişlik, yükseklik) boyutu - türev önbelleği kapalıysa None
+
+        Tuval efekt aralığı kadar aşırı örneklenir; görselin kendi çözünürlüğünün
+        üzerine çıkılmaz (büyütme detay eklemez, yalnızca maliyeti artırır).
+        """
+        if not self.turev_onbellegi:
+            return None
+        olcek = min(self.efekt_olcegi(efekt, kare_sayisi),
+                    kaynak_olcegi(gorsel_bilgisi['genislik'], gorsel_bilgisi['yukseklik'], self.genislik, self.yukseklik))
+        return tuval_boyutu(self.genislik, self.yukseklik, max(1.0, round(olcek, 2)))
+
+    def statik_klip_mi(self, efekt):
+        """Zoom/pan içermeyen klipler hareketsizdir - hızlı yol açıksa tek kareden üretilir"""
+        return (self.ayarlar.get('statik_hizli_yol', True)
+                and not (efekt and efekt.get('tip') in ('zoom', 'pan')))
+
+    def klip_kodlayici_argumanlari(self, statik=False):
+        """Ara dosyaların (klipler, geçişli sessiz video) kodlayıcı profili - önbellek anahtarının parçasıdır
+
+        Hareketsiz kliplerde x264 durağan görüntü ayarıyla 2 saniyede bir anahtar kare
+        kodlar; tekrar eden kareler B kare, lookahead ve geniş hareket araması olmadan
+        atlama blokları olarak geçer. Klip montajda teslim dosyasına stream copy ile
+        geçebileceğinden anahtar kare aralığı sınırlıdır (dosya aranabilir kalır).
+        """
+        if self.mezzanine:
+            # Yalnızca iç kare (intra) MJPEG: hızlı, neredeyse kayıpsız; H.264 kaybı tek sefer oluşur
+            return [
+                '-c:v', 'mjpeg',
+                '-q:v', str(self.ayarlar.get('ara_kalite', 2)),
+                '-pix_fmt', 'yuvj420p',
+                '-r', str(self.FPS)
+            ]
+        if statik:
+            return self.teslim_kodlayici_argumanlari() + [
+                '-tune', 'stillimage',
+                '-x264-params', f'keyint={2 * self.FPS}:scenecut=0:bframes=0:ref=1:me=dia:rc-lookahead=0:mbtree=0'
+            ]
+        return self.teslim_kodlayici_argumanlari()
+
+    def teslim_kodlayici_argumanlari(self):
+        """Final teslim dosyasının H.264 profili"""
+        return [
+            '-c:v', 'libx264',
+            '-preset', self.profil['preset'],
+            '-crf', str(self.profil['crf']),
+            '-pix_fmt', 'yuv420p',
+            '-r', str(self.FPS)
+        ]
+
+    def parca_kodlayici_argumanlari(self):
+        """Zaman parçalarının profili: teslim H.264 + kapalı GOP
+
+        Her parça kendi IDR karesiyle başlar ve hiçbir kare parça sınırının ötesine
+        referans vermez; parçalar concat + stream copy ile teslim dosyasına eklenir.
+        """
+        return self.teslim_kodlayici_argumanlari() + ['-flags', '+cgop']
+
+    def teslim_kalitesinde_mi(self, video_yolu):
+        """Sessiz video zaten teslim profilinde (H.264, profil çözünürlüğü) ise montajda yeniden kodlanmaz"""
+        try:
+            video_stream = probe_servisi.video_akisi(video_yolu)
+        except Exception:
+            return False
+        return (video_stream is not None
+                and video_stream.get('codec_tag_string') == 'avc1'
+                and int(video_stream.get('width', 0)) == self.genislik
+                and int(video_stream.get('height', 0)) == self.yukseklik)
+
+    def klip_kare_sayisi(self, ses_suresi):
+        """Segment klibinin kare sayısı - zaman çizelgesi bu değerle derlenir"""
+        return int(round((ses_suresi + self.KLIP_EK_SURE) * self.FPS))
+
+    def build_video_filter(self, original_ratio, target_ratio, efekt, klip_suresi, hazir_tuval=False):
+        """Video filtresi oluşturur - hazir_tuval: girdi zaten ölçeklenip doldurulmuş türevdir"""
         
         # Temel 16:9 dönüştürme filtresi
-        if abs(original_ratio - target_ratio) < 0.01:
+        if hazir_tuval:
+            # Türev tuvalin kendisi (gerekirse efekt için aşırı örneklenmiş); ölçekleme yapılmaz
+            base_filter = 'setsar=1'
+        elif abs(original_ratio - target_ratio) < 0.01:
             # Zaten 16:9 oranında
-            base_filter = 'scale=1920:1080:force_original_aspect_ratio=exact'
+            base_filter = f'scale={self.genislik}:{self.yukseklik}'
         elif original_ratio > target_ratio:
             # Yatay görsel (daha geniş) - üst ve alt boşluk
-            base_filter = 'scale=1920:-1:force_original_aspect_ratio=decrease,pad=1920:1080:(ow-iw)/2:(oh-ih)/2:black'
+            base_filter = f'scale={self.genislik}:-1:force_original_aspect_ratio=decrease,pad={self.genislik}:{self.yukseklik}:(ow-iw)/2:(oh-ih)/2:black'
         else:
             # Dikey görsel (portre) - sol ve sağ boşluk  
-            base_filter = 'scale=-1:1080:force_original_aspect_ratio=decrease,pad=1920:1080:(ow-iw)/2:(oh-ih)/2:black'
+            base_filter = f'scale=-1:{self.yukseklik}:force_original_aspect_ratio=decrease,pad={self.genislik}:{self.yukseklik}:(ow-iw)/2:(oh-ih)/2:black'
         
         # Efekt ekleme
         if efekt and efekt.get('tip') == 'zoom':
@@ -461,11 +925,13 @@ class Kurgu:
         
         if yon == 'in':
             zoom_carpan = {'slow': 0.0008, 'normal': 0.0015, 'fast': 0.0025}.get(hiz, 0.0015)
-            zoom_filter = f"zoompan=z='min(zoom+{zoom_carpan},1.5)':d={int(klip_suresi*30)}:s=1920x1080:fps=30"
+            zoom_carpan = round(zoom_carpan * 30 / self.FPS, 6)  # Kare başı artış 30fps'e göre tanımlı
+            zoom_filter = f"zoompan=z='min(zoom+{zoom_carpan},1.5)':d={int(round(klip_suresi*self.FPS))}:s={self.genislik}x{self.yukseklik}:fps={self.FPS}"
             print(f"  🔍 Zoom In efekti uygulanıyor (hız: {hiz})")
         else:  # zoom out
             zoom_carpan = {'slow': 0.0005, 'normal': 0.0010, 'fast': 0.0020}.get(hiz, 0.0010)
-            zoom_filter = f"zoompan=z='max(zoom-{zoom_carpan},1.0)':d={int(klip_suresi*30)}:s=1920x1080:fps=30"
+            zoom_carpan = round(zoom_carpan * 30 / self.FPS, 6)
+            zoom_filter = f"zoompan=z='max(zoom-{zoom_carpan},1.0)':d={int(round(klip_suresi*self.FPS))}:s={self.genislik}x{self.yukseklik}:fps={self.FPS}"
             print(f"  🔍 Zoom Out efekti uygulanıyor (hız: {hiz})")
         
         return f"{base_filter},{zoom_filter}"
@@ -494,15 +960,15 @@ class Kurgu:
         
         # Pan filtreleri
         if yon == 'left':
-            pan_filter = f"zoompan=x='min(max(x,0),iw-iw/zoom)':y='ih/zoom/2':z=1.2:d={int(klip_suresi*30)}:s=1920x1080:fps=30"
+            pan_filter = f"zoompan=x='min(max(x,0),iw-iw/zoom)':y='ih/zoom/2':z=1.2:d={int(round(klip_suresi*self.FPS))}:s={self.genislik}x{self.yukseklik}:fps={self.FPS}"
         elif yon == 'right':
-            pan_filter = f"zoompan=x='max(min(x,iw-iw/zoom),0)':y='ih/zoom/2':z=1.2:d={int(klip_suresi*30)}:s=1920x1080:fps=30"
+            pan_filter = f"zoompan=x='max(min(x,iw-iw/zoom),0)':y='ih/zoom/2':z=1.2:d={int(round(klip_suresi*self.FPS))}:s={self.genislik}x{self.yukseklik}:fps={self.FPS}"
         elif yon == 'up':
-            pan_filter = f"zoompan=x='iw/zoom/2':y='min(max(y,0),ih-ih/zoom)':z=1.2:d={int(klip_suresi*30)}:s=1920x1080:fps=30"
+            pan_filter = f"zoompan=x='iw/zoom/2':y='min(max(y,0),ih-ih/zoom)':z=1.2:d={int(round(klip_suresi*self.FPS))}:s={self.genislik}x{self.yukseklik}:fps={self.FPS}"
         elif yon == 'down':
-            pan_filter = f"zoompan=x='iw/zoom/2':y='max(min(y,ih-ih/zoom),0)':z=1.2:d={int(klip_suresi*30)}:s=1920x1080:fps=30"
+            pan_filter = f"zoompan=x='iw/zoom/2':y='max(min(y,ih-ih/zoom),0)':z=1.2:d={int(round(klip_suresi*self.FPS))}:s={self.genislik}x{self.yukseklik}:fps={self.FPS}"
         else:
-            pan_filter = f"zoompan=z=1.0:d={int(klip_suresi*30)}:s=1920x1080:fps=30"
+            pan_filter = f"zoompan=z=1.0:d={int(round(klip_suresi*self.FPS))}:s={self.genislik}x{self.yukseklik}:fps={self.FPS}"
         
         print(f"  🎬 Pan {yon.upper()} efekti uygulanıyor (hız: {hiz})")
         return f"{base_filter},{pan_filter}"
@@ -510,14 +976,13 @@ class Kurgu:
     def validate_video_format(self, video_yolu, target_ratio):
         """Video formatını doğrular"""
         try:
-            probe = ffmpeg.probe(video_yolu)
-            video_stream = next((stream for stream in probe['streams'] if stream['codec_type'] == 'video'), None)
+            video_stream = probe_servisi.video_akisi(video_yolu)
             
             if video_stream:
                 width = int(video_stream.get('width', 0))
                 height = int(video_stream.get('height', 0))
                 
-                if width != 1920 or height != 1080:
+                if width != self.genislik or height != self.yukseklik:
                     print(f"❌ KRITIK HATA: Video 16:9 formatında değil! Boyut: {width}x{height}")
                     sys.exit(1)
                 
@@ -535,11 +1000,7 @@ class Kurgu:
     def get_video_duration(self, video_yolu):
         """Video süresini alır"""
         try:
-            probe = ffmpeg.probe(video_yolu)
-            video_stream = next((stream for stream in probe['streams'] if stream['codec_type'] == 'video'), None)
-            if video_stream:
-                return float(video_stream.get('duration', 0))
-            return 0.0
+            return probe_servisi.video_suresi(video_yolu)
         except Exception as e:
             print(f"⚠️ Video süre ölçümü başarısız: {e}")
             return 0.0
@@ -558,97 +1019,27 @@ class Kurgu:
             
             print(f"    📊 Klip1 süre: {klip1_sure:.2f}s, Klip2 süre: {klip2_sure:.2f}s, Offset: {offset:.2f}s")
             
-            if gecis_tipi == 'crossfade':
-                # Crossfade geçişi - OFFSET DÜZELTME
-                komut = [
-                    'ffmpeg',
-                    '-i', klip1_yolu,
-                    '-i', klip2_yolu,
-                    '-filter_complex', f'[0][1]xfade=transition=fade:duration={gecis_suresi}:offset={offset}',
-                    '-c:v', 'libx264',
-                    '-preset', 'medium',
-                    '-crf', '23',
-                    '-pix_fmt', 'yuv420p',
-                    '-y',
-                    cikti_yolu
-                ]
-            elif gecis_tipi == 'slide_left':
-                # Sola kaydırma geçişi
-                komut = [
-                    'ffmpeg',
-                    '-i', klip1_yolu,
-                    '-i', klip2_yolu,
-                    '-filter_complex', f'[0][1]xfade=transition=slideleft:duration={gecis_suresi}:offset={offset}',
-                    '-c:v', 'libx264',
-                    '-preset', 'medium',
-                    '-crf', '23',
-                    '-pix_fmt', 'yuv420p',
-                    '-y',
-                    cikti_yolu
-                ]
-            elif gecis_tipi == 'slide_right':
-                # Sağa kaydırma geçişi
-                komut = [
-                    'ffmpeg',
-                    '-i', klip1_yolu,
-                    '-i', klip2_yolu,
-                    '-filter_complex', f'[0][1]xfade=transition=slideright:duration={gecis_suresi}:offset={offset}',
-                    '-c:v', 'libx264',
-                    '-preset', 'medium',
-                    '-crf', '23',
-                    '-pix_fmt', 'yuv420p',
-                    '-y',
-                    cikti_yolu
-                ]
-            elif gecis_tipi == 'glitch':
-                # Glitch efekti
-                komut = [
-                    'ffmpeg',
-                    '-i', klip1_yolu,
-                    '-i', klip2_yolu,
-                    '-filter_complex', f'[0][1]xfade=transition=pixelize:duration={gecis_suresi}:offset={offset}',
-                    '-c:v', 'libx264',
-                    '-preset', 'medium',
-                    '-crf', '23',
-                    '-pix_fmt', 'yuv420p',
-                    '-y',
-                    cikti_yolu
-                ]
-            elif gecis_tipi == 'fade_to_black':
-                # Siyaha solma geçişi
-                komut = [
-                    'ffmpeg',
-                    '-i', klip1_yolu,
-                    '-i', klip2_yolu,
-                    '-filter_complex', f'[0][1]xfade=transition=fadeblack:duration={gecis_suresi}:offset={offset}',
-                    '-c:v', 'libx264',
-                    '-preset', 'medium',
-                    '-crf', '23',
-                    '-pix_fmt', 'yuv420p',
-                    '-y',
-                    cikti_yolu
-                ]
-            else:
-                # Varsayılan: basit crossfade
+            if gecis_tipi not in GECIS_TIPLERI:
                 print(f"  ⚠️ Bilinmeyen geçiş efekti '{gecis_tipi}', crossfade kullanılıyor")
-                komut = [
-                    'ffmpeg',
-                    '-i', klip1_yolu,
-                    '-i', klip2_yolu,
-                    '-filter_complex', f'[0][1]xfade=transition=fade:duration={gecis_suresi}:offset={offset}',
-                    '-c:v', 'libx264',
-                    '-preset', 'medium',
-                    '-crf', '23',
-                    '-pix_fmt', 'yuv420p',
-                    '-y',
-                    cikti_yolu
-                ]
+            xfade_tipi = GECIS_TIPLERI.get(gecis_tipi, 'fade')
+
+            komut = [
+                'ffmpeg',
+                '-i', klip1_yolu,
+                '-i', klip2_yolu,
+                '-filter_complex', f'[0][1]xfade=transition={xfade_tipi}:duration={gecis_suresi}:offset={offset}'
+            ] + self.klip_kodlayici_argumanlari() + [
+                '-y',
+                cikti_yolu
+            ]
             
             # Geçiş efektini uygula
             FFmpegGuvenceli.guvenceli_calistir_subprocess(
                 komut, 
-                f"Geçiş efekti uygulama: {gecis_tipi}"
+                f"Geçiş efekti uygulama: {gecis_tipi}",
+                beklenen_sure=klip1_sure + klip2_sure - gecis_suresi
             )
+            probe_servisi.sure_kaydet(cikti_yolu, klip1_sure + klip2_sure - gecis_suresi)
             
             # Sonucu kontrol et
             KaliteKontrol.video_kalite_kontrol(cikti_yolu)
@@ -658,6 +1049,15 @@ class Kurgu:
             print(f"❌ KRITIK HATA: Geçiş efekti uygulanamadı: {e}")
             return False
 
+    def zaman_cizelgesi_olustur(self, klip_bilgileri):
+        """Klip kare sayıları ve geçiş efektlerinden zaman çizelgesini derler"""
+        return ZamanCizelgesi(
+            [item['kare_sayisi'] for item in klip_bilgileri],
+            [item['gecis_efekti'] for item in klip_bilgileri[:-1]],
+            fps=self.FPS,
+            gecis_suresi=self.GECIS_SURESI
+        )
+
     def klipleri_gercis_efektleri_ile_birlestir(self, klip_bilgileri):
         """Klipleri geçiş efektleri ile birleştirir - DÜZELTİLMİŞ VERSİYON"""
         print("\n🎬 Klipleri geçiş efektleri ile birleştiriliyor...")
@@ -669,11 +1069,56 @@ class Kurgu:
         if len(klip_bilgileri) == 1:
             # Tek klip varsa, direkt kopyala
             print("  ℹ️ Tek klip mevcut, geçiş efekti uygulanmayacak")
-            final_video = os.path.join(self.gecici_klasor, "final_gecisli.mp4")
+            final_video = os.path.join(self.gecici_klasor, f"final_gecisli{self.ara_uzanti}")
             shutil.copy2(klip_bilgileri[0]['klip_yolu'], final_video)
             self.temizlik_listesi.append(final_video)
             return final_video
         
+        final_video = self.klipleri_tek_geciste_birlestir(klip_bilgileri)
+        if final_video:
+            return final_video
+        
+        # Tek geçişli grafik başarısızsa, ikili geçiş zincirine dön
+        print("  ⚠️ Tek geçişli birleştirme başarısız, ikili geçiş zinciri kullanılıyor")
+        return self.klipleri_zincirleme_birlestir(klip_bilgileri)
+
+    def klipleri_tek_geciste_birlestir(self, klip_bilgileri):
+        """Tüm geçişleri tek filter_complex ile uygular - sessiz video tek seferde kodlanır"""
+        zaman_cizelgesi = self.zaman_cizelgesi_olustur(klip_bilgileri)
+        filtre, cikis_etiketi = zaman_cizelgesi.filtre_grafigi()
+        final_video = os.path.join(self.gecici_klasor, f"final_gecisli{self.ara_uzanti}")
+        
+        print(f"  🧮 Zaman çizelgesi: {len(klip_bilgileri)} klip, {len(klip_bilgileri) - 1} geçiş, "
+              f"toplam {zaman_cizelgesi.toplam_sure():.2f}s")
+        
+        komut = ['ffmpeg']
+        for item in klip_bilgileri:
+            komut += ['-i', item['klip_yolu']]
+        komut += [
+            '-filter_complex', filtre,
+            '-map', cikis_etiketi
+        ] + self.klip_kodlayici_argumanlari() + ['-y'] + self.sessiz_video_hedefi(final_video, not self.mezzanine)
+        
+        if not FFmpegGuvenceli.guvenceli_calistir_subprocess(
+            komut,
+            "Tek geçişli geçiş grafiği",
+            kritik=False,
+            beklenen_sure=zaman_cizelgesi.toplam_sure()
+        ):
+            return None
+        if self.fifo_akisi:
+            print("  ✅ Geçiş efektleri ile birleştirme montaja akıtıldı (tek kodlama)")
+            return komut[-1]
+        
+        probe_servisi.sure_kaydet(final_video, zaman_cizelgesi.toplam_sure())
+        KaliteKontrol.video_kalite_kontrol(final_video)
+        self.temizlik_listesi.append(final_video)
+        
+        print("  ✅ Geçiş efektleri ile birleştirme tamamlandı (tek kodlama)")
+        return final_video
+
+    def klipleri_zincirleme_birlestir(self, klip_bilgileri):
+        """Klipleri ikili geçişlerle sırayla birleştirir (fallback)"""
         # İlk klipten başla
         onceki_klip = klip_bilgileri[0]['klip_yolu']
         
@@ -682,7 +1127,7 @@ class Kurgu:
             gecis_efekti = klip_bilgileri[i-1]['gecis_efekti']  # Önceki segmentin geçiş efekti
             
             # Geçici dosya adı
-            gecici_cikti = os.path.join(self.gecici_klasor, f"gecis_{i}.mp4")
+            gecici_cikti = os.path.join(self.gecici_klasor, f"gecis_{i}{self.ara_uzanti}")
             
             print(f"  🔄 Klip {i}/{len(klip_bilgileri)-1}: {gecis_efekti} geçişi uygulanıyor")
             
@@ -703,7 +1148,7 @@ class Kurgu:
                 return self.klipleri_basit_birlestir([item['klip_yolu'] for item in klip_bilgileri])
         
         # Final dosyasını yeniden adlandır
-        final_video = os.path.join(self.gecici_klasor, "final_gecisli.mp4")
+        final_video = os.path.join(self.gecici_klasor, f"final_gecisli{self.ara_uzanti}")
         if os.path.exists(final_video):
             os.remove(final_video)
         shutil.move(onceki_klip, final_video)
@@ -712,11 +1157,431 @@ class Kurgu:
         print(f"  ✅ Geçiş efektleri ile birleştirme tamamlandı")
         return final_video
 
+    def parca_plani_olustur(self, segmentler):
+        """Sessiz videoyu segment başına parçalara böler ve her parçanın girdi imzasını hesaplar
+
+        Parça k = klip k'nın giriş geçişinden sonraki kısmı + (k, k+1) geçiş penceresi.
+        Böylece her parça yalnızca klip k'ya, klip k+1'in ilk geçiş karelerine ve
+        aradaki geçiş tipine bağlıdır; parça sınırları kodlamada anahtar karedir.
+        """
+        parca_kodlayici = self.parca_kodlayici_argumanlari()
+        zaman_cizelgesi = self.zaman_cizelgesi_olustur([
+            {'kare_sayisi': self.klip_kare_sayisi(s['sure']), 'gecis_efekti': s['gecis_efekti']}
+            for s in segmentler
+        ])
+        gecis = zaman_cizelgesi.gecis_karesi
+        baslangiclar = zaman_cizelgesi.baslangic_kareleri()
+        
+        # Klip imzası klip önbelleğinin anahtarıyla aynıdır (filtre, tuval, kodlayıcı, çözünürlük dahil)
+        klip_imzalari = [
+            self.klip_anahtari(self.klip_plani(s, kare))
+            for s, kare in zip(segmentler, zaman_cizelgesi.klip_kareleri)
+        ]
+        
+        parcalar = []
+        for k, s in enumerate(segmentler):
+            son_parca = k == len(segmentler) - 1
+            giris = gecis if k > 0 else 0
+            xfade_tipi = None if son_parca else zaman_cizelgesi.xfade_tipi(s['gecis_efekti'])
+            imza = hashlib.sha256(json.dumps({
+                'klip': klip_imzalari[k],
+                'sonraki_klip': None if son_parca else klip_imzalari[k + 1],
+                'gecis': xfade_tipi,
+                'giris_karesi': giris,
+                'gecis_karesi': gecis,
+                'fps': self.FPS,
+                'kodlayici': parca_kodlayici
+            }, sort_keys=True).encode('utf-8')).hexdigest()
+            parcalar.append({
+                'segment_id': s['id'],
+                'imza': imza,
+                'klip_imzasi': klip_imzalari[k],
+                'gecis_efekti': xfade_tipi,
+                'giris_karesi': giris,
+                'baslangic_kare': baslangiclar[k] + giris,
+                'bitis_kare': baslangiclar[k] + zaman_cizelgesi.klip_kareleri[k]
+            })
+        return zaman_cizelgesi, parcalar
+
+    def manifest_oku(self):
+        try:
+            with open(self.manifest_yolu, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def manifest_yaz(self, zaman_cizelgesi, parcalar):
+        """Hangi girdilerin çıktının hangi kare aralığını ürettiğini kaydeder"""
+        manifest = {
+            'surum': 1,
+            'fps': self.FPS,
+            'gecis_karesi': zaman_cizelgesi.gecis_karesi,
+            'toplam_kare': zaman_cizelgesi.toplam_kare(),
+            'kodlayici': self.parca_kodlayici_argumanlari(),
+            'parcalar': parcalar
+        }
+        gecici = f"{self.manifest_yolu}.tmp"
+        try:
+            with open(gecici, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2, ensure_ascii=False)
+            os.replace(gecici, self.manifest_yolu)
+        except OSError as e:
+            print(f"⚠️ Render manifest yazılamadı: {e}")
+
+    def parca_olustur(self, parca, klip_yolu, sonraki_klip_yolu, kare_sayisi, gecis, cikti_yolu, x264_thread=None):
+        """Tek bir parçayı (klip gövdesi + sonraki geçiş penceresi) teslim kalitesinde kodlar"""
+        giris = parca['giris_karesi']
+        govde = f"[0:v]trim=start_frame={giris},setpts=PTS-STARTPTS,fps={self.FPS}"
+        komut = ['ffmpeg', '-i', klip_yolu]
+        if sonraki_klip_yolu and gecis > 0:
+            offset = (kare_sayisi - giris - gecis) / self.FPS
+            komut += [
+                '-i', sonraki_klip_yolu,
+                '-filter_complex',
+                f"{govde}[a];[1:v]trim=end_frame={gecis},setpts=PTS-STARTPTS,fps={self.FPS}[b];"
+                f"[a][b]xfade=transition={parca['gecis_efekti']}:duration={gecis / self.FPS:.6f}"
+                f":offset={offset:.6f}[vout]"
+            ]
+        else:
+            komut += ['-filter_complex', f"{govde}[vout]"]
+        komut += ['-map', '[vout]'] + self.parca_kodlayici_argumanlari()
+        if x264_thread:
+            komut += ['-threads', str(x264_thread)]
+        komut += ['-y', cikti_yolu]
+        
+        return FFmpegGuvenceli.guvenceli_calistir_subprocess(
+            komut,
+            f"{self.PARCA_ASAMASI}: {parca['segment_id']}",
+            kritik=False,
+            beklenen_sure=(parca['bitis_kare'] - parca['baslangic_kare']) / self.FPS
+        )
+
+    def artimli_render_et(self, segmentler):
+        """Değişmeyen parçaları önbellekten alır, yalnızca değişenleri render edip stream copy ile birleştirir
+
+        Başarısızlıkta None döner; çağıran tam render'a geçer.
+        """
+        zaman_cizelgesi, parcalar = self.parca_plani_olustur(segmentler)
+        onceki = self.manifest_oku()
+        onceki_imzalar = {p['imza'] for p in onceki.get('parcalar', [])} if onceki else set()
+        
+        parca_yollari = []
+        eksikler = []
+        for k, parca in enumerate(parcalar):
+            parca_yolu = os.path.join(self.gecici_klasor, f"parca_{k:04d}.mp4")
+            parca_yollari.append(parca_yolu)
+            self.temizlik_listesi.append(parca_yolu)
+            if self.parca_onbellegi.al(parca['imza'], parca_yolu):
+                probe_servisi.sure_kaydet(parca_yolu, (parca['bitis_kare'] - parca['baslangic_kare']) / self.FPS)
+            else:
+                eksikler.append(k)
+        
+        print(f"  🧩 {len(parcalar)} parça: {len(parcalar) - len(eksikler)} yeniden kullanıldı, "
+              f"{len(eksikler)} render edilecek")
+        if onceki:
+            degisenler = [parcalar[k]['segment_id'] for k in eksikler if parcalar[k]['imza'] not in onceki_imzalar]
+            if degisenler:
+                print(f"  🔄 Önceki manifest'e göre değişen parçalar: {', '.join(degisenler)}")
+        
+        if eksikler:
+            # Eksik parça k, klip k'ya ve (varsa) klip k+1'in başına ihtiyaç duyar
+            gerekli = sorted({j for k in eksikler for j in (k, k + 1) if j < len(segmentler)})
+            print(f"  🎥 {len(gerekli)}/{len(segmentler)} klip render edilecek")
+            klipler = {
+                item['segment_id']: item['klip_yolu']
+                for item in self.klipleri_olustur([segmentler[j] for j in gerekli])
+            }
+            
+            def kodla(k):
+                parca = parcalar[k]
+                sonraki = segmentler[k + 1]['id'] if k + 1 < len(segmentler) else None
+                with self.kaynaklar.slot('render'):
+                    x264_thread = max(1, int(self.kaynaklar.limitler.cpu_limiti // self.kaynaklar.isci_limiti('render')))
+                    if not self.parca_olustur(parca, klipler[parca['segment_id']], klipler.get(sonraki),
+                                              zaman_cizelgesi.klip_kareleri[k], zaman_cizelgesi.gecis_karesi,
+                                              parca_yollari[k], x264_thread):
+                        return False
+                probe_servisi.sure_kaydet(parca_yollari[k], (parca['bitis_kare'] - parca['baslangic_kare']) / self.FPS)
+                self.parca_onbellegi.ekle(parca['imza'], parca_yollari[k])
+                return True
+            
+            # Parçalar birbirinden bağımsız (kapalı GOP) süreçlerde paralel kodlanır
+            isci_sayisi = self.klip_isci_sayisi(len(eksikler))
+            print(f"  ⚙️ Parça kodlama havuzu: en fazla {isci_sayisi} süreç, "
+                  f"şu an {min(isci_sayisi, self.kaynaklar.isci_limiti('render'))} eşzamanlı")
+            ffmpeg_izleyici.asama_planla(self.PARCA_ASAMASI, sum(
+                parcalar[k]['bitis_kare'] - parcalar[k]['baslangic_kare'] for k in eksikler) / self.FPS)
+            try:
+                with ThreadPoolExecutor(max_workers=isci_sayisi) as havuz:
+                    if not all(havuz.map(kodla, eksikler)):
+                        return None
+            finally:
+                ffmpeg_izleyici.asama_kapat(self.PARCA_ASAMASI)
+        
+        # Parçalar anahtar karelerde başladığı için stream copy ile birleştirilir
+        final_video = os.path.join(self.gecici_klasor, "final_gecisli.mp4")
+        parca_listesi = os.path.join(self.gecici_klasor, "parca_listesi.txt")
+        with open(parca_listesi, "w", encoding='utf-8') as f:
+            for parca_yolu in parca_yollari:
+                normalized_path = os.path.abspath(parca_yolu).replace('\\', '/')
+                f.write(f"file '{normalized_path}'\n")
+        self.temizlik_listesi.append(parca_listesi)
+        
+        komut = [
+            'ffmpeg',
+            '-f', 'concat',
+            '-safe', '0',
+            '-i', parca_listesi,
+            '-c', 'copy',
+            '-y'
+        ] + self.sessiz_video_hedefi(final_video, True)
+        if not FFmpegGuvenceli.guvenceli_calistir_subprocess(komut, "Parça birleştirme (stream copy)", kritik=False,
+                                                             beklenen_sure=zaman_cizelgesi.toplam_sure()):
+            return None
+        if self.fifo_akisi:
+            # Süre ve format kontrolü montaj çıktısı üzerinde yapılır
+            self.manifest_yaz(zaman_cizelgesi, parcalar)
+            print(f"  ✅ Artımlı render montaja akıtıldı: {len(eksikler)} parça yeniden kodlandı")
+            return komut[-1]
+        self.temizlik_listesi.append(final_video)
+        
+        # Birleştirilmiş sürenin zaman çizelgesiyle örtüştüğü başlıktan doğrulanır
+        video_stream = probe_servisi.video_akisi(final_video)
+        olculen = float(video_stream.get('duration', 0)) if video_stream else 0.0
+        if abs(olculen - zaman_cizelgesi.toplam_sure()) > 1.5 / self.FPS:
+            print(f"  ⚠️ Parça birleştirme süresi uyuşmuyor ({olculen:.3f}s / {zaman_cizelgesi.toplam_sure():.3f}s)")
+            return None
+        
+        self.validate_video_format(final_video, 16 / 9)
+        KaliteKontrol.video_kalite_kontrol(final_video)
+        self.manifest_yaz(zaman_cizelgesi, parcalar)
+        print(f"  ✅ Artımlı render tamamlandı: {len(eksikler)} parça yeniden kodlandı")
+        return final_video
+
+    def numpy_ile_render_et(self, segmentler):
+        """Sessiz videoyu NumPy Ken Burns motoru ile tek FFmpeg kodlayıcısına render eder"""
+        from moduller.numpy_render import NumpyKenBurnsRender
+        
+        def gorsel_yolu_bul(segment):
+            return os.path.join(self.gorsel_klasoru, f"{segment['id']}.png")
+        
+        for segment in segmentler:
+            if gorsel_yolu_bul(segment) not in self.varlik_tablosu:
+                KaliteKontrol.gorsel_dosyasi_kalite_kontrol(gorsel_yolu_bul(segment))
+        
+        zaman_cizelgesi = self.zaman_cizelgesi_olustur([
+            {'kare_sayisi': self.klip_kare_sayisi(s['sure']), 'gecis_efekti': s['gecis_efekti']}
+            for s in segmentler
+        ])
+        final_video = os.path.join(self.gecici_klasor, f"final_gecisli{self.ara_uzanti}")
+        log_yolu = os.path.join(self.gecici_klasor, "numpy_render_ffmpeg.log")
+        
+        motor = NumpyKenBurnsRender(self.genislik, self.yukseklik, self.FPS,
+                                    **({'tuval_saglayici': self.turev_onbellegi.dizi} if self.turev_onbellegi else {}))
+        hedef = self.sessiz_video_hedefi(final_video, not self.mezzanine)
+        motor.render(segmentler, zaman_cizelgesi, gorsel_yolu_bul,
+                     self.klip_kodlayici_argumanlari() + hedef[:-1], hedef[-1], log_yolu)
+        
+        self.temizlik_listesi.append(log_yolu)
+        if self.fifo_akisi:
+            return hedef[-1]
+        self.temizlik_listesi.append(final_video)
+        probe_servisi.sure_kaydet(final_video, zaman_cizelgesi.toplam_sure())
+        self.validate_video_format(final_video, 16 / 9)
+        KaliteKontrol.video_kalite_kontrol(final_video)
+        return final_video
+
+    def video_zaman_cizelgesi(self, segmentler):
+        """Sessiz videoda gerçekleşen (geçiş örtüşmeli veya örtüşmesiz) zaman çizelgesi"""
+        return ZamanCizelgesi(
+            [self.klip_kare_sayisi(s['sure']) for s in segmentler],
+            [s['gecis_efekti'] for s in segmentler[:-1]],
+            fps=self.FPS,
+            gecis_suresi=self.video_gecis_suresi
+        )
+
+    def ek_formatlari_al(self, secim=None):
+        """Üretilecek ek formatlar [(ad, ayarlar)] - secim verilirse config'deki 'aktif' yerine geçer"""
+        ezmeler = self.ayarlar.get('ek_formatlar', {})
+        if secim is None:
+            adlar = [ad for ad in {**EK_FORMATLAR, **ezmeler}
+                     if {**EK_FORMATLAR.get(ad, {}), **ezmeler.get(ad, {})}.get('aktif')]
+        else:
+            adlar = secim
+
+        formatlar = []
+        for ad in adlar:
+            if ad not in EK_FORMATLAR and ad not in ezmeler:
+                print(f"❌ KRITIK HATA: Bilinmeyen ek format: {ad}")
+                sys.exit(1)
+            ayar = {**EK_FORMATLAR.get(ad, {}), **ezmeler.get(ad, {})}
+            # Ana videodan büyütülerek üretilecek formatlar (ör. önizleme profilinde) atlanır
+            if min(ayar['genislik'], ayar['yukseklik']) > self.yukseklik:
+                print(f"⚠️ Ek format atlandı: {ad} ({ayar['genislik']}x{ayar['yukseklik']}) "
+                      f"ana videodan ({self.genislik}x{self.yukseklik}) büyük")
+                continue
+            formatlar.append((ad, ayar))
+        return formatlar
+
+    def ek_format_yolu(self, ad):
+        kok, uzanti = os.path.splitext(self.cikti_yolu)
+        return f"{kok}_{ad}{uzanti or '.mp4'}"
+
+    def dikey_kirpma_araliklari(self, segmentler, zaman_cizelgesi, hedef_oran):
+        """Görseli hedef orandan dar (portre) olan segmentlerin ana videodaki zaman aralıkları
+
+        Bu segmentler ana videoda iki yanı siyah doldurulmuş olarak durur; dikey formatta
+        merkezden kırpıldıklarında görsel kayıpsız şekilde tüm kareyi kaplar. Geçişler
+        örtüşme süresinin ortasında bölünür.
+        """
+        baslangiclar = zaman_cizelgesi.baslangic_zamanlari()
+        yari_gecis = zaman_cizelgesi.gecis_suresi / 2
+        toplam = zaman_cizelgesi.toplam_sure()
+        araliklar = []
+        for k, s in enumerate(segmentler):
+            gorsel = self.varlik_tablosu.get(os.path.join(self.gorsel_klasoru, f"{s['id']}.png"))
+            if not gorsel or gorsel['genislik'] / gorsel['yukseklik'] > hedef_oran * 1.05:
+                continue
+            bas = baslangiclar[k] + (yari_gecis if k > 0 else 0)
+            bit = baslangiclar[k + 1] + yari_gecis if k + 1 < len(segmentler) else toplam
+            if araliklar and abs(araliklar[-1][1] - bas) < 1e-6:
+                araliklar[-1] = (araliklar[-1][0], bit)
+            else:
+                araliklar.append((bas, bit))
+        return araliklar
+
+    def ek_format_filtresi(self, formatlar, segmentler, zaman_cizelgesi):
+        """Ana video akışını bir kez çözüp split ile tüm ek formatlara dağıtan filtre grafiği
+
+        Dönüş: (filter_complex metni, [(ad, çıkış etiketi)])
+        """
+        girdiler = []
+
+        def girdi():
+            girdiler.append(f"[e{len(girdiler)}]")
+            return girdiler[-1]
+
+        parcalar = []
+        cikislar = []
+        for i, (ad, ayar) in enumerate(formatlar):
+            g, y = ayar['genislik'], ayar['yukseklik']
+            etiket = f"[ek{i}]"
+            cikislar.append((ad, etiket))
+            if g >= y:
+                parcalar.append(f"{girdi()}scale={g}:{y}:force_original_aspect_ratio=decrease,"
+                                f"pad={g}:{y}:(ow-iw)/2:(oh-ih)/2,setsar=1{etiket}")
+                continue
+
+            dolgu = ayar.get('dolgu', 'otomatik')
+            araliklar = []
+            if dolgu == 'otomatik':
+                araliklar = self.dikey_kirpma_araliklari(segmentler, zaman_cizelgesi, g / y)
+                if araliklar == [(0.0, zaman_cizelgesi.toplam_sure())]:
+                    dolgu = 'kirp'
+                elif not araliklar:
+                    dolgu = 'bulanik'
+
+            kirpma_genisligi = int(round(self.yukseklik * g / y / 2)) * 2
+            kirp = f"crop={kirpma_genisligi}:{self.yukseklik},scale={g}:{y},setsar=1"
+            if dolgu == 'kirp':
+                parcalar.append(f"{girdi()}{kirp}{etiket}")
+                continue
+
+            # Bulanık arka plan küçük boyutta üretilip büyütülür - tam çözünürlükte blur pahalıdır
+            kg, ky = (g // 8) * 2, (y // 8) * 2
+            dolgu_etiketi = etiket if dolgu == 'bulanik' else f"[dolgu{i}]"
+            parcalar += [
+                f"{girdi()}scale={kg}:{ky}:force_original_aspect_ratio=increase,crop={kg}:{ky},"
+                f"boxblur=10:1,scale={g}:{y},setsar=1[arka{i}]",
+                f"{girdi()}scale={g}:-2,setsar=1[on{i}]",
+                f"[arka{i}][on{i}]overlay=(W-w)/2:(H-h)/2{dolgu_etiketi}"
+            ]
+            if dolgu == 'otomatik':
+                kosul = '+'.join(f"between(t,{bas:.3f},{bit:.3f})" for bas, bit in araliklar)
+                parcalar += [
+                    f"{girdi()}{kirp}[kirp{i}]",
+                    f"{dolgu_etiketi}[kirp{i}]overlay=enable='{kosul}'{etiket}"
+                ]
+
+        return ";".join([f"[0:v]split={len(girdiler)}{''.join(girdiler)}"] + parcalar), cikislar
+
+    def muzik_sec(self, video_suresi):
+        """Müzik indeksini günceller ve videoyu kaplayan bir parça seçer - yoksa None"""
+        muzik_klasoru = os.path.join(os.path.dirname(os.path.dirname(__file__)), "muzikler")
+        if not os.path.exists(muzik_klasoru):
+            muzik_klasoru = "muzikler"  # Fallback: mevcut klasörde ara
+        if not os.path.exists(muzik_klasoru):
+            print("⚠️ Müzik klasörü bulunamadı")
+            return None
+        
+        try:
+            miks_ayarlari = self.ayarlar.get('ses_miksaj', {})
+            kutuphane = MuzikKutuphanesi(
+                muzik_klasoru,
+                os.path.join(self.onbellek_klasoru, 'muzik'),
+                ornek_hizi=int(miks_ayarlari.get('ornek_hizi', 48000)),
+                hedef_lufs=miks_ayarlari.get('muzik_hedef_lufs', -16.0),
+                tepe_limiti_dbtp=miks_ayarlari.get('muzik_tepe_limiti_dbtp', -1.0)
+            )
+            kutuphane.guncelle()
+            muzik = kutuphane.sec(video_suresi)
+        except Exception as e:
+            print(f"⚠️ Müzik hazırlama hatası: {e}")
+            return None
+        
+        if not muzik:
+            print("⚠️ Kullanılabilir müzik dosyası bulunamadı")
+            return None
+        
+        lufs = f"{muzik['lufs']:.1f} LUFS" if muzik['lufs'] is not None else "loudness ölçülemedi"
+        print(f"🎵 Seçilen müzik: {muzik['dosya']} ({muzik['sure']:.1f}s, {lufs})")
+        if muzik['sure'] < video_suresi:
+            print("  ℹ️ Videodan uzun parça yok, müzik döngüye alınacak")
+        return muzik
+
+    def ses_zaman_cizelgesi_olustur(self, segmentler, zaman_cizelgesi, muzik, cikti_yolu=None):
+        """Anlatımları video zaman çizelgesindeki klip başlangıçlarına yerleştirir ve müzikle karıştırır
+
+        Concat + amix yerine tek bir PCM WAV yazılır; anlatım ile görüntü
+        segment sayısı arttıkça kaymaz. Müzik, kütüphanenin normalize PCM
+        yatağından okunur. cikti_yolu verilmezse geçici klasöre yazılır (akış
+        modunda montajın ses FIFO'su). Dönüş: (WAV yolu, müzik kullanıldı mı)
+        """
+        miks_ayarlari = self.ayarlar.get('ses_miksaj', {})
+        ornek_hizi = int(miks_ayarlari.get('ornek_hizi', 48000))
+        
+        ses = SesZamanCizelgesi(ornek_hizi, 2)
+        for s, baslangic in zip(segmentler, zaman_cizelgesi.baslangic_zamanlari()):
+            ses.anlatim_ekle(os.path.join(self.ses_klasoru, f"{s['id']}.wav"), baslangic)
+        
+        if muzik:
+            ses.muzik_ekle(
+                muzik['yatak_yolu'],
+                seviye=miks_ayarlari.get('muzik_seviyesi', 0.15),
+                bosluk_seviyesi=miks_ayarlari.get('muzik_bosluk_seviyesi', 0.3),
+                giris_sn=miks_ayarlari.get('muzik_giris_sn', 1.0),
+                cikis_sn=miks_ayarlari.get('muzik_cikis_sn', 2.0),
+                ducking_gecis_sn=miks_ayarlari.get('ducking_gecis_sn', 0.25)
+            )
+        
+        ses_miksaji = cikti_yolu or os.path.join(self.gecici_klasor, "ses_miksaj.wav")
+        try:
+            sure = ses.yaz(ses_miksaji, zaman_cizelgesi.toplam_sure())
+        except Exception as e:
+            print(f"❌ KRITIK HATA: Ses zaman çizelgesi yazılamadı: {e}")
+            sys.exit(1)
+        self.temizlik_listesi.append(ses_miksaji)
+        
+        print(f"✅ Ses zaman çizelgesi hazır: {len(segmentler)} anlatım, {sure:.2f}s, {ornek_hizi}Hz "
+              f"({'müzikli' if muzik else 'müziksiz'})")
+        return ses_miksaji, bool(muzik)
+
     def klipleri_basit_birlestir(self, klip_yollari):
         """Klipleri basit concat ile birleştirir (fallback)"""
         print("  🔧 Basit birleştirme (concat) yapılıyor...")
+        self.video_gecis_suresi = 0.0  # Klipler örtüşmeden art arda eklenir
         
-        final_video = os.path.join(self.gecici_klasor, "final_basit.mp4")
+        final_video = os.path.join(self.gecici_klasor, f"final_basit{self.ara_uzanti}")
         gecici_liste = os.path.join(self.gecici_klasor, "basit_liste.txt")
         
         try:
@@ -746,6 +1611,179 @@ class Kurgu:
             print(f"❌ KRITIK HATA: Basit birleştirme başarısız: {e}")
             sys.exit(1)
 
+    def sessiz_video_hedefi(self, dosya_yolu, teslim_kalitesinde):
+        """Sessiz video kodlayıcısının çıkış argümanları: akış modunda montajın FIFO'su, değilse ara dosya
+
+        Akış modunda tüketiciler (ses miksajı, final montaj) üretici FIFO'yu
+        açmadan hemen önce başlatılır; klip/parça render'ı sürerken beklemezler.
+        teslim_kalitesinde: üreticinin yazdığı video teslim profilinde (H.264) mi -
+        montaj video akışını buna göre kopyalar veya yeniden kodlar.
+        """
+        if not self.fifo_akisi:
+            return [dosya_yolu]
+        self.akis_teslim_kalitesinde = teslim_kalitesinde
+        self.fifo_akisi.baslat()
+        return ['-f', 'nut', self.video_borusu]
+
+    def sessiz_video_olustur(self, segmentler, akis=False):
+        """Render motoruna göre geçişli sessiz videoyu üretir
+
+        akis=True iken çıktı montaj FIFO'suna gider; akış yeniden başlatılamadığı
+        için motor içi geri dönüşler (zincirleme/basit birleştirme) yapılmaz,
+        başarısızlıkta None döner.
+        """
+        if self.ayarlar.get('render_motoru', 'ffmpeg') == 'numpy':
+            # 2-3. Tüm zaman çizelgesi NumPy ile tek kodlayıcıya akıtılır
+            print("\n🧮 Sessiz video NumPy render motoru ile oluşturuluyor...")
+            return self.numpy_ile_render_et(segmentler)
+        
+        if self.parca_onbellegi:
+            # 2-3. Yalnızca değişen segment parçaları render edilir, gerisi stream copy ile eklenir
+            print("\n🧩 Sessiz video artımlı render ile oluşturuluyor...")
+            final_sessiz_video = self.artimli_render_et(segmentler)
+            if final_sessiz_video or akis:
+                return final_sessiz_video
+            print("⚠️ Artımlı render başarısız, tam render yapılıyor")
+        
+        # 2. Video klipleri oluştur (iç efektler ile)
+        print("\n🎥 Video klipleri oluşturuluyor (iç efektler ile)...")
+        klip_bilgileri = self.klipleri_olustur(segmentler)
+        
+        if not klip_bilgileri:
+            print("❌ KRITIK HATA: Hiçbir video klip oluşturulamadı!")
+            sys.exit(1)
+        
+        print(f"✅ {len(klip_bilgileri)} video klip başarıyla oluşturuldu")
+        
+        if akis:
+            return self.klipleri_tek_geciste_birlestir(klip_bilgileri) if len(klip_bilgileri) > 1 else None
+        
+        # 3. Klipleri geçiş efektleri ile birleştir - DÜZELTİLMİŞ VERSİYON
+        print("\n🎬 Klipleri geçiş efektleri ile birleştiriliyor (DÜZELTME)...")
+        return self.klipleri_gercis_efektleri_ile_birlestir(klip_bilgileri)
+
+    def final_komutu_olustur(self, video_girdisi, ses_miksaji, video_argumanlari, segmentler, zaman_cizelgesi):
+        """Sessiz video + ses miksajından teslim dosyasını (ve ek formatları) üreten FFmpeg komutu
+
+        video_girdisi: '-i' dahil girdi argümanları. Dönüş: (komut, ek çıktı yolları)
+        """
+        final_komutu = ['ffmpeg'] + video_girdisi + ['-i', ses_miksaji]
+        # Ek formatlar aynı süreçte üretilir: ana video bir kez çözülür, split ile dağıtılır
+        ek_formatlar = self.ek_formatlari_al(self.ek_format_secimi)
+        ek_ciktilar = []
+        if ek_formatlar:
+            adlar = ', '.join(f"{ad} ({a['genislik']}x{a['yukseklik']})" for ad, a in ek_formatlar)
+            print(f"  📐 Ek formatlar tek çözümden üretilecek: {adlar}")
+            filtre, cikislar = self.ek_format_filtresi(ek_formatlar, segmentler, zaman_cizelgesi)
+            final_komutu += ['-filter_complex', filtre]
+        final_komutu += [
+            '-map', '0:v',
+            '-map', '1:a'
+        ] + video_argumanlari + [
+            '-c:a', 'aac',
+            '-movflags', 'faststart',
+            '-y',
+            self.cikti_yolu
+        ]
+        if ek_formatlar:
+            for ad, etiket in cikislar:
+                ek_ciktilar.append(self.ek_format_yolu(ad))
+                final_komutu += ['-map', etiket, '-map', '1:a'] + self.teslim_kodlayici_argumanlari() + [
+                    '-c:a', 'aac',
+                    '-movflags', 'faststart',
+                    '-y',
+                    ek_ciktilar[-1]
+                ]
+        return final_komutu, ek_ciktilar
+
+    def dosyali_montaj(self, segmentler):
+        """Aşamaları sırayla, ara dosyalar (sessiz video, ses WAV) üzerinden çalıştırır
+
+        Dönüş: (ek çıktı yolları, müzik kullanıldı mı)
+        """
+        final_sessiz_video = self.sessiz_video_olustur(segmentler)
+
+        # 4. Müzik seçimi (opsiyonel) - indeksten, videoyu kaplayan parça
+        print("\n🎵 Arka plan müziği kontrol ediliyor...")
+        video_zaman_cizelgesi = self.video_zaman_cizelgesi(segmentler)
+        muzik = self.muzik_sec(video_zaman_cizelgesi.toplam_sure())
+
+        # 5. Anlatım + müzik ses zaman çizelgesi (tek PCM iz)
+        print("\n🎙️ Ses zaman çizelgesi oluşturuluyor...")
+        ses_miksaji, muzik_kullanildi = self.ses_zaman_cizelgesi_olustur(segmentler, video_zaman_cizelgesi, muzik)
+
+        # 6. Final montaj
+        print("\n🎞️ Final video montajı yapılıyor...")
+        
+        if self.teslim_kalitesinde_mi(final_sessiz_video):
+            # Sessiz video zaten teslim profilinde - video akışı olduğu gibi taşınır
+            print("  ⚡ Sessiz video teslim kalitesinde, video yeniden kodlanmayacak (-c:v copy)")
+            video_argumanlari = ['-c:v', 'copy']
+        else:
+            video_argumanlari = self.teslim_kodlayici_argumanlari()
+        
+        final_komutu, ek_ciktilar = self.final_komutu_olustur(['-i', final_sessiz_video], ses_miksaji,
+                                                              video_argumanlari, segmentler, video_zaman_cizelgesi)
+        FFmpegGuvenceli.guvenceli_calistir_subprocess(final_komutu, "Final video montajı",
+                                                      beklenen_sure=video_zaman_cizelgesi.toplam_sure())
+        return ek_ciktilar, muzik_kullanildi
+
+    def akisli_montaj(self, segmentler):
+        """Sessiz video, ses miksajı ve final montajı FIFO'larla eşzamanlı çalıştırır
+
+        Geçişli sessiz video ve ses WAV'ı diske yazılmaz: üretici kodlayıcı NUT
+        akışını, ses zaman çizelgesi PCM'i doğrudan montaj sürecine akıtır.
+        Klipler ve parçalar önbellek için yine dosya olarak üretilir.
+        Dönüş: (ek çıktı yolları, müzik kullanıldı mı) - başarısızlıkta None;
+        çağıran ara dosyalı montaja döner.
+        """
+        print("\n🎵 Arka plan müziği kontrol ediliyor...")
+        video_zaman_cizelgesi = self.video_zaman_cizelgesi(segmentler)
+        muzik = self.muzik_sec(video_zaman_cizelgesi.toplam_sure())
+        
+        akis = FifoAkisi(self.gecici_klasor)
+        try:
+            self.video_borusu = akis.boru("akis_sessiz_video.nut")
+            ses_borusu = akis.boru("akis_ses_miksaj.wav")
+            
+            ek_ciktilar = []
+            
+            def final_montaj():
+                # Komut, üretici akışı başlatırken bildirdiği kodeğe göre kurulur:
+                # teslim profilindeki (H.264) video akışı olduğu gibi taşınır
+                if self.akis_teslim_kalitesinde:
+                    print("  ⚡ Akıtılan video teslim kalitesinde, video yeniden kodlanmayacak (-c:v copy)")
+                    video_argumanlari = ['-c:v', 'copy']
+                else:
+                    video_argumanlari = self.teslim_kodlayici_argumanlari()
+                final_komutu, ciktilar = self.final_komutu_olustur(['-f', 'nut', '-i', self.video_borusu], ses_borusu,
+                                                                   video_argumanlari, segmentler, video_zaman_cizelgesi)
+                ek_ciktilar.extend(ciktilar)
+                return FFmpegGuvenceli.guvenceli_calistir_subprocess(
+                    final_komutu, "Final video montajı (akış)", kritik=False,
+                    beklenen_sure=video_zaman_cizelgesi.toplam_sure())
+            
+            akis.tuketici_ekle("Ses zaman çizelgesi", lambda: self.ses_zaman_cizelgesi_olustur(
+                segmentler, video_zaman_cizelgesi, muzik, cikti_yolu=ses_borusu))
+            akis.tuketici_ekle("Final video montajı", final_montaj)
+            
+            self.fifo_akisi = akis
+            try:
+                uretici_basarili = bool(self.sessiz_video_olustur(segmentler, akis=True))
+            except SystemExit:
+                # Üretici, montajın erken kapanmasıyla (EPIPE) da durmuş olabilir
+                uretici_basarili = False
+            finally:
+                self.fifo_akisi = None
+            
+            if not akis.bekle(uretici_basarili):
+                return None
+        finally:
+            akis.kapat()
+        
+        print("✅ Akışlı montaj tamamlandı (ara sessiz video ve ses dosyası yazılmadı)")
+        return ek_ciktilar, bool(muzik)
+
     def calistir(self):
         print("🎬 Kurgu süreci başlatılıyor...")
         print("🔍 Mükemmel kalite kontrol sistemi çalışıyor...")
@@ -761,15 +1799,9 @@ class Kurgu:
                 for paragraf in bolum['paragraflar']:
                     for s in paragraf['segmentler']:
                         segment_id = f"{bolum['bolum_kisaltmasi']}-{paragraf['paragraf_numarasi']}-{s['segment_numarasi']}"
-                        ses_yolu = os.path.join(self.ses_klasoru, f"{segment_id}.wav")
-                        
-                        # Her ses dosyasını kalite kontrolünden geçir
-                        ses_suresi = KaliteKontrol.ses_dosyasi_kalite_kontrol(ses_yolu)
-                        
                         segmentler.append({
                             "id": segment_id,
-                            "sure": ses_suresi,
-                            "ic_efekt": s.get('ic_efekt', {}),
+                            "ic_efekt": s.get('ic_efekt', {}) if self.profil['efektler'] else {},
                             "gecis_efekti": s.get('gecis_efekti', 'crossfade')
                         })
 
@@ -777,140 +1809,32 @@ class Kurgu:
                 print("❌ KRITIK HATA: Hiçbir segment bulunamadı!")
                 sys.exit(1)
 
+            # Tüm ses ve görseller tek toplu geçişte başlıktan doğrulanır
+            self.varliklari_dogrula(segmentler)
+            for s in segmentler:
+                s['sure'] = self.varlik_tablosu[os.path.join(self.ses_klasoru, f"{s['id']}.wav")]['sure']
+
             print(f"✅ {len(segmentler)} segment başarıyla kontrol edildi")
             toplam_sure = sum(s['sure'] for s in segmentler)
             print(f"📊 Toplam video süresi: {toplam_sure:.2f} saniye")
 
-            # 2. Video klipleri oluştur (iç efektler ile)
-            print("\n🎥 Video klipleri oluşturuluyor (iç efektler ile)...")
-            klip_bilgileri = []
-            
-            for i, s_bilgi in enumerate(segmentler):
-                klip_yolu = self.sessiz_klip_olustur(s_bilgi, s_bilgi['sure'])
-                if klip_yolu:
-                    klip_bilgileri.append({
-                        'klip_yolu': klip_yolu,
-                        'segment_id': s_bilgi['id'],
-                        'gecis_efekti': s_bilgi['gecis_efekti']
-                    })
-                
-                # İlerleme gösterimi
-                progress = ((i + 1) / len(segmentler)) * 100
-                print(f"  📈 İlerleme: {progress:.1f}% ({i+1}/{len(segmentler)})")
-            
-            if not klip_bilgileri:
-                print("❌ KRITIK HATA: Hiçbir video klip oluşturulamadı!")
-                sys.exit(1)
-            
-            print(f"✅ {len(klip_bilgileri)} video klip başarıyla oluşturuldu")
-            
-            # 3. Klipleri geçiş efektleri ile birleştir - DÜZELTİLMİŞ VERSİYON
-            print("\n🎬 Klipleri geçiş efektleri ile birleştiriliyor (DÜZELTME)...")
-            final_sessiz_video = self.klipleri_gercis_efektleri_ile_birlestir(klip_bilgileri)
-
-            # 4. Ses dosyalarını birleştir
-            print("\n🎙️ Anlatım sesleri birleştiriliyor...")
-            ses_liste_dosyasi = os.path.join(self.gecici_klasor, "ses_listesi.txt")
-            
-            try:
-                with open(ses_liste_dosyasi, "w", encoding='utf-8') as f:
-                    for s in segmentler:
-                        ses_yolu = os.path.join(self.ses_klasoru, f"{s['id']}.wav")
-                        normalized_path = os.path.abspath(ses_yolu).replace('\\', '/')
-                        f.write(f"file '{normalized_path}'\n")
-                        
-                self.temizlik_listesi.append(ses_liste_dosyasi)
-            except Exception as e:
-                print(f"❌ KRITIK HATA: Ses listesi oluşturulamadı: {e}")
-                sys.exit(1)
-
-            birlesik_ses = os.path.join(self.gecici_klasor, "birlesik_ses.wav")
-            
-            # Ses birleştirme komutu
-            ses_birlesim_komutu = [
-                'ffmpeg',
-                '-f', 'concat',
-                '-safe', '0',
-                '-i', ses_liste_dosyasi,
-                '-c', 'copy',
-                '-y',
-                birlesik_ses
-            ]
-            
-            FFmpegGuvenceli.guvenceli_calistir_subprocess(ses_birlesim_komutu, "Ses dosyalarını birleştirme")
-            self.temizlik_listesi.append(birlesik_ses)
-
-            # 5. Müzik hazırlama (opsiyonel)
-            print("\n🎵 Arka plan müziği kontrol ediliyor...")
-            muzik_dosyasi = None
-            video_suresi = toplam_sure
-            
-            muzik_klasoru = os.path.join(os.path.dirname(os.path.dirname(__file__)), "muzikler")
-            if not os.path.exists(muzik_klasoru):
-                muzik_klasoru = "muzikler"  # Fallback: mevcut klasörde ara
-            if os.path.exists(muzik_klasoru):
-                try:
-                    muzik_dosyalari = []
-                    for dosya in os.listdir(muzik_klasoru):
-                        if dosya.lower().endswith(('.mp3', '.wav', '.m4a', '.ogg', '.flac', '.aac')):
-                            muzik_yolu = os.path.join(muzik_klasoru, dosya)
-                            muzik_dosyalari.append(muzik_yolu)
-                    
-                    if muzik_dosyalari:
-                        muzik_dosyasi = random.choice(muzik_dosyalari)
-                        print(f"🎵 Seçilen müzik: {os.path.basename(muzik_dosyasi)}")
-                    else:
-                        print("⚠️ Kullanılabilir müzik dosyası bulunamadı")
-                        
-                except Exception as e:
-                    print(f"⚠️ Müzik hazırlama hatası: {e}")
-                    muzik_dosyasi = None
-            else:
-                print("⚠️ Müzik klasörü bulunamadı")
-
-            # 6. Final montaj
-            print("\n🎞️ Final video montajı yapılıyor...")
-            
-            if muzik_dosyasi:
-                # Müzik ile montaj
-                final_komutu = [
-                    'ffmpeg',
-                    '-i', final_sessiz_video,
-                    '-i', birlesik_ses,
-                    '-i', muzik_dosyasi,
-                    '-filter_complex', f'[1]volume=1.0[a1];[2]volume=0.15,atrim=duration={video_suresi}[a2];[a1][a2]amix=inputs=2:duration=first[aout]',
-                    '-map', '0:v',
-                    '-map', '[aout]',
-                    '-c:v', 'libx264',
-                    '-c:a', 'aac',
-                    '-preset', 'medium',
-                    '-crf', '23',
-                    '-movflags', 'faststart',
-                    '-y',
-                    self.cikti_yolu
-                ]
-            else:
-                # Müzik olmadan montaj
-                final_komutu = [
-                    'ffmpeg',
-                    '-i', final_sessiz_video,
-                    '-i', birlesik_ses,
-                    '-map', '0:v',
-                    '-map', '1:a',
-                    '-c:v', 'libx264',
-                    '-c:a', 'aac',
-                    '-preset', 'medium',
-                    '-crf', '23',
-                    '-movflags', 'faststart',
-                    '-y',
-                    self.cikti_yolu
-                ]
-            
-            FFmpegGuvenceli.guvenceli_calistir_subprocess(final_komutu, "Final video montajı")
+            akis_sonucu = None
+            if self.akis_modu:
+                # 2-6. Sessiz video, ses miksajı ve final montaj FIFO'larla eşzamanlı çalışır
+                print("\n🌊 Akış modu: sessiz video, ses ve montaj ara dosya yazılmadan eşzamanlı çalışacak")
+                akis_sonucu = self.akisli_montaj(segmentler)
+                if akis_sonucu is None:
+                    print("⚠️ Akış modu başarısız, ara dosyalı montaja geçiliyor")
+            
+            if akis_sonucu is None:
+                akis_sonucu = self.dosyali_montaj(segmentler)
+            ek_ciktilar, muzik_kullanildi = akis_sonucu
 
             # 7. Final kalite kontrolü
             print("\n🔍 Final video kalite kontrolü...")
             KaliteKontrol.video_kalite_kontrol(self.cikti_yolu)
+            for ek_cikti in ek_ciktilar:
+                KaliteKontrol.video_kalite_kontrol(ek_cikti)
             
             # 8. Final rapor
             end_time = time.time()
@@ -922,10 +1846,18 @@ class Kurgu:
             print("=" * 60)
             print(f"📹 Final video: {os.path.basename(self.cikti_yolu)}")
             print(f"📊 Video boyutu: {final_boyut:.1f}MB")
+            for ek_cikti in ek_ciktilar:
+                print(f"📐 Ek format: {os.path.basename(ek_cikti)} ({os.path.getsize(ek_cikti) / (1024 * 1024):.1f}MB)")
             print(f"⏱️ İşlem süresi: {islem_suresi:.1f} saniye")
             print(f"🎬 Segment sayısı: {len(segmentler)}")
-            print(f"🎵 Müzik: {'Evet' if muzik_dosyasi else 'Hayır'}")
+            print(f"🎵 Müzik: {'Evet' if muzik_kullanildi else 'Hayır'}")
             print(f"✅ Kalite kontrolü: BAŞARILI")
+            print(f"🔎 Medya sorguları: {probe_servisi.rapor()}")
+            if self.turev_onbellegi:
+                print(f"🖼️ Görsel türevleri: {self.turev_onbellegi.rapor()}")
+            print(f"📟 Kaynaklar: {self.kaynaklar.rapor()}")
+            for satir in ffmpeg_izleyici.rapor():
+                print(f"⚙️ {satir}")
             print(f"🎭 Geçiş efektleri: DÜZELTME UYGULANARAK ÇALIŞIYOR")
             print("=" * 60)
 
@@ -935,15 +1867,26 @@ class Kurgu:
             sys.exit(1)
 
 if __name__ == "__main__":
-    if len(sys.argv) != 5:
-        print("Kullanım: python kurgu.py [proje.json] [ses_klasoru] [gorsel_klasoru] [cikti_video.mp4]")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Kurgu - Segment görsellerini ve seslerini efektli 16:9 videoya dönüştürür.")
+    parser.add_argument("proje_json", help="Proje JSON dosyasının yolu")
+    parser.add_argument("ses_klasoru", help="Segment WAV dosyalarının klasörü")
+    parser.add_argument("gorsel_klasoru", help="Segment PNG dosyalarının klasörü")
+    parser.add_argument("cikti_video", help="Oluşturulacak video dosyası")
+    parser.add_argument("--profil", default="tam",
+                        help="Render profili: tam (1920x1080 teslim) veya onizleme (düşük çözünürlüklü hızlı taslak)")
+    parser.add_argument("--formatlar", default=None,
+                        help="Ana videoyla birlikte üretilecek ek formatlar, virgülle: dikey,720p "
+                             "(verilmezse config'deki kurgu_ayarlari.ek_formatlar kullanılır, 'yok' hiçbiri)")
+    parser.add_argument("--akis", action="store_const", const=True, default=None,
+                        help="Sessiz video, ses miksajı ve final montajı ara dosya yazmadan FIFO'larla eşzamanlı çalıştır "
+                             "(verilmezse config'deki kurgu_ayarlari.akis_modu kullanılır)")
+    args = parser.parse_args()
     
     # Argüman kontrolü
-    proje_json = sys.argv[1]
-    ses_klasoru = sys.argv[2]
-    gorsel_klasoru = sys.argv[3]
-    cikti_video = sys.argv[4]
+    proje_json = args.proje_json
+    ses_klasoru = args.ses_klasoru
+    gorsel_klasoru = args.gorsel_klasoru
+    cikti_video = args.cikti_video
     
     # Dosya varlık kontrolleri
     kontrol_dosyalari = [
@@ -976,7 +1919,10 @@ if __name__ == "__main__":
         print("🔧 GEÇİŞ EFEKTLERİ OFFSET DÜZELTME UYGULANMIŞ")
         print("=" * 60)
         
-        kurgu_op = Kurgu(proje_json, ses_klasoru, gorsel_klasoru, cikti_video)
+        ek_formatlar = None
+        if args.formatlar is not None:
+            ek_formatlar = [ad.strip() for ad in args.formatlar.split(',') if ad.strip() and ad.strip() != 'yok']
+        kurgu_op = Kurgu(proje_json, ses_klasoru, gorsel_klasoru, cikti_video, args.profil, ek_formatlar, args.akis)
         kurgu_op.calistir()
         
         print("\n🎬 Sonraki adım için komut:")
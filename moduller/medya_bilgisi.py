@@ -0,0 +1,174 @@
+# medya_bilgisi.py - Önbellekli probe servisi ve süreç içi MP4/MOV başlık okuyucu
+
+import os
+import struct
+import threading
+import ffmpeg
+
+# İçine inilecek kapsayıcı kutular (moov > trak > mdia > minf > stbl)
+KAPSAYICI_KUTULAR = {b'moov', b'trak', b'mdia', b'minf', b'stbl'}
+
+def _kutulari_gez(f, bas, son):
+    """[bas, son) aralığındaki kutuları (tip, veri_baslangici, kutu_sonu) olarak üretir"""
+    konum = bas
+    while konum + 8 <= son:
+        f.seek(konum)
+        baslik = f.read(8)
+        if len(baslik) < 8:
+            return
+        boyut, tip = struct.unpack('>I4s', baslik)
+        veri = konum + 8
+        if boyut == 1:
+            buyuk = f.read(8)
+            if len(buyuk) < 8:
+                return
+            boyut = struct.unpack('>Q', buyuk)[0]
+            veri += 8
+        elif boyut == 0:
+            boyut = son - konum
+        if boyut < 8 or konum + boyut > son:
+            return
+        yield tip, veri, konum + boyut
+        konum += boyut
+
+def _sure_oku(f, veri):
+    """mvhd/mdhd kutusundan (timescale, duration) okur - sürüm 0 ve 1"""
+    f.seek(veri)
+    surum = f.read(4)[0]
+    if surum == 1:
+        timescale, duration = struct.unpack('>16xIQ', f.read(28))
+    else:
+        timescale, duration = struct.unpack('>8xII', f.read(16))
+    return timescale, duration
+
+def mp4_basligi_oku(yol):
+    """MP4/MOV dosyasının moov kutusundan akış bilgilerini okur
+
+    Yalnızca kutu başlıkları okunur; mdat atlanır. ffprobe'a benzer biçimde
+    {'format': {'duration'}, 'streams': [{'codec_type', 'codec_tag_string',
+    'width', 'height', 'duration'}]} döndürür. Dosya okunamazsa None.
+    """
+    try:
+        dosya_boyutu = os.path.getsize(yol)
+        with open(yol, 'rb') as f:
+            moov = next(((v, s) for t, v, s in _kutulari_gez(f, 0, dosya_boyutu) if t == b'moov'), None)
+            if moov is None:
+                return None
+
+            bilgi = {'format': {}, 'streams': []}
+            for tip, veri, son in _kutulari_gez(f, *moov):
+                if tip == b'mvhd':
+                    timescale, duration = _sure_oku(f, veri)
+                    if timescale:
+                        bilgi['format']['duration'] = duration / timescale
+                elif tip == b'trak':
+                    akis = _iz_oku(f, veri, son)
+                    if akis:
+                        bilgi['streams'].append(akis)
+
+            if 'duration' not in bilgi['format'] or not bilgi['streams']:
+                return None
+            return bilgi
+    except (OSError, struct.error, IndexError):
+        return None
+
+def _iz_oku(f, bas, son):
+    """Bir trak kutusundan akış tipini, boyutları, süreyi ve codec etiketini okur"""
+    akis = {}
+    yigin = [(bas, son)]
+    while yigin:
+        for tip, veri, kutu_sonu in _kutulari_gez(f, *yigin.pop()):
+            if tip in KAPSAYICI_KUTULAR:
+                yigin.append((veri, kutu_sonu))
+            elif tip == b'tkhd':
+                # Genişlik/yükseklik kutunun son 8 baytında 16.16 sabit noktalı
+                f.seek(kutu_sonu - 8)
+                genislik, yukseklik = struct.unpack('>II', f.read(8))
+                akis['width'] = genislik >> 16
+                akis['height'] = yukseklik >> 16
+            elif tip == b'mdhd':
+                timescale, duration = _sure_oku(f, veri)
+                if timescale:
+                    akis['duration'] = duration / timescale
+            elif tip == b'hdlr' and akis.get('codec_type', 'data') == 'data':
+                # MOV'da minf içindeki veri işleyicisi (dhlr) medya tipini ezmemeli
+                f.seek(veri + 8)
+                akis['codec_type'] = {b'vide': 'video', b'soun': 'audio'}.get(f.read(4), 'data')
+            elif tip == b'stsd':
+                f.seek(veri + 12)
+                akis['codec_tag_string'] = f.read(4).decode('latin-1')
+
+    if 'codec_type' not in akis or 'duration' not in akis:
+        return None
+    return akis
+
+class ProbeServisi:
+    """Medya bilgisi sorgularını (yol, boyut, mtime) imzasıyla önbelleğe alır
+
+    Önce render parametrelerinden kaydedilen analitik süreler, sonra süreç içi
+    MP4 başlık okuyucu kullanılır; ffprobe yalnızca başlık okunamazsa çalışır.
+    """
+
+    def __init__(self):
+        self._bilgiler = {}
+        self._analitik_sureler = {}
+        self._kilit = threading.Lock()
+        self.istatistik = {'onbellek': 0, 'analitik': 0, 'baslik': 0, 'ffprobe': 0}
+
+    @staticmethod
+    def _imza(yol):
+        durum = os.stat(yol)
+        return os.path.abspath(yol), durum.st_size, durum.st_mtime_ns
+
+    def _say(self, anahtar):
+        with self._kilit:
+            self.istatistik[anahtar] += 1
+
+    def probe(self, yol):
+        """ffmpeg.probe ile aynı biçimde (format/streams) medya bilgisi döndürür"""
+        imza = self._imza(yol)
+        with self._kilit:
+            bilgi = self._bilgiler.get(imza)
+        if bilgi is not None:
+            self._say('onbellek')
+            return bilgi
+
+        bilgi = mp4_basligi_oku(yol)
+        if bilgi is not None:
+            self._say('baslik')
+        else:
+            bilgi = ffmpeg.probe(yol)
+            self._say('ffprobe')
+
+        with self._kilit:
+            self._bilgiler[imza] = bilgi
+        return bilgi
+
+    def video_akisi(self, yol):
+        """İlk video akışını döndürür - yoksa None"""
+        return next((s for s in self.probe(yol)['streams'] if s.get('codec_type') == 'video'), None)
+
+    def sure_kaydet(self, yol, sure):
+        """Render parametrelerinden bilinen süreyi dosyanın mevcut imzasıyla kaydeder"""
+        imza = self._imza(yol)
+        with self._kilit:
+            self._analitik_sureler[imza] = sure
+
+    def video_suresi(self, yol):
+        """Video süresi - analitik kayıt varsa dosya açılmadan döner"""
+        imza = self._imza(yol)
+        with self._kilit:
+            sure = self._analitik_sureler.get(imza)
+        if sure is not None:
+            self._say('analitik')
+            return sure
+        video_stream = self.video_akisi(yol)
+        return float(video_stream.get('duration', 0)) if video_stream else 0.0
+
+    def rapor(self):
+        i = self.istatistik
+        return (f"{i['onbellek']} önbellek, {i['analitik']} analitik süre, "
+                f"{i['baslik']} başlık okuma, {i['ffprobe']} ffprobe")
+
+# Global instance
+probe_servisi = ProbeServisi()
@@ -0,0 +1,177 @@
+# muzik_kutuphanesi.py - Süre/loudness indeksli, önceden normalize edilmiş müzik yatakları
+
+import os
+import re
+import json
+import random
+import hashlib
+import threading
+import subprocess
+import numpy as np
+
+MUZIK_UZANTILARI = ('.mp3', '.wav', '.m4a', '.ogg', '.flac', '.aac')
+
+class MuzikKutuphanesi:
+    """Müzik klasörünün kalıcı indeksi
+
+    Her parça için süre, entegre loudness (LUFS), gerçek tepe (dBTP) ve örnek hızı saklanır; kayıt
+    dosyanın boyutu veya mtime'ı değişince geçersiz olur. Parçalar bir kez
+    hedef loudness'a normalize edilmiş ham float32 PCM yataklara çözülür; kazanç
+    gerçek tepe sınırını aşmayacak şekilde kısılır. Böylece
+    seçim indeks aramasıdır ve miksaj sıkıştırılmış dosyayı yeniden çözmez.
+    """
+
+    INDEKS_SURUMU = 2
+
+    def __init__(self, muzik_klasoru, onbellek_klasoru, ornek_hizi=48000, kanal=2, hedef_lufs=-16.0,
+                 tepe_limiti_dbtp=-1.0):
+        self.muzik_klasoru = muzik_klasoru
+        self.klasor = onbellek_klasoru
+        self.ornek_hizi = ornek_hizi
+        self.kanal = kanal
+        self.hedef_lufs = hedef_lufs
+        self.tepe_limiti_dbtp = tepe_limiti_dbtp
+        self.indeks_yolu = os.path.join(self.klasor, 'indeks.json')
+        self._kilit = threading.Lock()
+        os.makedirs(self.klasor, exist_ok=True)
+        self.indeks = self._indeks_oku()
+
+    def _indeks_oku(self):
+        try:
+            with open(self.indeks_yolu, 'r', encoding='utf-8') as f:
+                veri = json.load(f)
+            if veri.get('surum') == self.INDEKS_SURUMU:
+                return veri.get('parcalar', {})
+        except (OSError, json.JSONDecodeError):
+            pass
+        return {}
+
+    def _indeks_yaz(self):
+        gecici = f"{self.indeks_yolu}.{os.getpid()}.tmp"
+        with open(gecici, 'w', encoding='utf-8') as f:
+            json.dump({'surum': self.INDEKS_SURUMU, 'parcalar': self.indeks}, f, indent=2, ensure_ascii=False)
+        os.replace(gecici, self.indeks_yolu)
+
+    def _kayit_gecerli_mi(self, kayit, durum):
+        return (kayit.get('boyut') == durum.st_size
+                and kayit.get('mtime_ns') == durum.st_mtime_ns
+                and kayit.get('yatak_ornek_hizi') == self.ornek_hizi
+                and kayit.get('hedef_lufs') == self.hedef_lufs
+                and kayit.get('tepe_limiti_dbtp') == self.tepe_limiti_dbtp
+                and os.path.exists(os.path.join(self.klasor, kayit.get('yatak', ''))))
+
+    def guncelle(self):
+        """Klasörü tarar; yeni veya değişmiş parçaları analiz eder, silinenleri indeksten çıkarır"""
+        if not os.path.isdir(self.muzik_klasoru):
+            return self.indeks
+
+        mevcut = {}
+        for dosya in sorted(os.listdir(self.muzik_klasoru)):
+            if dosya.lower().endswith(MUZIK_UZANTILARI):
+                mevcut[os.path.abspath(os.path.join(self.muzik_klasoru, dosya))] = dosya
+
+        degisti = False
+        with self._kilit:
+            for yol in list(self.indeks):
+                if yol not in mevcut:
+                    self._yatak_sil(self.indeks.pop(yol))
+                    degisti = True
+
+            for yol, dosya in mevcut.items():
+                durum = os.stat(yol)
+                kayit = self.indeks.get(yol)
+                if kayit and self._kayit_gecerli_mi(kayit, durum):
+                    continue
+                if kayit:
+                    self._yatak_sil(kayit)
+                print(f"  🎼 Müzik analiz ediliyor: {dosya}")
+                yeni = self._analiz_et(yol, durum)
+                if yeni:
+                    self.indeks[yol] = yeni
+                else:
+                    self.indeks.pop(yol, None)
+                degisti = True
+
+            if degisti:
+                try:
+                    self._indeks_yaz()
+                except OSError as e:
+                    print(f"⚠️ Müzik indeksi yazılamadı: {e}")
+        return self.indeks
+
+    def _yatak_sil(self, kayit):
+        try:
+            os.remove(os.path.join(self.klasor, kayit.get('yatak', '')))
+        except OSError:
+            pass
+
+    def _analiz_et(self, yol, durum):
+        """Tek çözme geçişinde PCM yatak, entegre loudness, gerçek tepe ve kaynak örnek hızı çıkarır"""
+        anahtar = hashlib.sha1(f"{yol}|{durum.st_size}|{durum.st_mtime_ns}|{self.ornek_hizi}".encode('utf-8')).hexdigest()
+        yatak = f"{anahtar}.f32"
+        yatak_yolu = os.path.join(self.klasor, yatak)
+        komut = [
+            'ffmpeg', '-hide_banner', '-nostats',
+            '-i', yol,
+            '-vn',
+            '-af', 'ebur128=peak=true:framelog=quiet',
+            '-ac', str(self.kanal),
+            '-ar', str(self.ornek_hizi),
+            '-f', 'f32le',
+            '-y', yatak_yolu
+        ]
+        sonuc = subprocess.run(komut, capture_output=True, text=True, check=False)
+        if sonuc.returncode != 0:
+            print(f"⚠️ Müzik çözülemedi, atlanıyor: {os.path.basename(yol)}")
+            self._yatak_sil({'yatak': yatak})
+            return None
+
+        lufs_eslesme = re.findall(r"I:\s+(-?[\d.]+|-inf) LUFS", sonuc.stderr)
+        hiz_eslesme = re.search(r"Audio: .*?(\d+) Hz", sonuc.stderr)
+        tepe_eslesme = re.findall(r"Peak:\s+(-?[\d.]+|-inf) dBFS", sonuc.stderr)
+        lufs = float(lufs_eslesme[-1]) if lufs_eslesme and lufs_eslesme[-1] != '-inf' else None
+        tepe = float(tepe_eslesme[-1]) if tepe_eslesme and tepe_eslesme[-1] != '-inf' else None
+        ornek_sayisi = os.path.getsize(yatak_yolu) // (4 * self.kanal)
+        if ornek_sayisi == 0:
+            self._yatak_sil({'yatak': yatak})
+            return None
+
+        # Yatak yerinde, bloklar halinde hedef loudness'a çekilir; kırpma yerine
+        # kazanç, ölçülen gerçek tepe sınırı aşmayacak kadar kısılır
+        kazanc = 10 ** ((self.hedef_lufs - lufs) / 20) if lufs is not None else 1.0
+        if tepe is not None:
+            tepe_kazanci = 10 ** ((self.tepe_limiti_dbtp - tepe) / 20)
+            if tepe_kazanci < kazanc:
+                print(f"  🎚️ Tepe sınırı: {os.path.basename(yol)} kazancı "
+                      f"{20 * np.log10(kazanc):+.1f} dB yerine {20 * np.log10(tepe_kazanci):+.1f} dB")
+                kazanc = tepe_kazanci
+        if kazanc != 1.0:
+            pcm = np.memmap(yatak_yolu, dtype='<f4', mode='r+')
+            blok = self.ornek_hizi * self.kanal * 30
+            for i in range(0, len(pcm), blok):
+                pcm[i:i + blok] *= kazanc
+            pcm.flush()
+            del pcm
+
+        return {
+            'dosya': os.path.basename(yol),
+            'boyut': durum.st_size,
+            'mtime_ns': durum.st_mtime_ns,
+            'sure': ornek_sayisi / self.ornek_hizi,
+            'lufs': lufs,
+            'tepe_dbtp': tepe,
+            'ornek_hizi': int(hiz_eslesme.group(1)) if hiz_eslesme else None,
+            'kazanc': kazanc,
+            'hedef_lufs': self.hedef_lufs,
+            'tepe_limiti_dbtp': self.tepe_limiti_dbtp,
+            'yatak': yatak,
+            'yatak_ornek_hizi': self.ornek_hizi
+        }
+
+    def sec(self, min_sure):
+        """Videonun tamamını kaplayan parçalardan rastgele seçer; yoksa en uzun parçayı döndürür"""
+        if not self.indeks:
+            return None
+        uygunlar = [k for k in self.indeks.values() if k['sure'] >= min_sure]
+        kayit = random.choice(uygunlar) if uygunlar else max(self.indeks.values(), key=lambda k: k['sure'])
+        return {**kayit, 'yatak_yolu': os.path.join(self.klasor, kayit['yatak'])}
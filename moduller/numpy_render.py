@@ -0,0 +1,241 @@
+# numpy_render.py - NumPy Ken Burns render motoru (tek uzun ömürlü kodlayıcı)
+
+import sys
+import time
+import subprocess
+import numpy as np
+
+from moduller.gorsel_turevleri import tuval_olustur as turev_tuvali
+
+# Proje hız isimlerinin kare başına zoom artışları (FFmpeg zoompan yolu ile aynı)
+ZOOM_IN_HIZLARI = {'slow': 0.0008, 'normal': 0.0015, 'fast': 0.0025}
+ZOOM_OUT_HIZLARI = {'slow': 0.0005, 'normal': 0.0010, 'fast': 0.0020}
+MAX_ZOOM = 1.5
+PAN_ZOOM = 1.2
+
+HIZ_ESLEMESI = {'yavas': 'slow', 'cok_yavas': 'slow', 'hizli': 'fast'}
+YON_ESLEMESI = {'sag': 'right', 'sol': 'left', 'yukari': 'up', 'asagi': 'down'}
+
+def _pencere_konumu(deger, zoom):
+    """zoompan gibi pencere ofsetini tuvalin içine kırpar (0 ile 1 - 1/zoom arası)"""
+    return np.clip(deger, 0.0, 1.0 - 1.0 / zoom)
+
+def hareket_plani(efekt, kare_sayisi, fps=30):
+    """İç efekti kare başına (zoom, sol, ust) dizilerine çevirir - FFmpeg zoompan ifadeleriyle aynı hareket
+
+    sol/ust, kırpma penceresinin sol üst köşesinin tuval boyutuna oranıdır
+    (zoompan'ın x/y değerleri). zoompan'da zoom ilk karede bir adım artmış
+    olarak başlar, x/y verilmediğinde pencere sol üst köşeye yaslanır ve
+    'max(zoom-c,1.0)' 1.0'da kalır; pan ifadeleri önceki x/y'yi (başta 0)
+    kırptığından pencere kaymaz. Zoom hızları 30fps kare başı artış olarak
+    tanımlıdır ve fps'e göre ölçeklenir.
+    """
+    efekt = efekt or {}
+    tip = efekt.get('tip')
+    yon = YON_ESLEMESI.get(efekt.get('yon'), efekt.get('yon'))
+    hiz = HIZ_ESLEMESI.get(efekt.get('hiz', 'normal'), efekt.get('hiz', 'normal'))
+    kareler = np.arange(kare_sayisi, dtype=np.float64)
+    sifir = np.zeros(kare_sayisi)
+
+    if tip == 'zoom':
+        if yon == 'out':
+            return np.ones(kare_sayisi), sifir, sifir.copy()
+        adim = round(ZOOM_IN_HIZLARI.get(hiz, ZOOM_IN_HIZLARI['normal']) * 30 / fps, 6)
+        zoom = np.minimum(1.0 + adim * (kareler + 1), MAX_ZOOM)
+        return zoom, sifir, sifir.copy()
+
+    if tip == 'pan':
+        zoom = np.full(kare_sayisi, PAN_ZOOM)
+        if yon in ('left', 'right'):
+            # x='min(max(x,0),iw-iw/zoom)' 0'da kalır, y='ih/zoom/2'
+            return zoom, sifir, _pencere_konumu(0.5 / zoom, zoom)
+        if yon in ('up', 'down'):
+            # x='iw/zoom/2', y='min(max(y,0),ih-ih/zoom)' 0'da kalır
+            return zoom, _pencere_konumu(0.5 / zoom, zoom), sifir
+        return np.ones(kare_sayisi), sifir, sifir.copy()
+
+    return np.ones(kare_sayisi), sifir, sifir.copy()
+
+def tuval_olustur(gorsel_yolu, genislik, yukseklik):
+    """Görseli tuvale yerleştirip dizi olarak döndürür (build_video_filter ile aynı sığdırma)"""
+    return np.asarray(turev_tuvali(gorsel_yolu, genislik, yukseklik), dtype=np.uint8)
+
+class KlipKareUretici:
+    """Tek bir segmentin karelerini, bir kez çözülen tuvalden üretir"""
+
+    def __init__(self, gorsel_yolu, efekt, kare_sayisi, genislik, yukseklik, fps=30, tuval_saglayici=tuval_olustur):
+        self.genislik = genislik
+        self.yukseklik = yukseklik
+        self.zoom, self.sol, self.ust = hareket_plani(efekt, kare_sayisi, fps)
+
+        # Zoom'lu kareler büyütülmüş tuvalden örneklenir, böylece yumuşaklık korunur
+        self.olcek = float(np.clip(self.zoom.max(), 1.0, MAX_ZOOM))
+        tuval_w = int(round(genislik * self.olcek))
+        tuval_h = int(round(yukseklik * self.olcek))
+        self.tuval = tuval_saglayici(gorsel_yolu, tuval_w, tuval_h)
+        self._statik = None
+        if all(np.ptp(dizi) == 0 for dizi in (self.zoom, self.sol, self.ust)):
+            # Pencere hiç hareket etmiyor: tüm kareler aynıdır
+            self._statik = self._ornekle(self.zoom[0], self.sol[0], self.ust[0])
+
+    def kare(self, indeks):
+        if self._statik is not None:
+            return self._statik
+        return self._ornekle(self.zoom[indeks], self.sol[indeks], self.ust[indeks])
+
+    def _ornekle(self, zoom, sol, ust):
+        """Kırpma penceresini çift doğrusal (bilinear) örnekleme ile çıktı boyutuna getirir"""
+        tuval_h, tuval_w = self.tuval.shape[:2]
+        pencere_w = tuval_w / zoom
+        pencere_h = tuval_h / zoom
+        x0 = np.clip(sol * tuval_w, 0, tuval_w - pencere_w)
+        y0 = np.clip(ust * tuval_h, 0, tuval_h - pencere_h)
+
+        # Piksel merkezlerinin tuval koordinatları
+        xs = x0 + (np.arange(self.genislik, dtype=np.float32) + 0.5) * (pencere_w / self.genislik) - 0.5
+        ys = y0 + (np.arange(self.yukseklik, dtype=np.float32) + 0.5) * (pencere_h / self.yukseklik) - 0.5
+        xs = np.clip(xs, 0, tuval_w - 1)
+        ys = np.clip(ys, 0, tuval_h - 1)
+
+        x_alt = np.floor(xs).astype(np.intp)
+        y_alt = np.floor(ys).astype(np.intp)
+        x_ust = np.minimum(x_alt + 1, tuval_w - 1)
+        y_ust = np.minimum(y_alt + 1, tuval_h - 1)
+        # 8 bit sabit noktalı ağırlıklar: tüm ara değerler uint16'ya sığar
+        fx = np.round((xs - x_alt) * 256).astype(np.uint16)[None, :, None]
+        fy = np.round((ys - y_alt) * 256).astype(np.uint16)[:, None, None]
+
+        # Önce satırlar, sonra sütunlar (ayrılabilir bilinear)
+        satirlar = self.tuval[y_alt].astype(np.uint16)
+        satirlar *= 256 - fy
+        satirlar += self.tuval[y_ust] * fy
+        satirlar >>= 8
+        sonuc = satirlar[:, x_alt]
+        sonuc *= 256 - fx
+        sonuc += satirlar[:, x_ust] * fx
+        sonuc >>= 8
+        return sonuc.astype(np.uint8)
+
+def gecis_karesi(a, b, alfa, tip):
+    """İki kare arasında xfade benzeri geçiş karesi üretir (alfa: 0 -> a, 1 -> b)"""
+    if tip == 'slideleft':
+        kayma = int(round(a.shape[1] * alfa))
+        return np.concatenate([a[:, kayma:], b[:, :kayma]], axis=1)
+    if tip == 'slideright':
+        kayma = int(round(a.shape[1] * alfa))
+        return np.concatenate([b[:, a.shape[1] - kayma:], a[:, :a.shape[1] - kayma]], axis=1)
+    if tip == 'fadeblack':
+        if alfa < 0.5:
+            return (a.astype(np.float32) * (1 - 2 * alfa)).astype(np.uint8)
+        return (b.astype(np.float32) * (2 * alfa - 1)).astype(np.uint8)
+
+    karisim = a.astype(np.float32) * (1 - alfa) + b.astype(np.float32) * alfa
+    karisim = np.clip(karisim + 0.5, 0, 255).astype(np.uint8)
+    if tip == 'pixelize':
+        # Geçişin ortasında en iri bloklar
+        blok = max(1, int(round(48 * (1 - abs(2 * alfa - 1)))))
+        if blok > 1:
+            h, w = karisim.shape[:2]
+            kaba = karisim[::blok, ::blok]
+            karisim = np.repeat(np.repeat(kaba, blok, axis=0), blok, axis=1)[:h, :w]
+    return karisim
+
+class NumpyKenBurnsRender:
+    """Tüm zaman çizelgesini NumPy ile üretip tek bir FFmpeg kodlayıcıya rawvideo olarak aktarır
+
+    Her PNG bir kez çözülür; ara MP4 dosyaları ve segment başına FFmpeg
+    süreçleri oluşmaz.
+    """
+
+    def __init__(self, genislik=1920, yukseklik=1080, fps=30, tuval_saglayici=tuval_olustur):
+        self.genislik = genislik
+        self.yukseklik = yukseklik
+        self.fps = fps
+        self.tuval_saglayici = tuval_saglayici  # (görsel, genişlik, yükseklik) -> RGB dizi; ör. türev önbelleği
+        self.sureler = {'hareket': 0.0, 'gecis': 0.0, 'yazma': 0.0}
+
+    def kareleri_uret(self, segmentler, zaman_cizelgesi, gorsel_yolu_bul):
+        """Zaman çizelgesindeki tüm kareleri sırayla üretir"""
+        n = len(segmentler)
+        gecis = zaman_cizelgesi.gecis_karesi
+        sonraki = None
+
+        for i, segment in enumerate(segmentler):
+            kare_sayisi = zaman_cizelgesi.klip_kareleri[i]
+            if sonraki is not None:
+                uretici = sonraki
+            else:
+                uretici = KlipKareUretici(gorsel_yolu_bul(segment), segment.get('ic_efekt', {}),
+                                          kare_sayisi, self.genislik, self.yukseklik, self.fps,
+                                          self.tuval_saglayici)
+            sonraki = None
+
+            ilk = gecis if i > 0 else 0
+            son = kare_sayisi - gecis if i < n - 1 else kare_sayisi
+            for k in range(ilk, son):
+                t0 = time.perf_counter()
+                kare = uretici.kare(k)
+                self.sureler['hareket'] += time.perf_counter() - t0
+                yield kare
+
+            if i < n - 1:
+                sonraki = KlipKareUretici(gorsel_yolu_bul(segmentler[i + 1]),
+                                          segmentler[i + 1].get('ic_efekt', {}),
+                                          zaman_cizelgesi.klip_kareleri[i + 1],
+                                          self.genislik, self.yukseklik, self.fps,
+                                          self.tuval_saglayici)
+                tip = zaman_cizelgesi.xfade_tipi(zaman_cizelgesi.gecis_efektleri[i])
+                for t in range(gecis):
+                    t0 = time.perf_counter()
+                    a = uretici.kare(kare_sayisi - gecis + t)
+                    b = sonraki.kare(t)
+                    kare = gecis_karesi(a, b, t / gecis, tip)
+                    self.sureler['gecis'] += time.perf_counter() - t0
+                    yield kare
+
+    def render(self, segmentler, zaman_cizelgesi, gorsel_yolu_bul, kodlayici_argumanlari, cikti_yolu, log_yolu):
+        """Sessiz videoyu tek FFmpeg sürecine kare akıtarak kodlar"""
+        toplam = zaman_cizelgesi.toplam_kare()
+        print(f"  🧮 NumPy Ken Burns render: {len(segmentler)} segment, {toplam} kare")
+
+        komut = [
+            'ffmpeg',
+            '-f', 'rawvideo',
+            '-pix_fmt', 'rgb24',
+            '-s', f"{self.genislik}x{self.yukseklik}",
+            '-r', str(self.fps),
+            '-i', '-'
+        ] + kodlayici_argumanlari + ['-y', cikti_yolu]
+
+        with open(log_yolu, 'wb') as log:
+            surec = subprocess.Popen(komut, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=log)
+            yazilan = 0
+            try:
+                for kare in self.kareleri_uret(segmentler, zaman_cizelgesi, gorsel_yolu_bul):
+                    t0 = time.perf_counter()
+                    surec.stdin.write(kare.tobytes())
+                    self.sureler['yazma'] += time.perf_counter() - t0
+                    yazilan += 1
+                    if yazilan % (self.fps * 30) == 0:
+                        print(f"  📈 NumPy render: {yazilan}/{toplam} kare ({yazilan / toplam * 100:.1f}%)")
+                surec.stdin.close()
+            except BrokenPipeError:
+                pass
+            except BaseException:
+                surec.kill()
+                surec.wait()
+                raise
+            donus = surec.wait()
+
+        if donus != 0 or yazilan != toplam:
+            print(f"❌ KRITIK HATA: NumPy render kodlayıcısı başarısız (return code: {donus}, kare: {yazilan}/{toplam})")
+            try:
+                with open(log_yolu, 'r', encoding='utf-8', errors='replace') as f:
+                    print(f"   Stderr: {f.read()[-4000:]}")
+            except OSError:
+                pass
+            sys.exit(1)
+
+        print(f"  ⏱️ Hareket: {self.sureler['hareket']:.1f}s, Geçiş: {self.sureler['gecis']:.1f}s, "
+              f"Kodlayıcıya yazma: {self.sureler['yazma']:.1f}s")
+        return cikti_yolu
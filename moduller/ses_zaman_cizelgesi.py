@@ -0,0 +1,229 @@
+# ses_zaman_cizelgesi.py - Örnek hassasiyetinde anlatım + müzik zaman çizelgesi
+
+import os
+import wave
+import struct
+import numpy as np
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+def wav_basligi(yol):
+    """RIFF başlığından (format kodu, kanal, örnek hızı, bit, veri konumu, kare sayısı) okur
+
+    Yalnızca bölüm başlıkları okunur; örnek verisine dokunulmaz.
+    """
+    with open(yol, 'rb') as f:
+        riff, _, wave_id = struct.unpack('<4sI4s', f.read(12))
+        if riff != b'RIFF' or wave_id != b'WAVE':
+            raise ValueError(f"RIFF/WAVE başlığı yok: {yol}")
+
+        fmt = None
+        while True:
+            baslik = f.read(8)
+            if len(baslik) < 8:
+                raise ValueError(f"WAV 'data' bölümü bulunamadı: {yol}")
+            kimlik, boyut = struct.unpack('<4sI', baslik)
+            if kimlik == b'fmt ':
+                govde = f.read(boyut)
+                format_kodu, kanal, ornek_hizi, _, _, bit = struct.unpack('<HHIIHH', govde[:16])
+                if format_kodu == WAVE_FORMAT_EXTENSIBLE and len(govde) >= 26:
+                    format_kodu = struct.unpack('<H', govde[24:26])[0]
+                fmt = (format_kodu, kanal, ornek_hizi, bit)
+            elif kimlik == b'data':
+                veri_konumu = f.tell()
+                break
+            else:
+                f.seek(boyut, os.SEEK_CUR)
+            if boyut % 2:
+                f.seek(1, os.SEEK_CUR)
+
+    if fmt is None:
+        raise ValueError(f"WAV 'fmt ' bölümü bulunamadı: {yol}")
+    format_kodu, kanal, ornek_hizi, bit = fmt
+    if not kanal or not bit or not ornek_hizi:
+        raise ValueError(f"Geçersiz WAV formatı: {yol}")
+    # Yazımı yarım kalmış dosyalarda data boyutu dosya sonunu aşabilir
+    boyut = min(boyut, os.path.getsize(yol) - veri_konumu)
+    kare_sayisi = boyut // (kanal * bit // 8)
+    return format_kodu, kanal, ornek_hizi, bit, veri_konumu, kare_sayisi
+
+def wav_memmap(yol):
+    """WAV veri bölümünü kopyalamadan bellek eşlemeli (memmap) açar
+
+    Dönüş: (ham örnek dizisi (n, kanal), örnek hızı, örnek tipi)
+    Örnek tipi 'int8u', 'int16', 'int24', 'int32' veya 'float32' olur.
+    """
+    format_kodu, kanal, ornek_hizi, bit, veri_konumu, kare_sayisi = wav_basligi(yol)
+
+    if format_kodu == WAVE_FORMAT_IEEE_FLOAT and bit == 32:
+        tip, dtype = 'float32', '<f4'
+    elif format_kodu == WAVE_FORMAT_PCM and bit in (8, 16, 32):
+        tip, dtype = {8: ('int8u', 'u1'), 16: ('int16', '<i2'), 32: ('int32', '<i4')}[bit]
+    elif format_kodu == WAVE_FORMAT_PCM and bit == 24:
+        ham = np.memmap(yol, dtype='u1', mode='r', offset=veri_konumu, shape=(kare_sayisi, kanal, 3))
+        return ham, ornek_hizi, 'int24'
+    else:
+        raise ValueError(f"Desteklenmeyen WAV formatı (kod {format_kodu}, {bit} bit): {yol}")
+
+    ham = np.memmap(yol, dtype=dtype, mode='r', offset=veri_konumu, shape=(kare_sayisi, kanal))
+    return ham, ornek_hizi, tip
+
+def float_ornekler(ham, tip):
+    """Ham WAV örneklerini [-1, 1] aralığında float32'ye çevirir"""
+    if tip == 'float32':
+        return np.asarray(ham, dtype=np.float32)
+    if tip == 'int16':
+        return ham.astype(np.float32) / 32768.0
+    if tip == 'int32':
+        return (ham.astype(np.float64) / 2147483648.0).astype(np.float32)
+    if tip == 'int8u':
+        return (ham.astype(np.float32) - 128.0) / 128.0
+    # int24: küçük uçlu 3 bayt -> işaretli 32 bit
+    deger = (ham[..., 0].astype(np.int32) | (ham[..., 1].astype(np.int32) << 8)
+             | (ham[..., 2].astype(np.int32) << 16))
+    deger = np.where(deger >= 1 << 23, deger - (1 << 24), deger)
+    return deger.astype(np.float32) / 8388608.0
+
+def kanallari_uyarla(ornekler, kanal):
+    """Mono/stereo dönüşümü"""
+    if ornekler.shape[1] == kanal:
+        return ornekler
+    if ornekler.shape[1] == 1:
+        return np.repeat(ornekler, kanal, axis=1)
+    karisim = ornekler.mean(axis=1, keepdims=True)
+    return np.repeat(karisim, kanal, axis=1) if kanal > 1 else karisim
+
+def yeniden_ornekle(ornekler, kaynak_hiz, hedef_hiz):
+    """Doğrusal enterpolasyonla örnek hızı dönüşümü (konuşma için yeterli)"""
+    if kaynak_hiz == hedef_hiz or len(ornekler) == 0:
+        return ornekler
+    hedef_sayi = int(round(len(ornekler) * hedef_hiz / kaynak_hiz))
+    kaynak_t = np.arange(len(ornekler), dtype=np.float64)
+    hedef_t = np.arange(hedef_sayi, dtype=np.float64) * (kaynak_hiz / hedef_hiz)
+    return np.stack([np.interp(hedef_t, kaynak_t, ornekler[:, k]) for k in range(ornekler.shape[1])],
+                    axis=1).astype(np.float32)
+
+class SesZamanCizelgesi:
+    """Anlatımları video zaman çizelgesindeki tam ofsetlerine yerleştirip müzikle karıştırır
+
+    Çıktı blok blok üretilir; bellek kullanımı video süresinden bağımsızdır.
+    Anlatımlar arasındaki boşluklar sessizlikle doldurulur.
+    """
+
+    BLOK_SURESI = 10.0  # saniye
+
+    def __init__(self, ornek_hizi=48000, kanal=2):
+        self.ornek_hizi = ornek_hizi
+        self.kanal = kanal
+        self.anlatimlar = []  # (başlangıç örneği, yol)
+        self.muzik = None
+
+    def anlatim_ekle(self, wav_yolu, baslangic_sn):
+        self.anlatimlar.append((int(round(baslangic_sn * self.ornek_hizi)), wav_yolu))
+
+    def muzik_ekle(self, pcm_yolu, seviye=0.15, bosluk_seviyesi=None, giris_sn=1.0, cikis_sn=2.0, ducking_gecis_sn=0.25):
+        """Müzik yatağını ekler
+
+        pcm_yolu: hedef örnek hızında, kanal sayısında ham float32 (f32le) dosya.
+        Müzik anlatım altında `seviye`, anlatım boşluklarında `bosluk_seviyesi` ile çalar;
+        videodan kısa yataklar döngüye alınır.
+        """
+        self.muzik = {
+            'yol': pcm_yolu,
+            'seviye': seviye,
+            'bosluk_seviyesi': seviye if bosluk_seviyesi is None else bosluk_seviyesi,
+            'giris_sn': giris_sn,
+            'cikis_sn': cikis_sn,
+            'ducking_gecis_sn': ducking_gecis_sn
+        }
+
+    def _anlatim_yukle(self, yol):
+        ham, hiz, tip = wav_memmap(yol)
+        ornekler = kanallari_uyarla(float_ornekler(ham, tip), self.kanal)
+        return yeniden_ornekle(ornekler, hiz, self.ornek_hizi)
+
+    def _ducking_noktalari(self, araliklar, toplam):
+        """Müzik kazanç zarfının (örnek, kazanç) kırılma noktaları"""
+        m = self.muzik
+        rampa = max(1, int(m['ducking_gecis_sn'] * self.ornek_hizi))
+        # Aralarındaki boşluk iki rampadan kısa olan anlatımlar birleştirilir
+        birlesik = []
+        for bas, son in sorted(araliklar):
+            if birlesik and bas - birlesik[-1][1] < 2 * rampa:
+                birlesik[-1][1] = max(birlesik[-1][1], son)
+            else:
+                birlesik.append([bas, son])
+
+        x, y = [0], [m['bosluk_seviyesi']]
+        for bas, son in birlesik:
+            x += [max(x[-1] + 1, bas - rampa), max(x[-1] + 2, bas), max(x[-1] + 3, son), max(x[-1] + 4, son + rampa)]
+            y += [m['bosluk_seviyesi'], m['seviye'], m['seviye'], m['bosluk_seviyesi']]
+        x.append(max(x[-1] + 1, toplam))
+        y.append(m['bosluk_seviyesi'])
+        return np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float32)
+
+    def yaz(self, cikti_yolu, toplam_sure):
+        """Karışımı tek 16 bit PCM WAV dosyası olarak yazar, yazılan süreyi döndürür
+
+        Kare sayısı başlığa baştan yazılır; başlık sonradan yamanmadığı için
+        çıktı geri sarılamayan bir boru (FIFO) da olabilir.
+        """
+        toplam = int(round(toplam_sure * self.ornek_hizi))
+        blok = int(self.BLOK_SURESI * self.ornek_hizi)
+
+        # Anlatım aralıkları yalnızca başlıktan hesaplanır; örnekler blok geldiğinde yüklenir
+        araliklar = []
+        for bas, yol in self.anlatimlar:
+            ham, hiz, _ = wav_memmap(yol)
+            araliklar.append((bas, bas + int(round(len(ham) * self.ornek_hizi / hiz)), yol))
+
+        muzik_pcm = None
+        if self.muzik:
+            muzik_pcm = np.memmap(self.muzik['yol'], dtype='<f4', mode='r')
+            muzik_pcm = muzik_pcm[:len(muzik_pcm) // self.kanal * self.kanal].reshape(-1, self.kanal)
+            zarf_x, zarf_y = self._ducking_noktalari([(b, s) for b, s, _ in araliklar], toplam)
+            giris = max(1, int(self.muzik['giris_sn'] * self.ornek_hizi))
+            cikis = max(1, int(self.muzik['cikis_sn'] * self.ornek_hizi))
+
+        yuklu = {}
+        with wave.open(cikti_yolu, 'wb') as cikti:
+            cikti.setnchannels(self.kanal)
+            cikti.setsampwidth(2)
+            cikti.setframerate(self.ornek_hizi)
+            cikti.setnframes(toplam)
+
+            for a in range(0, toplam, blok):
+                b = min(toplam, a + blok)
+                karisim = np.zeros((b - a, self.kanal), dtype=np.float32)
+
+                if muzik_pcm is not None and len(muzik_pcm):
+                    if b <= len(muzik_pcm):
+                        m = muzik_pcm[a:b]
+                    else:
+                        m = muzik_pcm[np.arange(a, b) % len(muzik_pcm)]
+                    t = np.arange(a, b, dtype=np.float64)
+                    kazanc = np.interp(t, zarf_x, zarf_y).astype(np.float32)
+                    kazanc *= np.clip(t / giris, 0, 1).astype(np.float32)
+                    kazanc *= np.clip((toplam - t) / cikis, 0, 1).astype(np.float32)
+                    karisim += m * kazanc[:, None]
+
+                for i, (bas, son, yol) in enumerate(araliklar):
+                    if son <= a or bas >= b:
+                        continue
+                    if i not in yuklu:
+                        yuklu[i] = self._anlatim_yukle(yol)
+                    ornekler = yuklu[i]
+                    k0, k1 = max(a, bas), min(b, bas + len(ornekler))
+                    if k1 > k0:
+                        karisim[k0 - a:k1 - a] += ornekler[k0 - bas:k1 - bas]
+
+                # Bu bloktan sonra ihtiyaç kalmayan anlatımlar bellekten atılır
+                for i in [i for i in yuklu if araliklar[i][1] <= b]:
+                    del yuklu[i]
+
+                np.clip(karisim, -1.0, 1.0, out=karisim)
+                cikti.writeframesraw(np.rint(karisim * 32767.0).astype('<i2').tobytes())
+
+        return toplam / self.ornek_hizi
@@ -4,6 +4,7 @@ import os
 import argparse
 import sys
 import base64
+import asyncio
 
 # Path handling for imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -14,6 +15,8 @@ if parent_dir not in sys.path:
 from google import genai
 from google.genai import types
 from api_manager import get_api_manager, APIType
+from config_manager import config
+from moduller.varlik_dogrulama import varlik_dogrulayici
 
 class MultiAPISeslendirmen:
     def __init__(self):
@@ -95,6 +98,16 @@ class MultiAPISeslendirmen:
     
     def tts_request_wrapper(self, metin, ses_ismi):
         """Multi-API TTS wrapper"""
+        return self.api_manager.make_request(APIType.TTS, self.tts_request_func(metin, ses_ismi),
+                                             estimated_tokens=self.tahmini_token(metin))
+    
+    @staticmethod
+    def tahmini_token(metin):
+        """TPM kovası için kaba token tahmini (~4 karakter / token)"""
+        return len(metin) // 4 + 1
+    
+    def tts_request_func(self, metin, ses_ismi):
+        """Sağlayıcıdan bağımsız TTS istek fonksiyonu (client, config) -> PCM"""
         
         def gemini_tts_request(client, config):
             tam_prompt = f' "{metin}"'
@@ -144,7 +157,7 @@ class MultiAPISeslendirmen:
             else:
                 raise Exception(f"TTS desteklenmeyen API client: {type(client)}")
         
-        return self.api_manager.make_request(APIType.TTS, unified_tts_request)
+        return unified_tts_request
     
     def segment_seslendiry(self, metin, ses_ismi, dosya_yolu):
         """Multi-API ile tek bir segmenti seslendirir"""
@@ -164,8 +177,44 @@ class MultiAPISeslendirmen:
             print(f"❌ HATA: {dosya_yolu} - {e}")
             return False
     
-    def tum_segmentleri_seslendiry(self, json_dosya_yolu, cikti_klasoru):
-        """JSON dosyasındaki tüm segmentleri Multi-API ile seslendirir"""
+    def segmentleri_eszamanli_seslendir(self, segmentler, ses_ismi):
+        """Tüm segmentleri anahtarların RPM/TPM limitleri içinde eşzamanlı seslendirir
+
+        İstekler sağlıklı tüm API anahtarlarına yayılır; her segment tamamlanır
+        tamamlanmaz diske yazılır, PCM bellekte biriktirilmez. Başarısız segmentler
+        sonda birlikte raporlanır; yazılanlar --sadece-hatalilar ile yeniden
+        çalıştırmada atlanır. Dönüş: başarılı segment sayısı.
+        """
+        print(f"\n⚡ {len(segmentler)} segment eşzamanlı seslendiriliyor...")
+        
+        async def isle(metin, dosya_yolu):
+            pcm = await self.api_manager.make_request_async(
+                APIType.TTS, self.tts_request_func(metin, ses_ismi), estimated_tokens=self.tahmini_token(metin)
+            )
+            try:
+                await asyncio.to_thread(self.wave_file, dosya_yolu, pcm)
+            except SystemExit:
+                # wave_file hatayı yazdırıp çıkar; diğer segmentlerin kaydı sürmeli
+                raise Exception("WAV dosyası yazılamadı")
+            print(f"✅ Kaydedildi: {dosya_yolu}")
+        
+        async def hepsini_isle():
+            return await asyncio.gather(*(isle(metin, yol) for metin, yol in segmentler), return_exceptions=True)
+        
+        basarili = 0
+        for (_, dosya_yolu), sonuc in zip(segmentler, asyncio.run(hepsini_isle())):
+            if isinstance(sonuc, Exception):
+                print(f"❌ HATA: Segment seslendirilmedi: {os.path.basename(dosya_yolu)} - {sonuc}")
+            else:
+                basarili += 1
+        return basarili
+    
+    def tum_segmentleri_seslendiry(self, json_dosya_yolu, cikti_klasoru, sadece_hatalilar=False):
+        """JSON dosyasındaki tüm segmentleri Multi-API ile seslendirir
+
+        sadece_hatalilar: mevcut ve kalite kontrolünden geçen ses dosyaları atlanır,
+        yalnızca eksik veya hatalı segmentler seslendirilir.
+        """
         
         print("🎬 Multi-API Seslendirme süreci başlatılıyor...")
         
@@ -193,6 +242,8 @@ class MultiAPISeslendirmen:
             
         toplam_segment = 0
         basarili_segment = 0
+        atlanan = 0
+        segmentler = []
         
         print("\n🎬 Bölümler Multi-API ile işlenmeye başlanıyor...")
         
@@ -216,13 +267,12 @@ class MultiAPISeslendirmen:
                         dosya_adi = f"{bolum_kisaltmasi}-{paragraf_no}-{segment_no}.wav"
                         dosya_yolu = os.path.join(cikti_klasoru, dosya_adi)
                         
-                        # Segmenti Multi-API ile seslendiry
                         toplam_segment += 1
-                        if self.segment_seslendiry(metin, ses_ismi, dosya_yolu):
+                        if sadece_hatalilar and not varlik_dogrulayici.sorunlar(dosya_yolu, 'ses')[1]:
+                            atlanan += 1
                             basarili_segment += 1
-                        else:
-                            print(f"❌ KRITIK HATA: Segment seslendirilmedi: {dosya_adi}")
-                            sys.exit(1)  # Herhangi bir segment başarısız olursa dur
+                            continue
+                        segmentler.append((metin, dosya_yolu))
                             
             except KeyError as e:
                 print(f"❌ HATA: Bölüm yapısında eksik alan: {e}")
@@ -231,12 +281,25 @@ class MultiAPISeslendirmen:
                 print(f"❌ HATA: Bölüm işleme sırasında hata: {e}")
                 sys.exit(1)
         
+        if config.get('failover_ayarlari', 'concurrent_requests', default=True):
+            basarili_segment += self.segmentleri_eszamanli_seslendir(segmentler, ses_ismi)
+        else:
+            for metin, dosya_yolu in segmentler:
+                # Segmenti Multi-API ile seslendiry
+                if self.segment_seslendiry(metin, ses_ismi, dosya_yolu):
+                    basarili_segment += 1
+                else:
+                    print(f"❌ KRITIK HATA: Segment seslendirilmedi: {os.path.basename(dosya_yolu)}")
+                    sys.exit(1)  # Herhangi bir segment başarısız olursa dur
+        
         # Özet bilgi
         print(f"\n" + "=" * 50)
         print(f"🎉 MULTI-API SESLENDİRME TAMAMLANDI!")
         print(f"=" * 50)
         print(f"📊 Toplam segment: {toplam_segment}")
         print(f"✅ Başarılı: {basarili_segment}")
+        if sadece_hatalilar:
+            print(f"⏭️ Kontrolden geçtiği için atlanan: {atlanan}")
         print(f"❌ Başarısız: {toplam_segment - basarili_segment}")
         print(f"📁 Dosyalar kaydedildi: {cikti_klasoru}")
         
@@ -245,6 +308,8 @@ class MultiAPISeslendirmen:
         
         if basarili_segment != toplam_segment:
             print("❌ KRITIK HATA: Tüm segmentler tamamlanamadı!")
+            print(f"   Yalnızca eksikleri seslendirmek için: python moduller/seslendirmen_multiapi.py "
+                  f"\"{json_dosya_yolu}\" \"{cikti_klasoru}\" --sadece-hatalilar")
             sys.exit(1)
             
         print("=" * 50)
@@ -254,6 +319,8 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Multi-API Seslendirmen - JSON dosyasındaki metinleri seslendirir ve WAV dosyaları oluşturur.")
     parser.add_argument("json_dosyasi", help="Proje JSON dosyasının yolu")
     parser.add_argument("cikti_klasoru", help="WAV dosyalarının kaydedileceği klasör")
+    parser.add_argument("--sadece-hatalilar", action="store_true",
+                        help="Yalnızca eksik veya kalite kontrolünden geçemeyen segmentleri seslendir")
     args = parser.parse_args()
     
     try:
@@ -261,7 +328,7 @@ if __name__ == "__main__":
         print("=" * 50)
         
         seslendirmen = MultiAPISeslendirmen()
-        seslendirmen.tum_segmentleri_seslendiry(args.json_dosyasi, args.cikti_klasoru)
+        seslendirmen.tum_segmentleri_seslendiry(args.json_dosyasi, args.cikti_klasoru, args.sadece_hatalilar)
         
         print("\n🎬 Sonraki adım için komut:")
         print(f"python moduller/gorsel_yonetmen_multiapi.py \"{args.json_dosyasi}\" \"{os.path.dirname(args.cikti_klasoru)}/gorseller\"")
@@ -0,0 +1,197 @@
+# varlik_dogrulama.py - Ses/görsel varlıklarının başlıktan, paralel ve önbellekli doğrulanması
+
+import os
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+
+from moduller.ses_zaman_cizelgesi import wav_basligi
+from moduller.gorsel_analiz import icerik_analizi, icerik_sorunlari
+
+# Kalite sınırları (KaliteKontrol ile aynı)
+MIN_DOSYA_BOYUTU = 1024
+MIN_SES_SURESI = 0.1
+MAX_SES_SURESI = 300
+MIN_SES_BITRATE = 64000
+MIN_ORNEK_HIZI = 16000
+MIN_GORSEL_KENAR = 100
+MAX_GORSEL_KENAR = 4096
+MAX_GORSEL_BOYUTU = 50 * 1024 * 1024
+GORSEL_FORMATLARI = ('PNG', 'JPEG', 'JPG')
+
+def ses_bilgisi_oku(yol):
+    """WAV başlığından süre, örnek hızı, kanal, bit derinliği ve bitrate okur"""
+    _, kanal, ornek_hizi, bit, _, kare_sayisi = wav_basligi(yol)
+    return {
+        'tur': 'ses',
+        'format': 'WAV',
+        'sure': kare_sayisi / ornek_hizi,
+        'ornek_hizi': ornek_hizi,
+        'kanal': kanal,
+        'bit': bit,
+        'bitrate': ornek_hizi * kanal * bit
+    }
+
+def gorsel_bilgisi_oku(yol):
+    """Görsel boyutlarını ve formatını okur - PIL yalnızca başlığı çözer, pikseller yüklenmez"""
+    with Image.open(yol) as img:
+        genislik, yukseklik = img.size
+        return {
+            'tur': 'gorsel',
+            'format': img.format,
+            'genislik': genislik,
+            'yukseklik': yukseklik
+        }
+
+def ses_sorunlari(bilgi):
+    sorunlar = []
+    if bilgi['sure'] < MIN_SES_SURESI:
+        sorunlar.append(f"Ses dosyası çok kısa ({bilgi['sure']}s)")
+    if bilgi['sure'] > MAX_SES_SURESI:
+        sorunlar.append(f"Ses dosyası çok uzun ({bilgi['sure']}s)")
+    if bilgi['bitrate'] < MIN_SES_BITRATE:
+        sorunlar.append(f"Ses kalitesi çok düşük ({bilgi['bitrate']}bps)")
+    if bilgi['ornek_hizi'] < MIN_ORNEK_HIZI:
+        sorunlar.append(f"Sample rate çok düşük ({bilgi['ornek_hizi']}Hz)")
+    if bilgi['boyut'] < MIN_DOSYA_BOYUTU:
+        sorunlar.append(f"Ses dosyası çok küçük ({bilgi['boyut']} bytes)")
+    return sorunlar
+
+def gorsel_sorunlari(bilgi):
+    sorunlar = []
+    genislik, yukseklik = bilgi['genislik'], bilgi['yukseklik']
+    if genislik < MIN_GORSEL_KENAR or yukseklik < MIN_GORSEL_KENAR:
+        sorunlar.append(f"Görsel çok küçük ({genislik}x{yukseklik})")
+    if genislik > MAX_GORSEL_KENAR or yukseklik > MAX_GORSEL_KENAR:
+        sorunlar.append(f"Görsel çok büyük ({genislik}x{yukseklik})")
+    if bilgi['format'] not in GORSEL_FORMATLARI:
+        sorunlar.append(f"Desteklenmeyen görsel format ({bilgi['format']})")
+    if bilgi['boyut'] < MIN_DOSYA_BOYUTU:
+        sorunlar.append(f"Görsel dosyası çok küçük ({bilgi['boyut']} bytes)")
+    if bilgi['boyut'] > MAX_GORSEL_BOYUTU:
+        sorunlar.append(f"Görsel dosyası çok büyük ({bilgi['boyut'] / (1024 * 1024):.1f}MB)")
+    return sorunlar
+
+OKUYUCULAR = {'ses': ses_bilgisi_oku, 'gorsel': gorsel_bilgisi_oku}
+DENETCILER = {'ses': ses_sorunlari, 'gorsel': gorsel_sorunlari}
+
+class VarlikDogrulayici:
+    """Varlık meta verisini (boyut, mtime) imzasıyla önbelleğe alan toplu doğrulayıcı
+
+    Meta veri tablosu kalıcı bir JSON dosyasında tutulabilir; kalite sınırları her
+    çalıştırmada tablo üzerinden yeniden uygulanır, dosyalar yeniden açılmaz.
+    """
+
+    ONBELLEK_SURUMU = 1
+
+    def __init__(self):
+        self._tablo = {}
+        self._kilit = threading.Lock()
+        self.onbellek_yolu = None
+        self._degisti = False
+        self.icerik_esikleri = None
+        self.istatistik = {'onbellek': 0, 'okunan': 0, 'icerik': 0}
+
+    def icerik_analizini_ac(self, esikler=None):
+        """Görsellerde boş/siyah/tek renk içerik analizini etkinleştirir"""
+        self.icerik_esikleri = dict(esikler or {})
+
+    def kalici_onbellek_ac(self, yol):
+        """Önceki çalıştırmaların meta veri tablosunu yükler"""
+        self.onbellek_yolu = yol
+        try:
+            with open(yol, 'r', encoding='utf-8') as f:
+                veri = json.load(f)
+            if veri.get('surum') == self.ONBELLEK_SURUMU:
+                with self._kilit:
+                    self._tablo.update(veri.get('varliklar', {}))
+        except (OSError, json.JSONDecodeError):
+            pass
+
+    def kaydet(self):
+        if not self.onbellek_yolu or not self._degisti:
+            return
+        with self._kilit:
+            veri = {'surum': self.ONBELLEK_SURUMU, 'varliklar': dict(self._tablo)}
+            self._degisti = False
+        gecici = f"{self.onbellek_yolu}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.onbellek_yolu) or '.', exist_ok=True)
+            with open(gecici, 'w', encoding='utf-8') as f:
+                json.dump(veri, f, ensure_ascii=False)
+            os.replace(gecici, self.onbellek_yolu)
+        except OSError as e:
+            print(f"⚠️ Varlık önbelleği yazılamadı: {e}")
+
+    def bilgi(self, yol, tur):
+        """Varlığın meta verisi - (boyut, mtime) değişmediyse dosya açılmaz
+
+        Dosya yoksa FileNotFoundError, okunamazsa okuyucunun hatası yükselir.
+        """
+        anahtar = os.path.abspath(yol)
+        durum = os.stat(yol)
+        with self._kilit:
+            kayit = self._tablo.get(anahtar)
+        if kayit and kayit['tur'] == tur and kayit['boyut'] == durum.st_size and kayit['mtime_ns'] == durum.st_mtime_ns:
+            with self._kilit:
+                self.istatistik['onbellek'] += 1
+            return kayit
+
+        kayit = {**OKUYUCULAR[tur](yol), 'boyut': durum.st_size, 'mtime_ns': durum.st_mtime_ns}
+        with self._kilit:
+            self._tablo[anahtar] = kayit
+            self._degisti = True
+            self.istatistik['okunan'] += 1
+        return kayit
+
+    def _icerik_ekle(self, yol, kayit):
+        """Görsel kaydına içerik metriklerini ekler - aynı (boyut, mtime) için bir kez hesaplanır"""
+        if 'icerik' in kayit:
+            return kayit
+        kayit = {**kayit, 'icerik': icerik_analizi(yol)}
+        with self._kilit:
+            self._tablo[os.path.abspath(yol)] = kayit
+            self._degisti = True
+            self.istatistik['icerik'] += 1
+        return kayit
+
+    def sorunlar(self, yol, tur):
+        """(meta veri, sorun listesi) - okunamayan dosyada meta veri None olur"""
+        if not os.path.exists(yol):
+            return None, [f"{'Ses' if tur == 'ses' else 'Görsel'} dosyası bulunamadı"]
+        try:
+            kayit = self.bilgi(yol, tur)
+            sorunlar = DENETCILER[tur](kayit)
+            if tur == 'gorsel' and self.icerik_esikleri is not None and not sorunlar:
+                kayit = self._icerik_ekle(yol, kayit)
+                sorunlar = icerik_sorunlari(kayit['icerik'], self.icerik_esikleri)
+        except Exception as e:
+            return None, [f"{'Ses' if tur == 'ses' else 'Görsel'} dosyası bozuk veya okunamıyor - {e}"]
+        return kayit, sorunlar
+
+    def dogrula(self, ses_yollari, gorsel_yollari, isci_sayisi=8):
+        """Tüm varlıkları paralel doğrular
+
+        Dönüş: (tablo {yol: meta veri}, hatalar [(yol, sorun)], süre saniye)
+        """
+        baslangic = time.time()
+        isler = [(yol, 'ses') for yol in ses_yollari] + [(yol, 'gorsel') for yol in gorsel_yollari]
+        with ThreadPoolExecutor(max_workers=max(1, min(isci_sayisi, len(isler)))) as havuz:
+            sonuclar = list(havuz.map(self.sorunlar, [yol for yol, _ in isler], [tur for _, tur in isler]))
+
+        tablo, hatalar = {}, []
+        for (yol, _), (kayit, sorunlar) in zip(isler, sonuclar):
+            if kayit is not None:
+                tablo[yol] = kayit
+            hatalar += [(yol, sorun) for sorun in sorunlar]
+        self.kaydet()
+        return tablo, hatalar, time.time() - baslangic
+
+    def rapor(self):
+        return (f"{self.istatistik['onbellek']} önbellek, {self.istatistik['okunan']} başlık okuma, "
+                f"{self.istatistik['icerik']} içerik analizi")
+
+# Global instance
+varlik_dogrulayici = VarlikDogrulayici()
@@ -0,0 +1,355 @@
+"""
+Resource Governor for AI Video Studio
+Sizes render/API concurrency from free RAM, CPU load and free disk (cgroup aware)
+"""
+
+import os
+import math
+import time
+import shutil
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, Optional
+
+import psutil
+
+CGROUP_KOK = "/sys/fs/cgroup"
+# cgroup v1'de "sınırsız" bellek sayfa hizalı çok büyük bir sayı olarak görünür
+CGROUP_V1_SINIRSIZ = 1 << 60
+# Çekirdeğin 1 dakikalık yük ortalamasıyla aynı zaman sabiti (saniye)
+YUK_ORTALAMASI_SN = 60.0
+
+@dataclass
+class ResourceLimits:
+    """Sürecin görebildiği donanım sınırları"""
+    kaynak: str                      # cgroup v2 | cgroup v1 | host
+    bellek_limiti_mb: float
+    cpu_limiti: float                # çekirdek cinsinden (kota / periyot)
+
+@dataclass
+class ResourceSnapshot:
+    """İzleme döngüsünün son ölçümü"""
+    zaman: float
+    bos_bellek_mb: float
+    bellek_yuzdesi: float
+    cpu_yuku: float                  # dış yük (1 dk yük - kendi süreç ağacımız) / cpu_limiti
+    oz_cpu_yuku: float               # kendi süreç ağacımızın (FFmpeg işçileri dahil) yükü / cpu_limiti
+    bos_disk_mb: float
+
+def _dosya_oku(yol: str) -> Optional[str]:
+    try:
+        with open(yol, 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def _stat_degeri(icerik: Optional[str], anahtar: str) -> Optional[int]:
+    """memory.stat / cpu.stat biçimindeki 'anahtar değer' satırlarından birini okur"""
+    for satir in (icerik or "").splitlines():
+        parcalar = satir.split()
+        if len(parcalar) == 2 and parcalar[0] == anahtar:
+            return int(parcalar[1])
+    return None
+
+class _CgroupOkuyucu:
+    """Konteyner içinde cgroup v2 veya v1 bellek/CPU sınırlarını ve kullanımını okur"""
+
+    def __init__(self):
+        self.surum = None
+        self.yol = None
+        if os.path.exists(os.path.join(CGROUP_KOK, "cgroup.controllers")):
+            self.surum = 2
+            self.yol = CGROUP_KOK
+            # Süreç alt bir cgroup'taysa (/proc/self/cgroup: "0::/yol") o dizin kullanılır
+            for satir in (_dosya_oku("/proc/self/cgroup") or "").splitlines():
+                if satir.startswith("0::"):
+                    aday = os.path.join(CGROUP_KOK, satir[3:].lstrip("/"))
+                    if os.path.exists(os.path.join(aday, "memory.max")):
+                        self.yol = aday
+        elif os.path.exists(os.path.join(CGROUP_KOK, "memory", "memory.limit_in_bytes")):
+            self.surum = 1
+
+    def bellek_limiti(self) -> Optional[int]:
+        if self.surum == 2:
+            deger = _dosya_oku(os.path.join(self.yol, "memory.max"))
+            return int(deger) if deger and deger != "max" else None
+        if self.surum == 1:
+            deger = _dosya_oku(os.path.join(CGROUP_KOK, "memory", "memory.limit_in_bytes"))
+            return int(deger) if deger and int(deger) < CGROUP_V1_SINIRSIZ else None
+        return None
+
+    def bellek_kullanimi(self) -> Optional[int]:
+        """Geri kazanılabilir sayfa önbelleği (inactive_file) düşülmüş kullanım"""
+        if self.surum == 2:
+            kullanim = _dosya_oku(os.path.join(self.yol, "memory.current"))
+            pasif = _stat_degeri(_dosya_oku(os.path.join(self.yol, "memory.stat")), "inactive_file")
+        elif self.surum == 1:
+            kullanim = _dosya_oku(os.path.join(CGROUP_KOK, "memory", "memory.usage_in_bytes"))
+            pasif = _stat_degeri(_dosya_oku(os.path.join(CGROUP_KOK, "memory", "memory.stat")), "total_inactive_file")
+        else:
+            return None
+        if not kullanim:
+            return None
+        return max(0, int(kullanim) - (pasif or 0))
+
+    def cpu_limiti(self) -> Optional[float]:
+        if self.surum == 2:
+            deger = _dosya_oku(os.path.join(self.yol, "cpu.max"))
+            if deger:
+                kota, _, periyot = deger.partition(" ")
+                if kota != "max" and periyot:
+                    return int(kota) / int(periyot)
+        elif self.surum == 1:
+            for klasor in ("cpu", "cpu,cpuacct"):
+                kota = _dosya_oku(os.path.join(CGROUP_KOK, klasor, "cpu.cfs_quota_us"))
+                periyot = _dosya_oku(os.path.join(CGROUP_KOK, klasor, "cpu.cfs_period_us"))
+                if kota and periyot and int(kota) > 0:
+                    return int(kota) / int(periyot)
+        return None
+
+class ResourceManager:
+    """Kaynak yöneticisi - eşzamanlı render ve API işçi sayısını canlı boyutlandırır
+
+    Arka plan izleme döngüsü boş belleği, CPU yükünü ve boş diski ölçüp render
+    ve API işçi limitlerini yeniden hesaplar. İşler `slot()` ile yer alır; baskı
+    altında yeni işler iptal edilmez, limit düşene kadar bekletilir.
+    """
+
+    def __init__(self, config_manager):
+        ayarlar = config_manager.get('kaynak_yonetimi', default={}) or {}
+        self.izleme_araligi_sn = ayarlar.get('izleme_araligi_sn', 2.0)
+        self.bellek_rezerv_mb = ayarlar.get('bellek_rezerv_mb', 1024)
+        self.render_isci_bellek_mb = ayarlar.get('render_isci_bellek_mb', 600)
+        self.api_isci_bellek_mb = ayarlar.get('api_isci_bellek_mb', 100)
+        self.render_cekirdek_basina = ayarlar.get('render_cekirdek_basina', 2)
+        self.maks_render_isci = ayarlar.get('maks_render_isci', 8)
+        self.maks_api_isci = ayarlar.get('maks_api_isci', 8)
+        self.kritik_bellek_yuzdesi = ayarlar.get('kritik_bellek_yuzdesi', 85)
+        self.yuksek_cpu_yuku = ayarlar.get('yuksek_cpu_yuku', 1.5)
+        self.dusuk_disk_mb = ayarlar.get('dusuk_disk_mb', 4000)
+        self.bellek_bekleme_sn = ayarlar.get('bellek_bekleme_sn', 300)
+        self.disk_yolu = ayarlar.get('disk_yolu', '.')
+
+        self._cgroup = _CgroupOkuyucu()
+        self.limitler = self._limitleri_oku()
+        self._kosul = threading.Condition()
+        self._aktif = {'render': 0, 'api': 0}
+        self._isci_limitleri = {'render': 1, 'api': 1}
+        self._baski = None
+        self._izleyici = None
+        self._durdur = threading.Event()
+        self._surec = psutil.Process()
+        self._cpu_sureleri = {}
+        self._son_cpu_olcumu = None
+        self._oz_yuk = 0.0
+        self.durum_olc()
+
+    def _limitleri_oku(self) -> ResourceLimits:
+        bellek = self._cgroup.bellek_limiti()
+        cpu = self._cgroup.cpu_limiti()
+        host_bellek = psutil.virtual_memory().total
+        host_cpu = os.cpu_count() or 1
+        return ResourceLimits(
+            kaynak=f"cgroup v{self._cgroup.surum}" if self._cgroup.surum and (bellek or cpu) else "host",
+            bellek_limiti_mb=min(bellek or host_bellek, host_bellek) / (1024 * 1024),
+            cpu_limiti=min(cpu or host_cpu, host_cpu)
+        )
+
+    def _anlik_olcum(self) -> ResourceSnapshot:
+        sanal = psutil.virtual_memory()
+        bos = sanal.available
+        yuzde = sanal.percent
+        kullanim = self._cgroup.bellek_kullanimi()
+        limit_bayt = self.limitler.bellek_limiti_mb * 1024 * 1024
+        if kullanim is not None and limit_bayt < sanal.total:
+            # Konteyner sınırı host belleğinden dar: baskı cgroup'a göre ölçülür
+            bos = min(bos, max(0, limit_bayt - kullanim))
+            yuzde = max(yuzde, 100.0 * kullanim / limit_bayt)
+        oz_cekirdek = self._oz_cpu_olc()
+        try:
+            host_cekirdek = psutil.getloadavg()[0]
+            # Yük ortalaması üstel olarak yumuşatıldığından kendi payımız da aynı sabitle yumuşatılır
+            oz_cekirdek = self._oz_yuk
+        except (AttributeError, OSError):
+            host_cekirdek = psutil.cpu_percent(interval=None) / 100.0 * (os.cpu_count() or 1)
+        yuk = max(0.0, host_cekirdek - oz_cekirdek) / self.limitler.cpu_limiti
+        try:
+            bos_disk = shutil.disk_usage(self.disk_yolu).free
+        except OSError:
+            bos_disk = 0
+        return ResourceSnapshot(
+            zaman=time.time(),
+            bos_bellek_mb=bos / (1024 * 1024),
+            bellek_yuzdesi=round(yuzde, 1),
+            cpu_yuku=round(yuk, 2),
+            oz_cpu_yuku=round(oz_cekirdek / self.limitler.cpu_limiti, 2),
+            bos_disk_mb=bos_disk / (1024 * 1024)
+        )
+
+    def _oz_cpu_olc(self) -> float:
+        """Kendi süreç ağacımızın son ölçümden beri kullandığı çekirdek sayısı
+
+        Render işçilerimiz (FFmpeg/x264 alt süreçleri) host yük ortalamasına da
+        girer; dış yükten düşülmezse render limiti kendi yükümüze tepki verip
+        salınır. Ölçümler arasında başlayıp biten süreçlerin payı kaçabilir.
+        """
+        simdi = time.time()
+        sureler = {}
+        try:
+            surecler = [self._surec] + self._surec.children(recursive=True)
+        except psutil.Error:
+            surecler = [self._surec]
+        harcanan = 0.0
+        for surec in surecler:
+            try:
+                zamanlar = surec.cpu_times()
+                toplam = zamanlar.user + zamanlar.system
+                onceki = self._cpu_sureleri.get(surec.pid)
+                if onceki is None and self._son_cpu_olcumu is not None:
+                    # Yeni süreç: son ölçümden sonra başladıysa tüm CPU süresi bu aralığa aittir
+                    onceki = 0.0 if surec.create_time() >= self._son_cpu_olcumu else toplam
+            except psutil.Error:
+                continue
+            sureler[surec.pid] = toplam
+            if onceki is not None:
+                harcanan += max(0.0, toplam - onceki)
+
+        cekirdek = 0.0
+        if self._son_cpu_olcumu is not None and simdi > self._son_cpu_olcumu:
+            aralik = simdi - self._son_cpu_olcumu
+            cekirdek = harcanan / aralik
+            azalma = math.exp(-aralik / YUK_ORTALAMASI_SN)
+            self._oz_yuk = self._oz_yuk * azalma + cekirdek * (1 - azalma)
+        self._cpu_sureleri = sureler
+        self._son_cpu_olcumu = simdi
+        return cekirdek
+
+    def durum_olc(self) -> ResourceSnapshot:
+        """Ölçümü yeniler, işçi limitlerini yeniden hesaplar ve bekleyen işleri uyandırır"""
+        olcum = self._anlik_olcum()
+        kullanilabilir_mb = olcum.bos_bellek_mb - self.bellek_rezerv_mb
+
+        render = min(
+            self.maks_render_isci,
+            int(self.limitler.cpu_limiti // self.render_cekirdek_basina),
+            int(kullanilabilir_mb // self.render_isci_bellek_mb)
+        )
+        api = min(self.maks_api_isci, int(kullanilabilir_mb // self.api_isci_bellek_mb))
+
+        baski = None
+        if olcum.bellek_yuzdesi > self.kritik_bellek_yuzdesi or kullanilabilir_mb <= 0:
+            baski = f"bellek %{olcum.bellek_yuzdesi:.0f}"
+        elif olcum.bos_disk_mb < self.dusuk_disk_mb:
+            baski = f"disk {olcum.bos_disk_mb:.0f}MB"
+        elif olcum.cpu_yuku > self.yuksek_cpu_yuku:
+            baski = f"CPU yükü {olcum.cpu_yuku:.2f}"
+            # Kendi işçilerimiz düşüldükten sonra bile çekirdekler dolu: render paralelliği yarıya iner
+            render = render // 2
+        if baski and not baski.startswith("CPU"):
+            render = 1
+            if baski.startswith("bellek"):
+                api = api // 2
+
+        with self._kosul:
+            yeni = {'render': max(1, render), 'api': max(1, api)}
+            if baski and baski != self._baski:
+                print(f"⚠️ Kaynak baskısı ({baski}): render {yeni['render']}, API {yeni['api']} işçiye kısıldı")
+            elif self._baski and not baski:
+                print(f"✅ Kaynak baskısı kalktı: render {yeni['render']}, API {yeni['api']} işçi")
+            self._isci_limitleri = yeni
+            self._baski = baski
+            self.son_olcum = olcum
+            self._kosul.notify_all()
+        return olcum
+
+    def izlemeyi_baslat(self):
+        """Arka plan izleme döngüsünü başlatır (tekrar çağrılması zararsızdır)"""
+        with self._kosul:
+            if self._izleyici and self._izleyici.is_alive():
+                return
+            self._durdur.clear()
+            self._izleyici = threading.Thread(target=self._izleme_dongusu, name="kaynak-izleyici", daemon=True)
+            self._izleyici.start()
+
+    def izlemeyi_durdur(self):
+        self._durdur.set()
+
+    def _izleme_dongusu(self):
+        while not self._durdur.wait(self.izleme_araligi_sn):
+            try:
+                self.durum_olc()
+            except Exception as e:
+                print(f"⚠️ Kaynak ölçümü başarısız: {e}")
+
+    def isci_limiti(self, tur: str) -> int:
+        """'render' veya 'api' için anlık eşzamanlı işçi limiti"""
+        with self._kosul:
+            return self._isci_limitleri[tur]
+
+    @contextmanager
+    def slot(self, tur: str):
+        """Limit izin verene kadar bekler, sonra bir işçi yeri ayırır
+
+        Hiç aktif iş yoksa limit ne olursa olsun bir işe izin verilir; böylece
+        baskı altında iş akışı yavaşlar ama durmaz.
+        """
+        self.izlemeyi_baslat()
+        with self._kosul:
+            while self._aktif[tur] > 0 and self._aktif[tur] >= self._isci_limitleri[tur]:
+                self._kosul.wait(timeout=self.izleme_araligi_sn)
+            self._aktif[tur] += 1
+        try:
+            yield
+        finally:
+            with self._kosul:
+                self._aktif[tur] -= 1
+                self._kosul.notify_all()
+
+    def bellek_bekle(self) -> bool:
+        """Bellek kritik eşiğin altına inene kadar bekler
+
+        En fazla bellek_bekleme_sn beklenir; süre dolarsa iş tek işçiye kısılmış
+        olarak devam eder. Bellek normale dönerse True döner.
+        """
+        baslangic = time.time()
+        olcum = self.durum_olc()
+        while olcum.bellek_yuzdesi > self.kritik_bellek_yuzdesi:
+            gecen = time.time() - baslangic
+            if gecen >= self.bellek_bekleme_sn:
+                print(f"⚠️ Bellek hâlâ yüksek (%{olcum.bellek_yuzdesi}), tek işçiyle devam ediliyor")
+                return False
+            print(f"⏸️ Bellek kullanımı yüksek (%{olcum.bellek_yuzdesi}), bekleniyor... ({gecen:.0f}s)")
+            time.sleep(min(5.0, self.bellek_bekleme_sn - gecen))
+            olcum = self.durum_olc()
+        return True
+
+    def durum(self) -> Dict[str, Any]:
+        """İzleme için anlık limitler, ölçüm ve aktif işçi sayıları"""
+        with self._kosul:
+            return {
+                'limitler': asdict(self.limitler),
+                'olcum': asdict(self.son_olcum),
+                'isci_limitleri': dict(self._isci_limitleri),
+                'aktif_isciler': dict(self._aktif),
+                'baski': self._baski
+            }
+
+    def rapor(self) -> str:
+        d = self.durum()
+        l, o = d['limitler'], d['olcum']
+        return (f"{l['kaynak']}, {l['cpu_limiti']:.1f} CPU, {l['bellek_limiti_mb']:.0f}MB bellek | "
+                f"boş {o['bos_bellek_mb']:.0f}MB (%{o['bellek_yuzdesi']}), dış yük {o['cpu_yuku']} "
+                f"(kendi {o['oz_cpu_yuku']}), "
+                f"disk {o['bos_disk_mb']:.0f}MB | render {d['isci_limitleri']['render']}, "
+                f"API {d['isci_limitleri']['api']} işçi")
+
+# Global instance
+resource_manager = None
+
+def get_resource_manager():
+    global resource_manager
+    if resource_manager is None:
+        from config_manager import config
+        resource_manager = ResourceManager(config)
+    return resource_manager
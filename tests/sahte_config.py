@@ -0,0 +1,13 @@
+class SahteConfig:
+    """MultiAPIManager'ın okuduğu config_manager.get arayüzü"""
+
+    def __init__(self, ayarlar):
+        self.ayarlar = ayarlar
+
+    def get(self, *anahtarlar, default=None):
+        deger = self.ayarlar
+        for anahtar in anahtarlar:
+            if not isinstance(deger, dict) or anahtar not in deger:
+                return default
+            deger = deger[anahtar]
+        return deger
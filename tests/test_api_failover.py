@@ -0,0 +1,54 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_manager import APIType, MultiAPIManager
+from sahte_config import SahteConfig
+
+class DevreKesiciTesti(unittest.TestCase):
+
+    def setUp(self):
+        self.eski_klasor = os.getcwd()
+        self.klasor = tempfile.TemporaryDirectory()
+        os.chdir(self.klasor.name)
+        self.manager = MultiAPIManager(SahteConfig({
+            'api_providers': {'gemini': {'k1': {'api_key': 'x', 'model_text': 'm'}}},
+            'failover_ayarlari': {
+                'max_retry_per_api': 1,
+                'circuit_breaker': {'recovery_seconds': 0, 'max_recovery_seconds': 0}
+            }
+        }))
+        self.manager._clients['gemini_k1'] = object()
+        self.breaker = self.manager.breakers[('gemini', 'k1')]
+
+    def tearDown(self):
+        os.chdir(self.eski_klasor)
+        self.klasor.cleanup()
+
+    def test_kota_hatasi_yari_acik_probe_yerini_birakir(self):
+        self.breaker.trip()  # Bekleme 0: ilk kontrolde yarı açık
+
+        def kota_doldu(client, config):
+            raise Exception("429 RESOURCE_EXHAUSTED: quota exceeded for requests per day")
+
+        with self.assertRaises(Exception):
+            self.manager.make_request(APIType.TEXT, kota_doldu)
+        self.assertEqual(self.breaker.state, self.breaker.HALF_OPEN)
+        self.assertTrue(self.breaker.available())
+        self.assertTrue(self.breaker.allow())
+
+    def test_kesilen_istek_probe_yerini_birakir(self):
+        self.breaker.trip()
+
+        def kesildi(client, config):
+            raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            self.manager.make_request(APIType.TEXT, kesildi)
+        self.assertTrue(self.breaker.available())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import api_manager
+from api_manager import MultiAPIManager
+from sahte_config import SahteConfig
+
+class KullanimGunluguTesti(unittest.TestCase):
+
+    def setUp(self):
+        self.eski_klasor = os.getcwd()
+        self.klasor = tempfile.TemporaryDirectory()
+        os.chdir(self.klasor.name)
+        self.config = SahteConfig({
+            'api_providers': {'gemini': {'k1': {'api_key': 'x', 'model_text': 'm', 'daily_quota': 5}}},
+            'failover_ayarlari': {'usage_journal_compact_entries': 1000}
+        })
+
+    def tearDown(self):
+        os.chdir(self.eski_klasor)
+        self.klasor.cleanup()
+
+    def istek_sayisi(self, manager):
+        manager.refresh_usage()
+        return manager.usage_data['gemini_k1'].requests_today
+
+    def silinemeden_sikistir(self, manager):
+        """Özet yazıldıktan sonra, günlük silinmeden önce çöken sıkıştırmayı taklit eder"""
+        gercek_remove = os.remove
+
+        def cokme(yol):
+            if yol == manager.journal_file:
+                raise OSError("çökme")
+            gercek_remove(yol)
+
+        with mock.patch.object(api_manager.os, 'remove', side_effect=cokme):
+            manager.compact_usage_journal()
+        self.assertTrue(os.path.exists(manager.journal_file))
+
+    def test_katlanmis_gunluk_iki_kez_sayilmaz(self):
+        a = MultiAPIManager(self.config)
+        for _ in range(3):
+            a.record_usage('gemini', 'k1', True)
+        self.silinemeden_sikistir(a)
+
+        b = MultiAPIManager(self.config)
+        self.assertEqual(self.istek_sayisi(b), 3)
+        self.assertTrue(b._check_quota('gemini', 'k1'))
+        self.assertFalse(os.path.exists(b.journal_file))  # Açılışta yarım kalan sıkıştırma tamamlanır
+        self.assertEqual(self.istek_sayisi(MultiAPIManager(self.config)), 3)
+
+    def test_cokmeden_sonra_eklenen_kayitlar_korunur(self):
+        a = MultiAPIManager(self.config)
+        for _ in range(3):
+            a.record_usage('gemini', 'k1', True)
+        self.silinemeden_sikistir(a)
+
+        # Çökmeden önce açılmış süreç aynı günlüğe yazmaya devam eder
+        a.record_usage('gemini', 'k1', True)
+        self.assertEqual(self.istek_sayisi(MultiAPIManager(self.config)), 4)
+        self.assertEqual(self.istek_sayisi(a), 4)
+
+if __name__ == '__main__':
+    unittest.main()
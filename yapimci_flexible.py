@@ -11,6 +11,7 @@ import shutil
 from config_manager import config
 from api_manager import get_api_manager
 from checkpoint_manager import CheckpointManager, OperationType
+from moduller.ffmpeg_ilerleme import ilerleme_satiri_ayristir
 
 # Custom Exception Classes
 class YapimciError(Exception):
@@ -52,12 +53,37 @@ def komut_calistir(komut_listesi):
         process = subprocess.run(komut_listesi, check=True, capture_output=True, text=True, encoding='utf-8')
         if process.stdout:
             log(f"Komut Çıktısı:\n--- \n{process.stdout}\n---")
-        log(f"Komut başarıyla tamamlandı.")
+        log("Komut başarıyla tamamlandı.")
         return True
     except subprocess.CalledProcessError as e:
         log(f"Komut hatası! Return Code: {e.returncode}\n--- HATA ---\n{e.stderr}", "ERROR")
         return False
 
+def komut_calistir_ilerlemeli(komut_listesi, ilerleme_geri_cagirma):
+    """komut_calistir gibi çalışır; çıktıyı satır satır okuyup ilerleme satırlarını geri çağırmaya iletir"""
+    try:
+        log(f"Komut çalıştırılıyor: {' '.join(komut_listesi)}")
+        process = subprocess.Popen(komut_listesi, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   text=True, encoding='utf-8', errors='replace')
+        cikti = []
+        for satir in process.stdout:
+            ilerleme = ilerleme_satiri_ayristir(satir)
+            if ilerleme is not None:
+                ilerleme_geri_cagirma(ilerleme)
+            else:
+                cikti.append(satir)
+        process.wait()
+        if process.returncode != 0:
+            log(f"Komut hatası! Return Code: {process.returncode}\n--- HATA ---\n{''.join(cikti)}", "ERROR")
+            return False
+        if cikti:
+            log(f"Komut Çıktısı:\n--- \n{''.join(cikti)}\n---")
+        log("Komut başarıyla tamamlandı.")
+        return True
+    except OSError as e:
+        log(f"Komut başlatılamadı: {e}", "ERROR")
+        return False
+
 class FlexibleYapimci:
     def __init__(self, config_file=None):
         print("🎬 Flexible Multi-API Yapımcı başlatılıyor...")
@@ -227,6 +253,7 @@ class FlexibleYapimci:
         
         temizlenecek_dosyalar = [
             "final_video.mp4",
+            "onizleme.mp4",
             self.gecici_klasor
         ]
         
@@ -245,6 +272,30 @@ class FlexibleYapimci:
         
         log("✅ Montaj öncesi temizlik tamamlandı")
 
+    def kurgu_ilerlemesini_kaydet(self, ilerleme):
+        """Kurgu sürecinden gelen FFmpeg ilerleme özetini checkpoint'e işler"""
+        self.checkpoint_manager.update_progress("kurgu", metadata={'ffmpeg_ilerleme': ilerleme})
+        for surec in ilerleme.get('aktif_surecler', []):
+            hiz = f"{surec['hiz']:.2f}x" if surec.get('hiz') else "?x"
+            eta = f", ETA {surec['eta_sn']:.0f}s" if surec.get('eta_sn') is not None else ""
+            print(f"  ⏳ Kurgu - {surec['aciklama']}: kare {surec['kare']}, {hiz}{eta}")
+        for ad, asama in ilerleme.get('asamalar', {}).items():
+            if asama.get('aktif') and asama.get('oran') is not None:
+                eta = f", ETA {asama['eta_sn']:.0f}s" if asama.get('eta_sn') is not None else ""
+                print(f"  📊 Kurgu - {ad} aşaması: %{asama['oran'] * 100:.0f}{eta}")
+
+    def onizleme_onayi_al(self, json_yolu, ses_klasoru, gorsel_klasoru):
+        """Manuel modda tam render öncesi düşük çözünürlüklü önizleme üretip operatör onayı alır"""
+        onizleme_yolu = os.path.join(self.proje_yolu, "onizleme.mp4")
+        log("Adım 4: Önizleme Render (onizleme profili)")
+        if not komut_calistir(["python", "moduller/kurgu.py", json_yolu, ses_klasoru, gorsel_klasoru, onizleme_yolu, "--profil", "onizleme"]):
+            log("⚠️ Önizleme oluşturulamadı, tam render ile devam ediliyor", "WARNING")
+            return True
+        
+        print(f"\n👀 Önizleme hazır: {onizleme_yolu}")
+        cevap = input("Önizleme uygun mu? Tam render başlatılsın mı? (E/H) > ").lower()
+        return cevap == 'e'
+
     def varlik_uyumsuzlugu_coz(self):
         """Varlık uyumsuzluğu durumunda yapılacaklar"""
         log("🔧 Varlık uyumsuzluğu çözülüyor...", "WARNING")
@@ -385,8 +436,13 @@ class FlexibleYapimci:
                 # Hash kontrolü başarılı - montaja başla
                 self.montaj_icin_gereksiz_dosyalari_temizle()
                 
+                if self.is_manual and self.config_manager.get('kurgu_ayarlari', 'manuel_onizleme', default=True):
+                    if not self.onizleme_onayi_al(json_yolu, ses_klasoru, gorsel_klasoru):
+                        self.checkpoint_manager.fail_operation("kurgu", "Önizleme kullanıcı tarafından onaylanmadı")
+                
                 log("Adım 4: Kurgu ve Montaj")
-                if not komut_calistir(["python", "moduller/kurgu.py", json_yolu, ses_klasoru, gorsel_klasoru, final_video_yolu]):
+                if not komut_calistir_ilerlemeli(["python", "moduller/kurgu.py", json_yolu, ses_klasoru, gorsel_klasoru, final_video_yolu],
+                                                 self.kurgu_ilerlemesini_kaydet):
                     self.checkpoint_manager.fail_operation("kurgu", "Kurgu modülü başarısız oldu")
                 self.checkpoint_manager.complete_operation("kurgu", [final_video_yolu])
                 # Legacy support